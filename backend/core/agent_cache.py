@@ -0,0 +1,42 @@
+"""
+Agent Count Cache
+后台智能体列表总数缓存
+
+按作用域 + 筛选条件缓存 COUNT 结果，翻页时不再重复统计。
+
+注意：
+- 缓存键带代号（agent:count:{代号}:{筛选条件哈希}），代号存于 AGENT_COUNT_GEN_KEY 且不设过期时间
+- 智能体增删或筛选字段变更后调用 invalidate_agent_count_cache 递增代号（一次 INCR，不扫描键），
+  旧代号下的缓存不再命中、随 TTL 过期
+- 必须在事务提交后调用失效，否则提交前到达的列表请求会把旧总数缓存到新代号下
+- Redis 不可用时所有方法静默降级，调用方回退到数据库统计
+"""
+import hashlib
+from typing import Optional
+
+from db.redis import RedisCache
+
+
+# 列表总数缓存键前缀与代号键
+AGENT_COUNT_CACHE_PREFIX = "agent:count:"
+AGENT_COUNT_GEN_KEY = "agent:count:gen"
+
+# 列表总数缓存过期时间（秒）
+AGENT_COUNT_CACHE_TTL = 30
+
+
+async def agent_count_cache_key(
+    scoped_tenant_id: Optional[int],
+    name: Optional[str],
+    status: Optional[int],
+    agent_mode: Optional[int],
+) -> str:
+    """生成当前代号下的列表总数缓存键（与分页参数无关，同一筛选条件各页共用）"""
+    generation = await RedisCache.get(AGENT_COUNT_GEN_KEY) or "0"
+    params_str = f"{scoped_tenant_id or ''}_{name or ''}_{'' if status is None else status}_{'' if agent_mode is None else agent_mode}"
+    return f"{AGENT_COUNT_CACHE_PREFIX}{generation}:{hashlib.md5(params_str.encode()).hexdigest()}"
+
+
+async def invalidate_agent_count_cache() -> None:
+    """递增缓存代号，使全部列表总数缓存失效（需在事务提交后调用）"""
+    await RedisCache.incr(AGENT_COUNT_GEN_KEY, expire=None)
@@ -0,0 +1,70 @@
+"""
+Auth Identity Cache
+认证身份缓存
+
+将 JWT 鉴权后查询到的管理员身份快照缓存到 Redis，
+避免每个受保护接口都为了还原身份而访问一次数据库。
+
+注意：
+- 仅缓存鉴权与数据范围判断所需的少量字段（id / username / tenant_id / role_id / is_active）
+- 用户信息变更（修改、删除、封禁）时必须调用 invalidate_user_cache 清除缓存
+- Redis 不可用时所有方法静默降级，调用方回退到数据库查询
+"""
+from typing import Any, Dict, Iterable, Literal, Optional
+
+from db.redis import RedisCache
+
+
+# 身份缓存过期时间（秒），过期后重新从数据库加载
+AUTH_CACHE_TTL = 120
+
+# 缓存的身份字段
+ADMIN_IDENTITY_FIELDS = ("id", "username", "tenant_id", "role_id", "is_active")
+
+UserKind = Literal["admin", "user"]
+
+
+def _cache_key(user_id: int, kind: UserKind) -> str:
+    """生成身份缓存键"""
+    return f"auth:{kind}:{user_id}"
+
+
+async def get_cached_user(user_id: int, kind: UserKind) -> Optional[Dict[str, Any]]:
+    """
+    读取缓存的用户身份快照
+
+    Args:
+        user_id: 用户ID
+        kind: 用户类型（admin-管理员, user-C端用户）
+
+    Returns:
+        身份快照字典，未命中返回 None
+    """
+    cached = await RedisCache.get_json(_cache_key(user_id, kind))
+    return cached if isinstance(cached, dict) else None
+
+
+async def set_cached_user(user_id: int, kind: UserKind, snapshot: Dict[str, Any]) -> None:
+    """
+    写入用户身份快照
+
+    Args:
+        user_id: 用户ID
+        kind: 用户类型
+        snapshot: 身份快照（仅包含可 JSON 序列化的字段）
+    """
+    await RedisCache.set_json(_cache_key(user_id, kind), snapshot, expire=AUTH_CACHE_TTL)
+
+
+async def invalidate_user_cache(user_id: int, kind: UserKind = "admin") -> None:
+    """
+    清除用户身份缓存
+
+    在用户信息修改、删除、状态变更后调用，保证封禁等操作立即生效
+    """
+    await RedisCache.delete(_cache_key(user_id, kind))
+
+
+async def invalidate_user_caches(user_ids: Iterable[int], kind: UserKind = "admin") -> None:
+    """批量清除用户身份缓存（一次 DEL 命令）"""
+    await RedisCache.delete(*(_cache_key(user_id, kind) for user_id in user_ids))
@@ -4,10 +4,11 @@ Application Configuration using pydantic-settings
 from typing import List, Optional
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-import json
 import os
+from functools import cached_property
 from urllib.parse import quote_plus
 from loguru import logger
+import orjson
 
 
 class Settings(BaseSettings):
@@ -24,6 +25,8 @@ class Settings(BaseSettings):
         extra="ignore",
         # 如果 .env 文件不存在或解析失败，不抛出异常，使用默认值
         env_ignore_empty=True,
+        # 连接 URL 等派生属性只计算一次（配置加载后不再修改）
+        ignored_types=(cached_property,),
     )
 
     # 应用配置
@@ -43,11 +46,24 @@ class Settings(BaseSettings):
     MYSQL_PASSWORD: str = ""
     MYSQL_DATABASE: str = ""
 
+    # 数据库连接池配置（按单个 worker 进程计算，总连接数 = workers × (POOL_SIZE + MAX_OVERFLOW)，
+    # 需小于 MySQL max_connections，默认 4 个 worker 共 120 个连接）
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 10  # 等待空闲连接的超时时间（秒），超时快速失败而不是长时间排队
+    # 是否输出 SQL 日志（与 DEBUG 分开控制，避免调试模式下每条 SQL 都写日志）
+    SQL_ECHO: bool = False
+
     # Redis 配置
     REDIS_HOST: str = ""
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str = ""
     REDIS_DB: int = 0
+    # Redis 连接池上限（按单个 worker 进程计算），连接用尽时等待 REDIS_POOL_TIMEOUT 秒而不是直接报错
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_POOL_TIMEOUT: int = 2
+    # 启动时预先建立的连接数，避免首批请求承担 TCP 握手与 AUTH 开销
+    REDIS_POOL_WARMUP: int = 4
 
     # JWT 配置
     JWT_SECRET_KEY: str = "your-jwt-secret-key"
@@ -59,6 +75,21 @@ class Settings(BaseSettings):
     # Admin 后台 access_token 有效期（小时），设为 8 则登录后 8 小时内无需重新登录；可通过 refresh_token 续期
     JWT_ADMIN_ACCESS_TOKEN_EXPIRE_HOURS: int = 8
 
+    # 密码哈希 bcrypt 成本因子（每降低 1 轮哈希耗时减半）
+    # 生产环境请保持 12 或更高；开发/测试环境可在 .env 中设为 10 加快初始化与登录
+    # 只影响新生成的哈希，已有哈希按其自身轮数校验
+    BCRYPT_ROUNDS: int = 12
+
+    # 后台登录失败限流：同一「用户名 + 客户端 IP」在窗口期内连续失败达到上限后暂停校验密码，避免撞库流量持续消耗 bcrypt 计算
+    # 按 IP 区分，其他来源的失败尝试不会锁住正常管理员；IP 取反向代理写入的值（X-Real-IP / X-Forwarded-For 最右侧）
+    ADMIN_LOGIN_MAX_FAILURES: int = 5
+    # 同一用户名不区分来源的失败上限，防止轮换 IP（或伪造代理头）绕过按 IP 的计数
+    ADMIN_LOGIN_MAX_FAILURES_PER_USER: int = 20
+    ADMIN_LOGIN_LOCK_SECONDS: int = 300
+
+    # 是否信任反向代理传入的 X-Forwarded-For / X-Real-IP（部署在 Nginx 之后时保持开启；直连部署应关闭以防伪造）
+    TRUST_PROXY_HEADERS: bool = True
+
     # 跨域配置
     CORS_ORIGINS: List[str] = ["http://0.0.0.0:8000", "http://0.0.0.0:9000"]
 
@@ -138,12 +169,12 @@ class Settings(BaseSettings):
         """解析 CORS_ORIGINS，支持 JSON 字符串格式"""
         if isinstance(v, str):
             try:
-                return json.loads(v)
-            except json.JSONDecodeError:
+                return orjson.loads(v)
+            except orjson.JSONDecodeError:
                 return [origin.strip() for origin in v.split(",")]
         return v
 
-    @property
+    @cached_property
     def MYSQL_DATABASE_URL(self) -> str:
         """MySQL 异步连接 URL"""
         # URL 编码用户名和密码，避免特殊字符（如 @）导致解析错误
@@ -155,7 +186,7 @@ class Settings(BaseSettings):
             "?charset=utf8mb4"
         )
 
-    @property
+    @cached_property
     def MYSQL_DATABASE_URL_SYNC(self) -> str:
         """MySQL 同步连接 URL（用于 Alembic 迁移）"""
         # URL 编码用户名和密码，避免特殊字符（如 @）导致解析错误
@@ -167,7 +198,7 @@ class Settings(BaseSettings):
             "?charset=utf8mb4"
         )
 
-    @property
+    @cached_property
     def REDIS_URL(self) -> str:
         """Redis 连接 URL"""
         if self.REDIS_PASSWORD:
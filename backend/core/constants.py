@@ -9,7 +9,6 @@ SYSTEM_ADMIN_ROLE_ID = 1
 # 仅平台超级管理员可见的菜单根节点 name（menus.name）
 PLATFORM_MENU_ROOT_NAME = "system"
 
-
 def is_full_menu_role(role_id: Optional[int]) -> bool:
     """未绑定角色或系统管理员角色（用于判断是否按「全量业务菜单」策略处理）"""
     return role_id is None or role_id == SYSTEM_ADMIN_ROLE_ID
@@ -2,195 +2,238 @@
 API Dependencies
 API 依赖项
 """
-from typing import Optional
-from fastapi import Depends, Header
-from sqlalchemy import select, update
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Type, TypeVar
+from fastapi import Depends, Header, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-# 延迟导入 get_db 以避免循环导入
-# db 模块在初始化时会导入 core.config，而 core/__init__.py 会导入 core.deps
-# 如果在模块级别导入 get_db，会形成循环依赖
-from core.security import decode_token
+from core.security import decode_token_subject, extract_bearer_token
+from core.auth_cache import ADMIN_IDENTITY_FIELDS, get_cached_user, set_cached_user
 from core.constants import admin_has_platform_privilege
 from utils.exceptions import UnauthorizedException, ForbiddenException
 from models.admin_user import AdminUser
 from models.role import Role
 from models.user import User
+from db import get_db
 
 
-def _get_db_dependency():
-    """
-    延迟导入 get_db 以避免循环导入
-    这个函数在运行时才会导入 db 模块
-    返回 get_db 函数本身，供 Depends 使用
-    """
-    from db import get_db
-    return get_db
+# 与路由使用同一个 get_db 依赖：FastAPI 按（依赖函数, scope）缓存，路由以默认 scope 声明 Depends(get_db) 时，
+# 鉴权依赖与路由在同一请求内共用一个会话，不再为鉴权单独创建会话。
+# 路由若改用 Depends(get_db, scope="function") 会得到另一个会话（缓存键不同），因此后台路由统一使用默认 scope。
+# （core/__init__.py 不导入本模块，且 models 已导入 db，不存在循环导入）
+_get_db = get_db
 
 
-# 创建一个异步生成器函数来延迟导入 get_db
-async def _get_db():
-    """延迟导入 get_db 的包装函数"""
-    from db import get_db
-    async for session in get_db():
-        yield session
+def _extract_access_user_id(authorization: Optional[str]) -> int:
+    """
+    从 Authorization header 中提取并验证访问令牌，返回用户ID
 
+    所有登录态依赖共用此函数，保证令牌解析逻辑只有一份
 
-async def get_current_user(
-    authorization: Optional[str] = Header(None, description="Bearer Token"),
-    db: AsyncSession = Depends(_get_db),
-) -> AdminUser:
-    """
-    获取当前登录的管理员用户
-    
-    从 Authorization header 中提取并验证 JWT token
+    Raises:
+        UnauthorizedException: 未提供令牌、格式错误、令牌无效或类型错误
     """
     if not authorization:
         raise UnauthorizedException(msg="未提供认证令牌")
-    
-    # 提取 Bearer token
-    scheme, _, token = authorization.partition(" ")
-    if scheme.lower() != "bearer" or not token:
+
+    token = extract_bearer_token(authorization)
+    if token is None:
         raise UnauthorizedException(msg="无效的认证格式")
-    
-    # 解码 token
-    payload = decode_token(token)
-    if not payload:
+
+    # 解码 token（sub 必须存在且为整数，已在解码时校验）
+    decoded = decode_token_subject(token)
+    if decoded is None:
         raise UnauthorizedException(msg="令牌无效或已过期")
+    user_id, payload = decoded
 
     # 验证 token 类型（必须是 access_token，不能是 refresh_token）
-    token_type = payload.get("type")
-    if token_type != "access":
+    if payload.get("type") != "access":
         raise UnauthorizedException(msg="令牌类型错误，请使用访问令牌")
-    
-    # 获取用户ID
-    user_id = payload.get("sub")
-    if not user_id:
-        raise UnauthorizedException(msg="令牌数据无效")
-    
-    # 从数据库获取管理员用户
-    result = await db.execute(
-        select(AdminUser).where(
-            AdminUser.id == int(user_id),
-            AdminUser.is_deleted == False
-        )
-    )
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise UnauthorizedException(msg="用户不存在")
-    
-    if not user.is_active:
-        raise UnauthorizedException(msg="用户已被封禁")
-    
-    return user
 
+    return user_id
 
-async def get_current_active_user(
-    current_user: AdminUser = Depends(get_current_user),
-) -> AdminUser:
-    """获取当前活跃用户（已验证状态）"""
-    return current_user
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
-async def get_current_admin(
-    current_user: AdminUser = Depends(get_current_user),
-) -> AdminUser:
-    """获取当前管理员用户（需要角色权限）"""
-    # 检查用户是否有角色
-    if not current_user.role_id:
-        raise ForbiddenException(msg="需要管理员权限")
-    
-    # 可以进一步检查角色代码，例如只有特定角色才能访问
-    # 这里暂时只检查是否有角色
-    return current_user
 
+def json_body(model: Type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """
+    JSON 请求体依赖工厂
 
-# 别名：保持向后兼容
-get_current_admin_user = get_current_admin
+    直接以原始字节调用 model_validate_json，由 pydantic-core 一次完成解析与校验，
+    不再先 json.loads 成 Python 字典再校验；用于高频写入/对话接口。
+    校验失败时抛出 RequestValidationError（loc 以 "body" 开头），错误响应与普通请求体参数一致
 
+    Args:
+        model: 请求体 Pydantic 模型
 
-async def require_platform_admin(
-    current_user: AdminUser = Depends(get_current_admin),
-) -> AdminUser:
+    Returns:
+        可直接用于 Depends 的依赖函数
     """
-    仅平台超级管理员可访问：admin_users.tenant_id 必须为空（显式平台账号）。
+    async def dependency(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
 
-    已绑定租户的「管理员」角色仅能操作本租户数据，不能走平台专属接口。
+    dependency.json_body_model = model
+    return dependency
+
+
+def _inline_schema_refs(node: Any, defs: dict) -> Any:
+    """将 JSON Schema 中指向 $defs 的引用替换为定义本身"""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            return _inline_schema_refs(defs[ref[len("#/$defs/"):]], defs)
+        return {key: _inline_schema_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_schema_refs(item, defs) for item in node]
+    return node
+
+
+def json_body_openapi(model: Type[BaseModel]) -> dict:
     """
-    if not admin_has_platform_privilege(
-        tenant_id=current_user.tenant_id,
-        role_id=current_user.role_id,
+    json_body 路由的 openapi_extra：补充请求体文档
+
+    json_body 在依赖中读取原始字节，FastAPI 无法识别请求体，需在路由装饰器上声明：
+        @router.post("", openapi_extra=json_body_openapi(AgentCreate))
+
+    嵌套模型直接内联（不同模块存在同名模型，不写入 components 以免冲突）
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_schema_refs(schema, defs)}},
+        }
+    }
+
+
+def _make_current_user_dep(
+    loader: Callable[[AsyncSession, int], Awaitable[Any]],
+    *,
+    optional: bool = False,
+):
+    """
+    登录态依赖工厂
+
+    Args:
+        loader: 根据用户ID加载并校验用户的协程，校验失败时抛出 UnauthorizedException
+        optional: 是否为可选登录（游客模式），为 True 时认证失败返回 None 而不是抛出异常
+
+    Returns:
+        可直接用于 Depends 的依赖函数
+    """
+    async def dependency(
+        authorization: Optional[str] = Header(None, description="Bearer Token"),
+        db: AsyncSession = Depends(_get_db),
     ):
-        raise ForbiddenException(msg="仅平台管理员可操作")
-    return current_user
+        try:
+            user_id = _extract_access_user_id(authorization)
+            return await loader(db, user_id)
+        except UnauthorizedException:
+            if optional:
+                return None
+            raise
 
+    return dependency
 
-async def get_current_miniprogram_user(
-    authorization: Optional[str] = Header(None, description="Bearer Token"),
-    db: AsyncSession = Depends(_get_db),
-) -> User:
+
+@dataclass(slots=True)
+class AuthedAdmin:
     """
-    获取当前登录的小程序用户
+    已认证管理员身份
 
-    从 Authorization header 中提取并验证 JWT token
-    适用于微信小程序接口
+    仅包含鉴权与数据范围判断所需字段，由 get_current_user 返回；
+    需要完整 ORM 对象的接口请自行按 id 查询
     """
-    if not authorization:
-        raise UnauthorizedException(msg="未提供认证令牌")
+    id: int
+    username: str
+    tenant_id: Optional[int]
+    role_id: Optional[int]
+    is_active: bool
+
+
+# 鉴权查询语句在模块加载时构造一次，按用户ID绑定参数执行，
+# 避免每次请求重新构建表达式树，并稳定命中 SQLAlchemy 编译缓存
+_ADMIN_IDENTITY_BY_ID = select(
+    AdminUser.id,
+    AdminUser.username,
+    AdminUser.tenant_id,
+    AdminUser.role_id,
+    AdminUser.is_active,
+).where(
+    AdminUser.id == bindparam("uid"),
+    AdminUser.is_deleted == False
+)
+
+_USER_BY_ID = select(User).where(
+    User.id == bindparam("uid"),
+    User.is_deleted == False
+)
+
+
+async def _load_admin_user(db: AsyncSession, uid: int) -> AuthedAdmin:
+    """根据ID加载管理员身份（优先读取身份缓存）"""
+    # 优先读取 Redis 身份缓存，命中时无需访问数据库
+    cached = await get_cached_user(uid, "admin")
+    if cached is not None:
+        user = AuthedAdmin(*(cached.get(k) for k in ADMIN_IDENTITY_FIELDS))
+    else:
+        # 从数据库获取管理员身份（只查询所需列，不构造 ORM 对象）
+        result = await db.execute(_ADMIN_IDENTITY_BY_ID, {"uid": uid})
+        row = result.first()
+
+        if not row:
+            raise UnauthorizedException(msg="用户不存在")
+
+        user = AuthedAdmin(*row)
+        # 写入身份缓存（封禁状态也缓存，避免被封禁账号反复穿透到数据库）
+        await set_cached_user(
+            uid, "admin", {k: getattr(user, k) for k in ADMIN_IDENTITY_FIELDS}
+        )
 
-    # 提取 Bearer token
-    scheme, _, token = authorization.partition(" ")
-    if scheme.lower() != "bearer" or not token:
-        raise UnauthorizedException(msg="无效的认证格式")
+    if not user.is_active:
+        raise UnauthorizedException(msg="用户已被封禁")
 
-    # 解码 token
-    payload = decode_token(token)
-    if not payload:
-        raise UnauthorizedException(msg="令牌无效或已过期")
+    return user
 
-    # 验证 token 类型（必须是 access_token，不能是 refresh_token）
-    token_type = payload.get("type")
-    if token_type != "access":
-        raise UnauthorizedException(msg="令牌类型错误，请使用访问令牌")
 
-    # 获取用户ID
-    user_id = payload.get("sub")
-    if not user_id:
-        raise UnauthorizedException(msg="令牌数据无效")
+async def _load_miniprogram_user(db: AsyncSession, uid: int) -> User:
+    """
+    根据ID加载小程序用户（User 表，不是 AdminUser）
 
-    # 从数据库获取用户（小程序用户使用 User 表，不是 AdminUser）
+    令牌校验结果已由 decode_token_subject 在进程内缓存；这里返回的 User 会被接口修改并随请求提交
+    （余额、等级等），因此每次都按主键查询当前会话中的最新数据，不做跨请求缓存
+    """
     # 使用原始 SQL 查询避免枚举值转换错误
     try:
-        result = await db.execute(
-            select(User).where(
-                User.id == int(user_id),
-                User.is_deleted == False
-            )
-        )
+        result = await db.execute(_USER_BY_ID, {"uid": uid})
         user = result.scalar_one_or_none()
     except Exception as e:
         # 处理查询异常（兼容旧数据）
         from loguru import logger
         
-        logger.error(f"查询用户失败: {str(e)}, user_id={user_id}")
+        logger.error(f"查询用户失败: {str(e)}, user_id={uid}")
         
         # 尝试修复：使用原始 SQL 更新用户的 level_code 字段为默认值
         try:
             await db.execute(
                 update(User)
-                .where(User.id == int(user_id))
+                .where(User.id == uid)
                 .values(level_code="normal")
             )
             await db.commit()
             
             # 重新查询
-            result = await db.execute(
-                select(User).where(
-                    User.id == int(user_id),
-                    User.is_deleted == False
-                )
-            )
+            result = await db.execute(_USER_BY_ID, {"uid": uid})
             user = result.scalar_one_or_none()
         except Exception as fix_error:
             logger.error(f"修复用户等级失败: {str(fix_error)}")
@@ -205,58 +248,54 @@ async def get_current_miniprogram_user(
     return user
 
 
-async def get_current_miniprogram_user_optional(
-    authorization: Optional[str] = Header(None, description="Bearer Token"),
-    db: AsyncSession = Depends(_get_db),
-) -> Optional[User]:
-    """
-    获取当前登录的小程序用户（可选，支持游客模式）
+# 获取当前登录的管理员用户
+get_current_user = _make_current_user_dep(_load_admin_user)
 
-    从 Authorization header 中提取并验证 JWT token
-    如果没有提供 token 或 token 无效，返回 None（游客模式）
-    适用于需要支持游客访问的微信小程序接口
-    """
-    if not authorization:
-        return None
 
-    # 提取 Bearer token
-    scheme, _, token = authorization.partition(" ")
-    if scheme.lower() != "bearer" or not token:
-        return None
+async def get_current_active_user(
+    current_user: AuthedAdmin = Depends(get_current_user),
+) -> AuthedAdmin:
+    """获取当前活跃用户（已验证状态）"""
+    return current_user
 
-    # 解码 token
-    payload = decode_token(token)
-    if not payload:
-        return None
 
-    # 验证 token 类型（必须是 access_token，不能是 refresh_token）
-    token_type = payload.get("type")
-    if token_type != "access":
-        return None
-
-    # 获取用户ID
-    user_id = payload.get("sub")
-    if not user_id:
-        return None
-
-    # 从数据库获取用户（小程序用户使用 User 表，不是 AdminUser）
-    result = await db.execute(
-        select(User).where(
-            User.id == int(user_id),
-            User.is_deleted == False
-        )
-    )
-    user = result.scalar_one_or_none()
+async def get_current_admin(
+    current_user: AuthedAdmin = Depends(get_current_user),
+) -> AuthedAdmin:
+    """获取当前管理员用户（需要角色权限）"""
+    # 检查用户是否有角色
+    if not current_user.role_id:
+        raise ForbiddenException(msg="需要管理员权限")
+    
+    # 可以进一步检查角色代码，例如只有特定角色才能访问
+    # 这里暂时只检查是否有角色
+    return current_user
 
-    if not user:
-        return None
 
-    if not user.is_active:
-        return None
+# 别名：保持向后兼容
+get_current_admin_user = get_current_admin
 
-    return user
 
+async def require_platform_admin(
+    current_user: AuthedAdmin = Depends(get_current_admin),
+) -> AuthedAdmin:
+    """
+    仅平台超级管理员可访问：admin_users.tenant_id 必须为空（显式平台账号）。
 
+    已绑定租户的「管理员」角色仅能操作本租户数据，不能走平台专属接口。
+    """
+    if not admin_has_platform_privilege(
+        tenant_id=current_user.tenant_id,
+        role_id=current_user.role_id,
+    ):
+        raise ForbiddenException(msg="仅平台管理员可操作")
+    return current_user
 
 
+# 获取当前登录的小程序用户（适用于微信小程序 / PC 官网接口）
+get_current_miniprogram_user = _make_current_user_dep(_load_miniprogram_user)
 
+# 获取当前登录的小程序用户（可选，支持游客模式）：未登录或令牌无效时返回 None
+get_current_miniprogram_user_optional = _make_current_user_dep(
+    _load_miniprogram_user, optional=True
+)
@@ -1,15 +1,33 @@
 """
 Security utilities - JWT and Password hashing
 """
+import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 
-from jose import jwt, JWTError
+import jwt
+from jwt import PyJWTError
 import bcrypt
 
 from core.config import settings
 
 
+# 令牌解码结果缓存（进程内 LRU + TTL）
+# 同一客户端在有效期内会反复携带同一个 JWT，缓存解码结果可省去每次请求的签名校验与 JSON 解析
+# decode_token 为同步函数，在事件循环中不会被并发打断，因此无需加锁
+_DECODE_CACHE_MAXSIZE = 4096
+_DECODE_CACHE_TTL = 300  # 秒
+_decode_cache: "OrderedDict[str, Tuple[float, int, dict[str, Any]]]" = OrderedDict()
+
+# 解码时由 PyJWT 校验必需声明：缺少 sub / exp 的令牌直接视为无效
+_DECODE_OPTIONS = {"require": ["sub", "exp"]}
+
+# 常见写法的 Bearer 前缀，startswith 命中时无需再做大小写转换
+_BEARER_PREFIXES = ("Bearer ", "bearer ")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
     try:
@@ -23,12 +41,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def hash_password(password: str) -> str:
     """对密码进行哈希"""
-    # 生成盐并哈希密码
-    salt = bcrypt.gensalt()
+    # 生成盐并哈希密码（成本因子见 settings.BCRYPT_ROUNDS）
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在线程池中验证密码，bcrypt 计算期间不阻塞事件循环"""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """在线程池中计算密码哈希，bcrypt 计算期间不阻塞事件循环"""
+    return await asyncio.to_thread(hash_password, password)
+
+
 def get_password_hash(password: str) -> str:
     """获取密码哈希（hash_password 的别名）"""
     return hash_password(password)
@@ -121,25 +149,77 @@ def create_refresh_token(
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[dict[str, Any]]:
+def decode_token_subject(token: str) -> Optional[Tuple[int, dict[str, Any]]]:
     """
-    解码 JWT 令牌
+    解码 JWT 令牌并返回用户ID
+    
+    sub / exp 声明在解码时校验，sub 在此处一次性转换为整数并随解码结果缓存，
+    缓存时间不超过令牌剩余有效期；调用方只应读取返回的字典，不要修改它
     
     Args:
         token: JWT 令牌字符串
     
     Returns:
-        解码后的数据字典，如果无效则返回 None
+        (用户ID, 解码后的数据字典)，如果无效则返回 None
     """
+    now = time.monotonic()
+    cached = _decode_cache.get(token)
+    if cached is not None:
+        expire_at, user_id, payload = cached
+        if expire_at > now:
+            _decode_cache.move_to_end(token)
+            return user_id, payload
+        del _decode_cache[token]
+
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
+            algorithms=[settings.JWT_ALGORITHM],
+            options=_DECODE_OPTIONS,
         )
-        return payload
-    except JWTError:
+        user_id = int(payload["sub"])
+    except (PyJWTError, ValueError):
         return None
 
+    # 缓存时间取默认 TTL 与令牌剩余有效期的较小值，过期令牌不会被缓存命中
+    ttl = min(_DECODE_CACHE_TTL, payload["exp"] - time.time())
+    if ttl > 0:
+        _decode_cache[token] = (now + ttl, user_id, payload)
+        if len(_decode_cache) > _DECODE_CACHE_MAXSIZE:
+            _decode_cache.popitem(last=False)
+
+    return user_id, payload
 
 
+def decode_token(token: str) -> Optional[dict[str, Any]]:
+    """
+    解码 JWT 令牌
+    
+    Args:
+        token: JWT 令牌字符串
+    
+    Returns:
+        解码后的数据字典，如果无效则返回 None
+    """
+    decoded = decode_token_subject(token)
+    return decoded[1] if decoded else None
+
+
+def extract_bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """
+    从 Authorization header 中提取 Bearer 令牌
+
+    前缀大小写不敏感；常见写法直接 startswith 判断，其他大小写组合才退回到小写比较
+
+    Args:
+        authorization: Authorization header 值
+
+    Returns:
+        令牌字符串，格式不正确或令牌为空时返回 None
+    """
+    if not authorization or len(authorization) <= 7:
+        return None
+    if not authorization.startswith(_BEARER_PREFIXES) and authorization[:7].lower() != "bearer ":
+        return None
+    return authorization[7:]
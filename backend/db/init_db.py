@@ -5,6 +5,7 @@
 import asyncio
 import sys
 from pathlib import Path
+from typing import Optional
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -267,107 +268,66 @@ async def init_menus(session: AsyncSession) -> None:
         },
     ]
     
-    # 创建菜单（递归处理父子关系）
-    created_menus = {}  # 用于存储已创建的菜单，key 为 name
+    # 创建菜单（按层级批量处理父子关系）
+    # 一次查询预加载已存在的同名菜单；每层新菜单 add_all 后只 flush 一次拿到 ID，
+    # 再作为下一层的 parent_id，避免逐条 flush 带来的 N 次往返
+    all_names = []
+    pending = list(menus_data)
+    while pending:
+        all_names.extend(item["name"] for item in pending)
+        pending = [child for item in pending for child in item.get("children") or []]
     
-    async def create_menu_item(menu_data: dict, parent_id: int = None) -> Menu:
-        """
-        递归创建菜单项
-        
-        Args:
-            menu_data: 菜单数据字典
-            parent_id: 父菜单ID
-        
-        Returns:
-            Menu: 创建的菜单对象
-        """
-        # 检查菜单是否已存在（通过 name 判断）
-        name = menu_data["name"]
-        if name in created_menus:
-            logger.info(f"菜单 {name} 已存在，更新配置")
-            menu = created_menus[name]
-            # 更新菜单配置
-            menu.path = menu_data["path"]
-            menu.component = menu_data.get("component")
-            menu.redirect = menu_data.get("redirect")
-            menu.title = menu_data["title"]
-            menu.icon = menu_data.get("icon", "Menu")
-            menu.sort_order = menu_data.get("sort_order", 0)
-            menu.is_link = menu_data.get("is_link", "")
-            menu.is_hide = menu_data.get("is_hide", False)
-            menu.is_full = menu_data.get("is_full", False)
-            menu.is_affix = menu_data.get("is_affix", False)
-            menu.is_keep_alive = menu_data.get("is_keep_alive", True)
-            menu.is_enabled = True  # 确保启用
-            menu.parent_id = parent_id
-            menu.active_menu = menu_data.get("active_menu")
-            await session.flush()
-            return menu
-        
-        # 检查数据库中是否已存在
-        result = await session.execute(select(Menu).where(Menu.name == name))
-        db_menu = result.scalar_one_or_none()
-        if db_menu:
-            logger.info(f"菜单 {name} 在数据库中已存在，更新配置")
-            # 更新菜单配置
-            db_menu.path = menu_data["path"]
-            db_menu.component = menu_data.get("component")
-            db_menu.redirect = menu_data.get("redirect")
-            db_menu.title = menu_data["title"]
-            db_menu.icon = menu_data.get("icon", "Menu")
-            db_menu.sort_order = menu_data.get("sort_order", 0)
-            db_menu.is_link = menu_data.get("is_link", "")
-            db_menu.is_hide = menu_data.get("is_hide", False)
-            db_menu.is_full = menu_data.get("is_full", False)
-            db_menu.is_affix = menu_data.get("is_affix", False)
-            db_menu.is_keep_alive = menu_data.get("is_keep_alive", True)
-            db_menu.is_enabled = True  # 确保启用
-            db_menu.parent_id = parent_id
-            db_menu.active_menu = menu_data.get("active_menu")
-            await session.flush()
-            created_menus[name] = db_menu
-            return db_menu
-        
-        # 提取子菜单数据（不修改原字典）
-        children_data = menu_data.get("children")
-        
-        # 创建菜单对象
-        menu = Menu(
-            parent_id=parent_id,
-            name=menu_data["name"],
-            path=menu_data["path"],
-            component=menu_data.get("component"),
-            redirect=menu_data.get("redirect"),
-            title=menu_data["title"],
-            icon=menu_data.get("icon", "Menu"),
-            sort_order=menu_data.get("sort_order", 0),
-            is_link=menu_data.get("is_link", ""),
-            is_hide=menu_data.get("is_hide", False),
-            is_full=menu_data.get("is_full", False),
-            is_affix=menu_data.get("is_affix", False),
-            is_keep_alive=menu_data.get("is_keep_alive", True),
-            is_enabled=True,
-            active_menu=menu_data.get("active_menu"),
-        )
-        
-        session.add(menu)
-        await session.flush()  # 刷新以获取 ID
-        
-        # 保存到字典中
-        created_menus[name] = menu
-        
-        logger.info(f"创建菜单: {menu.title} (name={menu.name}, path={menu.path})")
-        
-        # 递归创建子菜单
-        if children_data:
-            for child_data in children_data:
-                await create_menu_item(child_data.copy(), parent_id=menu.id)
-        
-        return menu
+    result = await session.execute(select(Menu).where(Menu.name.in_(all_names)))
+    existing_menus = {menu.name: menu for menu in result.scalars().all()}
+    created_menus = {}  # 用于存储已处理的菜单，key 为 name
+    
+    def apply_menu_fields(menu: Menu, menu_data: dict, parent_id: Optional[int]) -> None:
+        """将菜单数据写入菜单对象（新建与更新共用）"""
+        menu.parent_id = parent_id
+        menu.path = menu_data["path"]
+        menu.component = menu_data.get("component")
+        menu.redirect = menu_data.get("redirect")
+        menu.title = menu_data["title"]
+        menu.icon = menu_data.get("icon", "Menu")
+        menu.sort_order = menu_data.get("sort_order", 0)
+        menu.is_link = menu_data.get("is_link", "")
+        menu.is_hide = menu_data.get("is_hide", False)
+        menu.is_full = menu_data.get("is_full", False)
+        menu.is_affix = menu_data.get("is_affix", False)
+        menu.is_keep_alive = menu_data.get("is_keep_alive", True)
+        menu.is_enabled = True  # 确保启用
+        menu.active_menu = menu_data.get("active_menu")
     
-    # 创建所有菜单
-    for menu_data in menus_data:
-        await create_menu_item(menu_data.copy())
+    # 当前层级：(菜单数据, 父菜单 name)
+    level = [(menu_data, None) for menu_data in menus_data]
+    while level:
+        new_menus = []
+        next_level = []
+        for menu_data, parent_name in level:
+            name = menu_data["name"]
+            parent_id = created_menus[parent_name].id if parent_name else None
+            
+            if name in created_menus:
+                logger.info(f"菜单 {name} 已存在，更新配置")
+                menu = created_menus[name]
+            elif name in existing_menus:
+                logger.info(f"菜单 {name} 在数据库中已存在，更新配置")
+                menu = existing_menus[name]
+                created_menus[name] = menu
+            else:
+                menu = Menu(name=name)
+                new_menus.append(menu)
+                created_menus[name] = menu
+                logger.info(f"创建菜单: {menu_data['title']} (name={name}, path={menu_data['path']})")
+                # 仅新建菜单继续处理子菜单（已存在菜单只更新自身，与原递归逻辑一致）
+                next_level.extend((child, name) for child in menu_data.get("children") or [])
+            
+            apply_menu_fields(menu, menu_data, parent_id)
+        
+        if new_menus:
+            session.add_all(new_menus)
+        await session.flush()  # 每层刷新一次以获取新菜单 ID
+        level = next_level
     
     await session.commit()
     logger.info("菜单数据初始化完成")
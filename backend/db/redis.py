@@ -2,6 +2,7 @@
 Redis Connection Management
 """
 from typing import Optional, Any, Dict, List
+import asyncio
 import json
 import redis.asyncio as aioredis
 from redis.asyncio import Redis
@@ -27,16 +28,21 @@ async def init_redis() -> None:
     logger.info("Initializing Redis connection...")
     
     try:
-        redis_client = aioredis.from_url(
+        # 有上限的阻塞连接池：并发高峰时排队等待空闲连接，而不是无限新建连接
+        pool = aioredis.BlockingConnectionPool.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
             socket_connect_timeout=2,  # 连接超时 2 秒
             socket_timeout=2,  # 操作超时 2 秒
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
         )
+        redis_client = Redis.from_pool(pool)  # 关闭客户端时一并关闭连接池
         
-        # 测试连接
-        await redis_client.ping()
+        # 测试连接；并发 PING 同时预热若干连接放回连接池
+        warmup = max(1, min(settings.REDIS_POOL_WARMUP, settings.REDIS_MAX_CONNECTIONS))
+        await asyncio.gather(*(redis_client.ping() for _ in range(warmup)))
         logger.info("Redis connection initialized successfully")
     except Exception as e:
         logger.warning(
@@ -135,14 +141,14 @@ class RedisCache:
             return False
     
     @staticmethod
-    async def delete(key: str) -> bool:
-        """删除缓存"""
-        if redis_client:
+    async def delete(*keys: str) -> bool:
+        """删除缓存（支持一次删除多个键）"""
+        if redis_client and keys:
             try:
-                await redis_client.delete(key)
+                await redis_client.delete(*keys)
                 return True
             except Exception as e:
-                logger.warning(f"Redis delete 失败: {key}, 错误: {e}")
+                logger.warning(f"Redis delete 失败: {keys}, 错误: {e}")
                 return False
         return False
     
@@ -162,6 +168,20 @@ class RedisCache:
                 return 0
         return 0
     
+    @staticmethod
+    async def incr(key: str, expire: Optional[int] = 3600) -> Optional[int]:
+        """计数加一，首次创建时设置过期时间（expire 为 None 时不过期）；Redis 不可用时返回 None"""
+        if redis_client:
+            try:
+                value = await redis_client.incr(key)
+                if value == 1 and expire:
+                    await redis_client.expire(key, expire)
+                return value
+            except Exception as e:
+                logger.warning(f"Redis incr 失败: {key}, 错误: {e}")
+                return None
+        return None
+    
     @staticmethod
     async def exists(key: str) -> bool:
         """检查键是否存在"""
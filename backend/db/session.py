@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import event
+from sqlalchemy.orm import DeclarativeBase, Session
 from sqlalchemy.pool import NullPool
 from loguru import logger
 
@@ -27,6 +28,37 @@ engine: AsyncEngine | None = None
 # 异步会话工厂
 async_session_maker: async_sessionmaker[AsyncSession] | None = None
 
+# session.info 中的写入标记：当前事务执行过 flush 或非 SELECT 语句
+_HAS_WRITES = "has_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session: Session, flush_context) -> None:
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state) -> None:
+    # text() 语句无法区分读写，按写入处理
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES, None)
+
+
+def _has_writes(session: AsyncSession) -> bool:
+    """会话当前事务中是否有需要提交的写入"""
+    return bool(
+        session.info.get(_HAS_WRITES)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
 
 async def init_db() -> None:
     """
@@ -60,17 +92,27 @@ async def init_db() -> None:
                 parsed.fragment
             ))
 
+        if settings.APP_ENV == "testing":
+            # 测试环境不复用连接（NullPool 不接受连接池大小参数）
+            pool_kwargs = {"poolclass": NullPool}
+        else:
+            pool_kwargs = {
+                "pool_pre_ping": True,  # 连接健康检查
+                "pool_recycle": 3600,   # 1小时回收连接
+                "pool_size": settings.DB_POOL_SIZE,          # 连接池大小
+                "max_overflow": settings.DB_MAX_OVERFLOW,    # 最大溢出连接数
+                "pool_timeout": settings.DB_POOL_TIMEOUT,    # 获取连接超时
+            }
+
         engine = create_async_engine(
             db_url,
-            echo=settings.DEBUG,
-            poolclass=NullPool if settings.APP_ENV == "testing" else None,
-            pool_pre_ping=True,  # 连接健康检查
-            pool_recycle=3600,   # 1小时回收连接
-            pool_size=10,        # 连接池大小
-            max_overflow=20,     # 最大溢出连接数
+            echo=settings.SQL_ECHO,
+            # 编译缓存：模块级预构建的语句与列表查询变体较多，调大默认的 500 避免 LRU 淘汰后重复编译
+            query_cache_size=1200,
             connect_args={
                 "connect_timeout": 10,
             },
+            **pool_kwargs,
         )
 
         async_session_maker = async_sessionmaker(
@@ -128,6 +170,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     获取数据库会话的依赖项
     
+    请求处理完成后统一提交事务，出现异常则回滚。
+    该提交发生在响应发送之后，需要让客户端感知提交失败的写接口应在路由中显式 await db.commit()。
+    只读请求（没有 flush 或写语句）不发送 COMMIT，关闭会话时由连接池回滚即可。
+    
     Yields:
         AsyncSession: 异步数据库会话
     """
@@ -137,7 +183,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            if _has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
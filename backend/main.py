@@ -11,8 +11,10 @@ from contextlib import asynccontextmanager
 from core.config import settings
 from routers import client_router, admin_router, admin_v2_router, client_v2_router
 from utils.exceptions import register_exception_handlers
+from utils.response import ORJSONResponse
 from db.session import init_db, close_db
 from db.redis import init_redis, close_redis
+from utils.http_client import close_http_clients
 from middleware.rate_limiter import RateLimiterMiddleware
 from loguru import logger
 
@@ -120,7 +122,8 @@ async def lifespan(app: FastAPI):
         
         logger.info("✅ [定时任务] 所有Worker已停止")
 
-    # 3. 关闭Redis和数据库连接
+    # 3. 关闭共享HTTP客户端、Redis和数据库连接
+    await close_http_clients()
     await close_redis()
     await close_db()
 
@@ -135,6 +138,8 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if settings.DEBUG else None,
         openapi_url="/openapi.json" if settings.DEBUG else None,
         lifespan=lifespan,
+        # 所有接口默认使用 orjson 序列化响应
+        default_response_class=ORJSONResponse,
         openapi_tags=[
             {"name": "C端接口", "description": "小程序与PC官网接口：认证、项目管理、内容生成、灵感、文章等"},
             {"name": "B端接口", "description": "管理后台接口：用户管理、智能体、系统配置、数据统计等"},
@@ -193,12 +198,34 @@ async def health_check():
     }
 
 
+def _server_backends() -> tuple[str, str]:
+    """
+    选择事件循环与 HTTP 解析器实现
+
+    优先使用 uvloop + httptools（吞吐量更高），未安装时（如 Windows 开发环境）回退到 asyncio + h11
+    """
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    return loop, http
+
+
 if __name__ == "__main__":
+    loop, http = _server_backends()
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        loop=loop,
+        http=http,
     )
 
 
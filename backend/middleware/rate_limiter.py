@@ -7,15 +7,21 @@ API 请求频率限制中间件
 - 1 分钟内超过 60 次调用自动标记为异常
 - 记录异常用户到 Redis
 """
-import json
+import asyncio
+import hashlib
 import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import orjson
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from loguru import logger
+from redis.exceptions import NoScriptError
 
-from db.redis import redis_client
+from core.config import settings
+from core.security import decode_token_subject, extract_bearer_token
+from db.redis import get_redis
+from utils.security import get_client_ip
 
 
 # Redis 键前缀
@@ -27,12 +33,179 @@ RATE_LIMIT_WINDOW = 60      # 时间窗口（秒）: 1 分钟
 RATE_LIMIT_MAX_CALLS = 60   # 最大调用次数: 60 次/分钟
 ABNORMAL_RECORD_LIMIT = 100  # 最多保留的异常记录数
 
+# 进程内快速放行配置：依据最近一次 Redis 返回的窗口内次数判断，远低于上限时不等待 Redis
+LOCAL_ADMIT_RATIO = 0.8      # 已知次数（含计数中的请求）低于上限的 80% 时本地放行
+LOCAL_STATE_TTL = 1.0        # Redis 次数的有效期（秒），过期后必须重新同步等待 Redis
+LOCAL_STATE_MAX_USERS = 10000  # 最多跟踪的用户数
+_LOCAL_ADMIT_LIMIT = int(RATE_LIMIT_MAX_CALLS * LOCAL_ADMIT_RATIO)
+
+# 滑动窗口计数脚本：每个用户一个 Hash，字段为秒级时间戳、值为该秒的调用次数
+# 本次调用计入当前秒的桶，删除窗口外的桶并汇总窗口内次数，内存占用不随调用量增长（最多约 60 个字段）；
+# 超过上限时在同一脚本内由 cjson 生成异常记录并写入列表，正常请求不做序列化，超限请求也无需第二次往返
+# （脚本内无法取本地时间，记录只写 timestamp，detected_at 在读取时补齐）
+# KEYS[1]=计数键  KEYS[2]=异常用户列表键
+# ARGV: 当前时间(秒), 时间窗口(秒), 键过期秒数, 最大调用次数, 异常记录保留条数, 用户 ID, 接口路径, 客户端 IP
+_SLIDING_WINDOW_LUA = """
+local window_start = tonumber(ARGV[1]) - tonumber(ARGV[2])
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+local count = 0
+local expired = {}
+local buckets = redis.call('HGETALL', KEYS[1])
+for i = 1, #buckets, 2 do
+    if tonumber(buckets[i]) <= window_start then
+        expired[#expired + 1] = buckets[i]
+    else
+        count = count + tonumber(buckets[i + 1])
+    end
+end
+if #expired > 0 then
+    redis.call('HDEL', KEYS[1], unpack(expired))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if count > tonumber(ARGV[4]) then
+    redis.call('LPUSH', KEYS[2], cjson.encode({
+        user_id = tonumber(ARGV[6]),
+        call_count = count,
+        endpoint = ARGV[7],
+        ip_address = ARGV[8],
+        reason = '1分钟内调用API ' .. count .. ' 次，超过限制 ' .. ARGV[4] .. ' 次',
+        timestamp = tonumber(ARGV[1]),
+    }))
+    redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[5]) - 1)
+end
+return count
+"""
+_SLIDING_WINDOW_SHA = hashlib.sha1(_SLIDING_WINDOW_LUA.encode()).hexdigest()
+
+# 429 响应体：仅调用次数随请求变化，其余部分在模块加载时编码一次
+_TOO_MANY_REQUESTS_PREFIX, _TOO_MANY_REQUESTS_SUFFIX = orjson.dumps({
+    "code": 429,
+    "data": None,
+    "msg": f"请求过于频繁，请稍后再试。当前1分钟内已调用 {{count}} 次，限制 {RATE_LIMIT_MAX_CALLS} 次。",
+}).split(b"{count}")
+
+
+async def _evalsha_batch(redis, batch: List[Tuple[List[str], List[Any], asyncio.Future]]) -> List[Any]:
+    """
+    通过一次非事务 Pipeline 为批次内每个请求执行 EVALSHA，返回与批次一一对应的结果（出错项为异常对象）
+    
+    Redis 重启或首次执行时脚本未缓存（NOSCRIPT）：SCRIPT LOAD 一次后仅重发失败项，
+    整批只多一次往返，稳态下没有额外开销
+    """
+    pipe = redis.pipeline(transaction=False)
+    for keys, args, _ in batch:
+        pipe.evalsha(_SLIDING_WINDOW_SHA, len(keys), *keys, *args)
+    results = await pipe.execute(raise_on_error=False)
+    
+    missing = [i for i, result in enumerate(results) if isinstance(result, NoScriptError)]
+    if missing:
+        await redis.script_load(_SLIDING_WINDOW_LUA)
+        pipe = redis.pipeline(transaction=False)
+        for i in missing:
+            keys, args, _ = batch[i]
+            pipe.evalsha(_SLIDING_WINDOW_SHA, len(keys), *keys, *args)
+        for i, result in zip(missing, await pipe.execute(raise_on_error=False)):
+            results[i] = result
+    return results
+
+
+# 待合并的计数请求：(脚本 KEYS, 脚本 ARGV, 结果 Future)
+_pending_counts: List[Tuple[List[str], List[Any], asyncio.Future]] = []
+_flush_task: Optional[asyncio.Task] = None
+
+
+def _enqueue_count(keys: List[str], args: List[Any]) -> asyncio.Future:
+    """
+    将一次滑动窗口计数加入待合并队列，返回结果 Future（窗口内调用次数）
+    
+    请求由后台刷新任务统一通过一次 Pipeline 执行：
+    刷新任务在下一轮事件循环立即发送，不额外等待；发送期间到达的请求自然积累到下一批
+    """
+    global _flush_task
+    
+    future = asyncio.get_running_loop().create_future()
+    _pending_counts.append((keys, args, future))
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush_pending_counts())
+    return future
+
+
+async def _count_call(keys: List[str], args: List[Any]) -> int:
+    """执行一次滑动窗口计数脚本并等待返回窗口内调用次数"""
+    return await _enqueue_count(keys, args)
+
+
+async def _flush_pending_counts() -> None:
+    """
+    后台刷新任务：取出全部待处理请求，一次 Pipeline 发送所有 EVALSHA
+    
+    低并发时队列中只有当前请求，立即发送、不引入固定等待；
+    执行期间新到达的请求由下一轮循环处理，队列清空后任务结束
+    """
+    while _pending_counts:
+        batch = _pending_counts[:]
+        _pending_counts.clear()
+        
+        try:
+            redis = await get_redis()
+            if not redis:
+                raise RuntimeError("Redis 不可用")
+            
+            results = await _evalsha_batch(redis, batch)
+            for (_, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def _build_abnormal_record(
+    user_id: int,
+    call_count: int,
+    endpoint: str,
+    ip_address: str,
+) -> bytes:
+    """构建异常用户记录（JSON 字节），供手动补录使用"""
+    now = time.time()
+    return orjson.dumps({
+        "user_id": user_id,
+        "call_count": call_count,
+        "endpoint": endpoint,
+        "ip_address": ip_address,
+        "reason": f"1分钟内调用API {call_count} 次，超过限制 {RATE_LIMIT_MAX_CALLS} 次",
+        "detected_at": datetime.fromtimestamp(now).isoformat(),
+        "timestamp": int(now),
+    })
+
+
+def _count_script_params(user_id: int, endpoint: str, ip_address: str) -> Tuple[List[str], List[Any]]:
+    """滑动窗口计数脚本的 KEYS 与 ARGV（接口路径与 IP 仅在超限时由脚本写入异常记录）"""
+    return (
+        [f"{RATE_LIMIT_PREFIX}{user_id}", ABNORMAL_USERS_KEY],
+        [
+            int(time.time()),
+            RATE_LIMIT_WINDOW,
+            RATE_LIMIT_WINDOW + 10,
+            RATE_LIMIT_MAX_CALLS,
+            ABNORMAL_RECORD_LIMIT,
+            user_id,
+            endpoint,
+            ip_address,
+        ],
+    )
+
 
 class RateLimiter:
     """
     API 限流器
     
-    使用 Redis 实现滑动窗口限流
+    使用 Redis 实现滑动窗口限流（按秒分桶计数）
     """
     
     @staticmethod
@@ -52,40 +225,18 @@ class RateLimiter:
         Returns:
             tuple[bool, int]: (是否超过限制, 当前调用次数)
         """
-        if not redis_client:
+        redis = await get_redis()
+        if not redis:
             # Redis 不可用时，跳过限流检查
             return False, 0
         
-        key = f"{RATE_LIMIT_PREFIX}{user_id}"
-        current_time = int(time.time())
-        window_start = current_time - RATE_LIMIT_WINDOW
-        
         try:
-            # 使用 Redis Pipeline 保证原子性
-            async with redis_client.pipeline() as pipe:
-                # 移除过期的调用记录
-                await pipe.zremrangebyscore(key, 0, window_start)
-                # 添加当前调用记录
-                await pipe.zadd(key, {str(current_time * 1000 + hash(endpoint) % 1000): current_time})
-                # 获取当前窗口内的调用次数
-                await pipe.zcard(key)
-                # 设置键的过期时间
-                await pipe.expire(key, RATE_LIMIT_WINDOW + 10)
-                
-                results = await pipe.execute()
-                call_count = results[2]  # zcard 的结果
+            call_count = await _count_call(*_count_script_params(user_id, endpoint, ip_address))
             
-            # 判断是否超过限制
+            # 判断是否超过限制（异常记录已由脚本写入）
             is_exceeded = call_count > RATE_LIMIT_MAX_CALLS
             
             if is_exceeded:
-                # 记录异常用户
-                await RateLimiter.record_abnormal_user(
-                    user_id=user_id,
-                    call_count=call_count,
-                    endpoint=endpoint,
-                    ip_address=ip_address,
-                )
                 logger.warning(
                     f"Rate limit exceeded: user_id={user_id}, "
                     f"calls={call_count}, endpoint={endpoint}"
@@ -97,6 +248,16 @@ class RateLimiter:
             logger.error(f"Rate limiter error: {e}")
             return False, 0
     
+    @staticmethod
+    def count_in_background(user_id: int, endpoint: str, ip_address: str = "") -> asyncio.Future:
+        """
+        将一次调用计入共享窗口但不等待结果（用于本地已放行的请求，超限时同样由脚本写入异常记录）
+        
+        Returns:
+            asyncio.Future: 窗口内调用次数，由调用方注册回调处理
+        """
+        return _enqueue_count(*_count_script_params(user_id, endpoint, ip_address))
+    
     @staticmethod
     async def record_abnormal_user(
         user_id: int,
@@ -105,7 +266,7 @@ class RateLimiter:
         ip_address: str = "",
     ) -> None:
         """
-        记录异常用户
+        记录异常用户（限流计数脚本超限时已自行写入，此方法供手动补录）
         
         Args:
             user_id: 用户 ID
@@ -113,27 +274,20 @@ class RateLimiter:
             endpoint: 请求的接口路径
             ip_address: 客户端 IP 地址
         """
-        if not redis_client:
+        redis = await get_redis()
+        if not redis:
             return
         
         try:
-            record = {
-                "user_id": user_id,
-                "call_count": call_count,
-                "endpoint": endpoint,
-                "ip_address": ip_address,
-                "reason": f"1分钟内调用API {call_count} 次，超过限制 {RATE_LIMIT_MAX_CALLS} 次",
-                "detected_at": datetime.now().isoformat(),
-                "timestamp": int(time.time()),
-            }
+            record = _build_abnormal_record(user_id, call_count, endpoint, ip_address)
             
-            # 使用 List 存储异常记录，新记录插入到头部
-            await redis_client.lpush(ABNORMAL_USERS_KEY, json.dumps(record, ensure_ascii=False))
+            # 使用 List 存储异常记录，新记录插入到头部，并保持列表长度不超过限制（一次往返）
+            pipe = redis.pipeline(transaction=False)
+            pipe.lpush(ABNORMAL_USERS_KEY, record)
+            pipe.ltrim(ABNORMAL_USERS_KEY, 0, ABNORMAL_RECORD_LIMIT - 1)
+            await pipe.execute()
             
-            # 保持列表长度不超过限制
-            await redis_client.ltrim(ABNORMAL_USERS_KEY, 0, ABNORMAL_RECORD_LIMIT - 1)
-            
-            logger.info(f"Abnormal user recorded: {record}")
+            logger.info(f"Abnormal user recorded: {record.decode()}")
             
         except Exception as e:
             logger.error(f"Failed to record abnormal user: {e}")
@@ -149,21 +303,26 @@ class RateLimiter:
         Returns:
             List[Dict]: 异常用户记录列表
         """
-        if not redis_client:
+        redis = await get_redis()
+        if not redis:
             return []
         
         try:
             # 从 Redis 获取最近的异常记录
-            records = await redis_client.lrange(ABNORMAL_USERS_KEY, 0, limit - 1)
+            records = await redis.lrange(ABNORMAL_USERS_KEY, 0, limit - 1)
             
+            # 逐条解析，单条损坏的记录只跳过自身，不影响整个列表
             abnormal_users = []
-            for record_str in records:
+            for record in records:
                 try:
-                    record = json.loads(record_str)
-                    abnormal_users.append(record)
-                except json.JSONDecodeError:
+                    data = orjson.loads(record)
+                except orjson.JSONDecodeError:
+                    logger.warning(f"Skip malformed abnormal record: {record[:100]!r}")
                     continue
-            
+                # 限流脚本写入的记录只有 timestamp，检测时间在读取时补齐
+                if isinstance(data, dict) and "detected_at" not in data and isinstance(data.get("timestamp"), int):
+                    data["detected_at"] = datetime.fromtimestamp(data["timestamp"]).isoformat()
+                abnormal_users.append(data)
             return abnormal_users
             
         except Exception as e:
@@ -181,7 +340,8 @@ class RateLimiter:
         Returns:
             int: 当前调用次数
         """
-        if not redis_client:
+        redis = await get_redis()
+        if not redis:
             return 0
         
         try:
@@ -189,10 +349,12 @@ class RateLimiter:
             current_time = int(time.time())
             window_start = current_time - RATE_LIMIT_WINDOW
             
-            # 移除过期记录
-            await redis_client.zremrangebyscore(key, 0, window_start)
-            # 获取当前窗口内的调用次数
-            count = await redis_client.zcard(key)
+            # 汇总窗口内各秒桶的调用次数（过期桶由下一次计数时清理）
+            buckets = await redis.hgetall(key)
+            count = sum(
+                int(calls) for ts, calls in buckets.items()
+                if int(ts) > window_start
+            )
             
             return count or 0
             
@@ -208,11 +370,12 @@ class RateLimiter:
         Returns:
             bool: 是否成功
         """
-        if not redis_client:
+        redis = await get_redis()
+        if not redis:
             return False
         
         try:
-            await redis_client.delete(ABNORMAL_USERS_KEY)
+            await redis.delete(ABNORMAL_USERS_KEY)
             return True
         except Exception as e:
             logger.error(f"Failed to clear abnormal records: {e}")
@@ -227,10 +390,18 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
     - 从请求中提取用户 ID
     - 检查用户调用频率
     - 超过限制时记录异常并返回 429 状态码
+    
+    所有请求都计入 Redis 共享窗口。最近一次 Redis 返回的窗口内次数（加上仍在计数中的请求）
+    远低于上限时，请求直接放行，计数在后台合并发送、不阻塞响应；接近上限、
+    本地次数过期或首次出现的用户则等待 Redis 结果再决定是否放行。
+    超限时的异常记录由计数脚本在同一次调用内写入，前台与后台计数均无额外往返。
     """
     
-    # 不需要限流的路径
-    EXCLUDED_PATHS = {
+    # 进程内已知次数：user_id -> [最近一次 Redis 返回的窗口内次数, 后台计数中的请求数, 同步时间]
+    _local_state: Dict[int, List[float]] = {}
+    
+    # 不需要限流的路径（精确匹配，frozenset 哈希查找）
+    EXCLUDED_PATHS = frozenset({
         "/docs",
         "/redoc",
         "/openapi.json",
@@ -241,7 +412,12 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         "/api/v1/dashboard/overview",
         "/api/v1/dashboard/api-monitoring",
         "/api/v1/dashboard/charts",
-    }
+    })
+    
+    def __init__(self, app, dispatch=None):
+        super().__init__(app, dispatch)
+        # 启动时确定是否信任代理头，请求时不再判断配置
+        self._trust_proxy = settings.TRUST_PROXY_HEADERS
     
     async def dispatch(self, request: Request, call_next) -> Response:
         """
@@ -256,37 +432,113 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         """
         # 检查是否需要跳过限流
         path = request.url.path
-        if path in self.EXCLUDED_PATHS or not path.startswith("/api/"):
+        if not path.startswith("/api/") or path in self.EXCLUDED_PATHS:
             return await call_next(request)
 
         # 尝试从请求中获取用户 ID
         user_id = await self._extract_user_id(request)
         
         if user_id:
-            # 获取客户端 IP
-            ip_address = self._get_client_ip(request)
+            # 已知次数远低于上限时直接放行，计数在后台计入共享窗口
+            if self._admit_locally(user_id, path, request):
+                return await call_next(request)
             
-            # 检查限流
+            # 检查限流（客户端 IP 仅用于异常记录）
             is_exceeded, call_count = await RateLimiter.check_and_increment(
                 user_id=user_id,
                 endpoint=path,
-                ip_address=ip_address,
+                ip_address=self._get_client_ip(request),
             )
+            if call_count:
+                self._remember_count(user_id, call_count)
             
             if is_exceeded:
-                # 返回 429 Too Many Requests
+                # 返回 429 Too Many Requests（响应体由预编码的前后缀拼接调用次数）
                 return Response(
-                    content=json.dumps({
-                        "code": 429,
-                        "data": None,
-                        "msg": f"请求过于频繁，请稍后再试。当前1分钟内已调用 {call_count} 次，限制 {RATE_LIMIT_MAX_CALLS} 次。"
-                    }, ensure_ascii=False),
+                    content=b"".join((_TOO_MANY_REQUESTS_PREFIX, str(call_count).encode(), _TOO_MANY_REQUESTS_SUFFIX)),
                     status_code=429,
                     media_type="application/json",
                 )
         
         return await call_next(request)
     
+    def _admit_locally(self, user_id: int, endpoint: str, request: Request) -> bool:
+        """
+        依据最近一次 Redis 返回的次数判断能否本地放行；放行时在后台计入共享窗口
+        
+        同步执行、中间没有 await，事件循环内无需加锁
+        
+        Returns:
+            bool: True 表示已放行（计数已在后台排队）
+        """
+        state = self._local_state.get(user_id)
+        if (
+            state is None
+            or time.monotonic() - state[2] > LOCAL_STATE_TTL
+            or state[0] + state[1] >= _LOCAL_ADMIT_LIMIT
+        ):
+            return False
+        
+        state[1] += 1
+        future = RateLimiter.count_in_background(user_id, endpoint, self._get_client_ip(request))
+        future.add_done_callback(
+            lambda f: self._on_background_count(f, state, user_id, endpoint)
+        )
+        return True
+    
+    @staticmethod
+    def _on_background_count(
+        future: asyncio.Future,
+        state: List[float],
+        user_id: int,
+        endpoint: str,
+    ) -> None:
+        """后台计数完成：刷新已知次数（超限时异常记录已由脚本写入）"""
+        state[1] -= 1
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Rate limiter error: {error}")
+            return
+        
+        call_count = future.result()
+        state[0] = call_count
+        state[2] = time.monotonic()
+        if call_count > RATE_LIMIT_MAX_CALLS:
+            logger.warning(
+                f"Rate limit exceeded: user_id={user_id}, "
+                f"calls={call_count}, endpoint={endpoint}"
+            )
+    
+    @classmethod
+    def _remember_count(cls, user_id: int, call_count: int) -> None:
+        """记录 Redis 返回的窗口内次数，保留仍在后台计数中的请求数"""
+        now = time.monotonic()
+        states = cls._local_state
+        state = states.get(user_id)
+        if state is None:
+            if len(states) >= LOCAL_STATE_MAX_USERS:
+                cls._evict_local_state(now)
+            states[user_id] = [call_count, 0, now]
+        else:
+            state[0] = call_count
+            state[2] = now
+    
+    @classmethod
+    def _evict_local_state(cls, now: float) -> None:
+        """
+        清理已过期且没有后台计数的用户，仍超限时整体清空
+        
+        同步执行、中间没有 await，事件循环内无需加锁
+        """
+        states = cls._local_state
+        stale_before = now - LOCAL_STATE_TTL
+        for user_id in [uid for uid, (_, pending, synced) in states.items() if pending == 0 and synced <= stale_before]:
+            del states[user_id]
+        if len(states) >= LOCAL_STATE_MAX_USERS:
+            states.clear()
+    
     async def _extract_user_id(self, request: Request) -> Optional[int]:
         """
         从请求中提取用户 ID
@@ -301,52 +553,21 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         """
         try:
             # 从 Authorization header 获取 token
-            authorization = request.headers.get("Authorization", "")
-            if not authorization.startswith("Bearer "):
+            token = extract_bearer_token(request.headers.get("Authorization"))
+            if token is None:
                 return None
             
-            token = authorization[7:]  # 移除 "Bearer " 前缀
-            
             # 解码 JWT Token
-            from core.security import decode_token
-            payload = decode_token(token)
-            
-            if payload:
-                user_id = payload.get("sub")
-                if user_id:
-                    return int(user_id)
-            
-            return None
+            decoded = decode_token_subject(token)
+            return decoded[0] if decoded else None
             
         except Exception as e:
             logger.debug(f"Failed to extract user_id from request: {e}")
             return None
     
     def _get_client_ip(self, request: Request) -> str:
-        """
-        获取客户端 IP 地址
-        
-        Args:
-            request: HTTP 请求
-        
-        Returns:
-            str: 客户端 IP 地址
-        """
-        # 尝试从 X-Forwarded-For 获取（反向代理情况）
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        # 尝试从 X-Real-IP 获取
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # 直接获取客户端地址
-        if request.client:
-            return request.client.host
-        
-        return ""
+        """获取客户端 IP 地址（是否信任代理头由启动时配置决定）"""
+        return get_client_ip(request, self._trust_proxy)
 
 
 
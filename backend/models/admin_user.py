@@ -36,7 +36,7 @@ class AdminUser(BaseModel):
     __tablename__ = "admin_users"
     __table_args__ = (
         Index("ix_admin_users_tenant_id", "tenant_id"),
-        Index("ix_admin_users_username", "username"),        # username 索引
+        Index("ix_admin_users_username", "username", unique=True),  # username 唯一索引（唯一约束与查询共用一个索引）
         Index("ix_admin_users_email", "email"),               # email 索引
         Index("ix_admin_users_role_id", "role_id"),           # role_id 索引
         {"comment": "管理员用户表"},
@@ -53,7 +53,6 @@ class AdminUser(BaseModel):
     # === 核心字段 ===
     username: Mapped[str] = mapped_column(
         String(64),
-        unique=True,
         nullable=False,
         comment="用户名",
     )
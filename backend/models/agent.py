@@ -39,6 +39,7 @@ class Agent(BaseModel):
         Index("ix_agents_tenant_id", "tenant_id"),
         Index("ix_agents_status", "status"),
         Index("ix_agents_sort_order", "sort_order"),
+        Index("ix_agents_name", "name", unique=True),     # 名称唯一索引（兜底写入前同名查询之后的并发写入）
         {"comment": "智能体配置表"},
     )
 
@@ -181,5 +182,11 @@ class Agent(BaseModel):
         return self.status == 1
 
 
-
-
+# 列表游标分页索引：与 AgentService.get_agent_list 的排序（sort_order 升序、created_at/id 降序）一致，
+# MySQL 8 按声明方向建索引后可直接按索引顺序扫描，游标续页无需回表排序
+Index(
+    "ix_agents_sort_created_id",
+    Agent.sort_order,
+    Agent.created_at.desc(),
+    Agent.id.desc(),
+)
@@ -7,6 +7,8 @@ Project Model - 项目（IP）数据模型
 import json
 import enum
 from typing import Optional, List, TYPE_CHECKING
+
+import orjson
 from sqlalchemy import (
     String,
     BigInteger,
@@ -19,10 +21,10 @@ from sqlalchemy import (
     Enum as SQLEnum,
     TypeDecorator,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, reconstructor
 
 from models.base import BaseModel
-from utils.json_utils import json_dumps, json_loads
+from utils.json_utils import json_dumps
 
 
 class UnicodeJSON(TypeDecorator):
@@ -44,11 +46,11 @@ class UnicodeJSON(TypeDecorator):
         return None
     
     def process_result_value(self, value, dialect):
-        """反序列化时正常解析"""
+        """反序列化时使用 orjson 解析（每行加载时执行一次，列表查询为热点路径）"""
         if value is not None:
-            if isinstance(value, str):
+            if isinstance(value, (str, bytes)):
                 try:
-                    return json_loads(value)
+                    return orjson.loads(value)
                 except (json.JSONDecodeError, TypeError):
                     return {}
             return value if isinstance(value, dict) else {}
@@ -171,15 +173,33 @@ class Project(BaseModel):
     def __repr__(self) -> str:
         return f"<Project(id={self.id}, name='{self.name}', user_id={self.user_id})>"
     
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """从数据库加载后重置人设解析缓存"""
+        self._persona_settings_cache = None
+    
     def get_persona_settings_dict(self) -> dict:
-        """获取人设配置字典"""
-        if isinstance(self.persona_settings, dict):
-            return self.persona_settings
-        if isinstance(self.persona_settings, str):
+        """
+        获取人设配置字典
+        
+        从数据库加载的值已由 UnicodeJSON 解析为 dict，直接返回；
+        被赋值为 JSON 字符串时按原始字符串缓存解析结果，同一值只解析一次
+        """
+        value = self.persona_settings
+        if isinstance(value, dict):
+            return value
+        if isinstance(value, (str, bytes)):
+            cache = getattr(self, "_persona_settings_cache", None)
+            if cache is not None and cache[0] is value:
+                return cache[1]
             try:
-                return json_loads(self.persona_settings)
+                parsed = orjson.loads(value)
             except (json.JSONDecodeError, TypeError):
-                return {}
+                parsed = {}
+            if not isinstance(parsed, dict):
+                parsed = {}
+            self._persona_settings_cache = (value, parsed)
+            return parsed
         return {}
     
     @property
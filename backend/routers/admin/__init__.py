@@ -7,26 +7,11 @@ from fastapi import APIRouter
 from . import (
     auth, dashboard, agents, admin_users, banner,
     home_config, llm_models, menu, users, dictionary, user_levels, quick_entries, article, upload, tickets, compute,
-    tenants,
+    tenants, roles, ai,
 )
 from . import tools as admin_tools
 from .dingma import dingma_admin_router
 
-# 尝试导入可选的路由
-try:
-    from . import roles
-    roles_available = True
-except ImportError:
-    roles = None
-    roles_available = False
-
-try:
-    from . import ai
-    ai_available = True
-except ImportError:
-    ai = None
-    ai_available = False
-
 admin_router = APIRouter()
 
 # 注册各个模块的路由
@@ -49,10 +34,6 @@ admin_router.include_router(compute.router, prefix="/compute-logs", tags=["算
 admin_router.include_router(upload.router, prefix="", tags=["文件上传"])
 admin_router.include_router(admin_tools.router, prefix="/tools", tags=["B端-便捷工具包"])
 admin_router.include_router(dingma_admin_router, prefix="/dingma", tags=["顶妈管理"])
-
-if roles_available and hasattr(roles, "router"):
-    admin_router.include_router(roles.router, prefix="/roles", tags=["角色"])
-
-if ai_available and hasattr(ai, "router"):
-    admin_router.include_router(ai.router, prefix="/ai", tags=["AI对话"])
+admin_router.include_router(roles.router, prefix="/roles", tags=["角色"])
+admin_router.include_router(ai.router, prefix="/ai", tags=["AI对话"])
 
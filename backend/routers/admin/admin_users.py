@@ -7,16 +7,16 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, json_body, json_body_openapi, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser as AdminUserModel
 from schemas.admin_user import (
     AdminUserCreate,
     AdminUserUpdate,
     AdminUserQueryParams,
 )
+from schemas.common import IDsRequest
 from services.user import AdminUserService
-from utils.response import success, page_response, ResponseMsg
+from utils.response import ORJSONResponse, success, page_response, ResponseMsg
 
 router = APIRouter()
 
@@ -30,7 +30,7 @@ async def get_admin_users(
     role_id: Optional[int] = Query(None, description="角色ID"),
     is_active: Optional[bool] = Query(None, description="是否激活"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUserModel = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取管理员用户列表（分页）；租户管理员仅能看本租户管理员。"""
     admin_user_service = AdminUserService(db)
@@ -55,12 +55,13 @@ async def get_admin_users(
         scoped_tenant_id=scope_tid,
     )
 
-    return page_response(
+    # 列表项为 slots 数据类，直接交给 orjson 原生编码，跳过 FastAPI 的 jsonable_encoder 逐项遍历
+    return ORJSONResponse(page_response(
         items=users,
         total=total,
         page_num=pageNum,
         page_size=pageSize,
-    )
+    ))
 
 
 @router.get("/status/options", summary="获取状态选项")
@@ -77,7 +78,7 @@ async def get_status_options():
 async def get_admin_user(
     user_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUserModel = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取管理员用户详情"""
     admin_user_service = AdminUserService(db)
@@ -93,11 +94,11 @@ async def get_admin_user(
     return success(data=user)
 
 
-@router.post("", summary="创建管理员用户")
+@router.post("", summary="创建管理员用户", openapi_extra=json_body_openapi(AdminUserCreate))
 async def create_admin_user(
-    user_data: AdminUserCreate,
+    user_data: AdminUserCreate = Depends(json_body(AdminUserCreate)),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUserModel = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建新管理员用户"""
     admin_user_service = AdminUserService(db)
@@ -118,7 +119,7 @@ async def update_admin_user(
     user_id: int,
     user_data: AdminUserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUserModel = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新管理员用户信息"""
     admin_user_service = AdminUserService(db)
@@ -139,7 +140,7 @@ async def update_admin_user(
 async def delete_admin_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUserModel = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除管理员用户（软删除）"""
     admin_user_service = AdminUserService(db)
@@ -155,12 +156,32 @@ async def delete_admin_user(
     return success(msg=ResponseMsg.DELETED)
 
 
+@router.post("/batch-delete", summary="批量删除管理员用户")
+async def batch_delete_admin_users(
+    data: IDsRequest,
+    db: AsyncSession = Depends(get_db),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
+):
+    """批量删除管理员用户（软删除）；租户管理员仅能删除本租户管理员。"""
+    admin_user_service = AdminUserService(db)
+    scope_tid = await resolve_admin_agent_scope_tenant_id(
+        db,
+        admin_tenant_id=current_admin.tenant_id,
+        admin_username=current_admin.username,
+    )
+    count = await admin_user_service.delete_users(
+        data.ids,
+        scoped_tenant_id=scope_tid,
+    )
+    return success(data={"count": count}, msg=ResponseMsg.DELETED)
+
+
 @router.patch("/{user_id}/status", summary="修改管理员用户状态")
 async def change_admin_user_status(
     user_id: int,
     status: int = Query(..., ge=0, le=1, description="状态: 0-封禁, 1-正常"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUserModel = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """修改管理员用户状态"""
     admin_user_service = AdminUserService(db)
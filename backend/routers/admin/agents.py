@@ -3,14 +3,14 @@ Agent Management Endpoints
 智能体管理相关接口
 """
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+import orjson
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, json_body, json_body_openapi, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from models.llm_model import LLMModel
 from schemas.agent import (
     AgentCreate,
@@ -22,12 +22,15 @@ from schemas.agent import (
 )
 from services.agent import AgentService
 from services.resource import LLMModelService
-from utils.response import success, page_response
-from utils.serializers import agent_to_response
+from utils.response import ORJSONResponse, success, page_response
+from utils.serializers import agent_to_response, agents_to_response
 from constants.agent import PROMPT_TEMPLATES
 
 router = APIRouter()
 
+# 预设模板为静态数据，启动时序列化一次，请求时直接返回字节内容
+_PROMPT_TEMPLATES_BYTES = orjson.dumps(success(data=PROMPT_TEMPLATES))
+
 
 @router.get("", summary="获取智能体列表")
 async def get_agents(
@@ -39,13 +42,15 @@ async def get_agents(
         None,
         description="智能体模式：0-普通模式, 1-Skill 组装模式",
     ),
+    cursor: Optional[str] = Query(None, max_length=128, description="游标分页标记（上一页返回的 nextCursor）"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取智能体列表（分页）
     
     支持按名称、状态、智能体模式筛选
+    传入 cursor 时按游标续页（不统计总数），响应中的 nextCursor 为空表示没有下一页
     返回 modelName 供列表展示（模型名称而非 ID）
     """
     agent_service = AgentService(db)
@@ -61,6 +66,7 @@ async def get_agents(
         name=name,
         status=status,
         agentMode=agentMode,
+        cursor=cursor,
     )
     
     result = await agent_service.get_agent_list(
@@ -69,34 +75,34 @@ async def get_agents(
     )
     
     # 收集所有 agent 使用的 model ID，批量查询模型名称
-    model_ids = [int(mid) for mid in {str(a.model) for a in result.list if a.model} if str(mid).isdigit()]
+    model_ids = {int(a.model) for a in result.list if a.model and str(a.model).isdigit()}
     model_name_map: dict[str, str] = {}
     if model_ids:
         stmt = select(LLMModel.id, LLMModel.name).where(LLMModel.id.in_(model_ids))
         rows = (await db.execute(stmt)).all()
         model_name_map = {str(r.id): r.name for r in rows}
     
-    items = [
-        agent_to_response(
-            agent,
-            model_name=model_name_map.get(str(agent.model), "未知"),
-            viewer_scoped_tenant_id=scope_tid,
-        )
-        for agent in result.list
-    ]
+    items = agents_to_response(
+        result.list,
+        model_name_map,
+        viewer_scoped_tenant_id=scope_tid,
+    )
     
-    return page_response(
+    # 列表项均为基础类型字典，直接交给 orjson 编码，跳过 FastAPI 的 jsonable_encoder 逐项遍历
+    response = page_response(
         items=items,
         total=result.total,
         page_num=pageNum,
         page_size=pageSize,
     )
+    response["data"]["nextCursor"] = result.nextCursor
+    return ORJSONResponse(response)
 
 
 @router.get("/templates", summary="获取预设模板列表")
 async def get_prompt_templates():
     """获取预设模板列表"""
-    return success(data=PROMPT_TEMPLATES)
+    return Response(content=_PROMPT_TEMPLATES_BYTES, media_type="application/json")
 
 
 @router.get("/models", summary="获取可用模型列表")
@@ -109,16 +115,16 @@ async def get_available_models(
     从数据库读取启用的模型列表，格式兼容前端
     """
     llm_model_service = LLMModelService(db)
-    models = await llm_model_service.get_enabled_models()
+    options = await llm_model_service.get_enabled_model_options()
     
     # 转换为前端需要的格式（兼容原有格式）
     items = [
         {
-            "id": str(model.id),  # 前端需要字符串格式的 ID
-            "name": model.name,
+            "id": option["id"],  # 前端需要字符串格式的 ID
+            "name": option["name"],
             "maxTokens": 4096,  # 默认值，可以根据模型类型设置不同值
         }
-        for model in models
+        for option in options
     ]
     
     # 如果没有配置任何模型，返回空列表（前端可能有默认值处理）
@@ -129,7 +135,7 @@ async def get_available_models(
 async def get_agent(
     agent_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取智能体详情"""
     agent_service = AgentService(db)
@@ -142,11 +148,11 @@ async def get_agent(
     return success(data=agent_to_response(agent, viewer_scoped_tenant_id=scope_tid))
 
 
-@router.post("", summary="创建智能体")
+@router.post("", summary="创建智能体", openapi_extra=json_body_openapi(AgentCreate))
 async def create_agent(
-    agent_data: AgentCreate,
+    agent_data: AgentCreate = Depends(json_body(AgentCreate)),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建智能体"""
     agent_service = AgentService(db)
@@ -157,6 +163,7 @@ async def create_agent(
     )
     agent = await agent_service.create_agent(agent_data, scoped_tenant_id=scope_tid)
     await db.commit()
+    await agent_service.invalidate_count_cache()
     return success(data=agent_to_response(agent, viewer_scoped_tenant_id=scope_tid), msg="创建成功")
 
 
@@ -165,7 +172,7 @@ async def update_agent(
     agent_id: int,
     agent_data: AgentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新智能体"""
     agent_service = AgentService(db)
@@ -176,6 +183,9 @@ async def update_agent(
     )
     agent = await agent_service.update_agent(agent_id, agent_data, scoped_tenant_id=scope_tid)
     await db.commit()
+    # 名称/状态/模式属于列表筛选条件，变更后各筛选组合的总数可能变化
+    if agent_data.model_fields_set & {"name", "status", "agentMode"}:
+        await agent_service.invalidate_count_cache()
     return success(data=agent_to_response(agent, viewer_scoped_tenant_id=scope_tid), msg="更新成功")
 
 
@@ -183,7 +193,7 @@ async def update_agent(
 async def delete_agent(
     agent_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除智能体"""
     agent_service = AgentService(db)
@@ -194,6 +204,7 @@ async def delete_agent(
     )
     await agent_service.delete_agent(agent_id, scoped_tenant_id=scope_tid)
     await db.commit()
+    await agent_service.invalidate_count_cache()
     return success(msg="删除成功")
 
 
@@ -202,7 +213,7 @@ async def change_agent_status(
     agent_id: int,
     status_data: AgentStatusUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """修改智能体状态（上架/下架）"""
     agent_service = AgentService(db)
@@ -213,6 +224,7 @@ async def change_agent_status(
     )
     agent = await agent_service.update_status(agent_id, status_data.status, scoped_tenant_id=scope_tid)
     await db.commit()
+    await agent_service.invalidate_count_cache()
     return success(data=agent_to_response(agent, viewer_scoped_tenant_id=scope_tid), msg="状态更新成功")
 
 
@@ -221,7 +233,7 @@ async def update_agent_sort(
     agent_id: int,
     sort_data: AgentSortUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """修改智能体排序"""
     agent_service = AgentService(db)
@@ -239,7 +251,7 @@ async def update_agent_sort(
 async def batch_update_sort(
     batch_data: BatchSortRequest,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """批量修改智能体排序"""
     agent_service = AgentService(db)
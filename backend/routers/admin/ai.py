@@ -3,10 +3,14 @@ AI Chat Endpoints
 AI 对话相关接口
 """
 import json
+import time
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.deps import json_body, json_body_openapi
 from db import get_db
 from schemas.ai import ChatRequest, ChatCompletionResponse
 from services.content import AIService
@@ -14,10 +18,54 @@ from utils.response import success
 
 router = APIRouter()
 
+# SSE 帧分隔符预先编码为字节，逐帧拼接时无需格式化字符串再由 Starlette 编码
+_SSE_DATA = b"data: "
+_SSE_END = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+
+# SSE 帧合并发送：缓冲区达到该字节数或距上次发送超过该时长时立即发送
+_SSE_FLUSH_BYTES = 1024
+_SSE_FLUSH_INTERVAL = 0.05  # 秒
+
+
+async def _coalesce_frames(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    合并连续的 SSE 帧，减少 ASGI send 次数
+
+    每帧仍是完整的 SSE 事件，合并后客户端解析结果不变。
+    在同一个消费循环内缓冲，不为每帧创建任务：第一帧、以及上游停顿超过
+    _SSE_FLUSH_INTERVAL 后到达的帧立即发送；连续到达的帧在缓冲区超过
+    _SSE_FLUSH_BYTES 或最早缓冲的帧等待超过 _SSE_FLUSH_INTERVAL 时一并发送
+    """
+    buf = bytearray()
+    buffered_at = 0.0
+    last_at = None
+    try:
+        async for frame in frames:
+            now = time.monotonic()
+            idle = last_at is None or now - last_at >= _SSE_FLUSH_INTERVAL
+            last_at = now
+            if not buf:
+                if idle:
+                    yield frame
+                    continue
+                buffered_at = now
+            buf += frame
+            if len(buf) >= _SSE_FLUSH_BYTES or now - buffered_at >= _SSE_FLUSH_INTERVAL:
+                yield bytes(buf)
+                buf.clear()
+    except Exception:
+        # 上游出错前已缓冲的内容先发出
+        if buf:
+            yield bytes(buf)
+        raise
+    if buf:
+        yield bytes(buf)
+
 
-@router.post("/chat", summary="AI对话（非流式）")
+@router.post("/chat", summary="AI对话（非流式）", openapi_extra=json_body_openapi(ChatRequest))
 async def chat(
-    request: ChatRequest,
+    request: ChatRequest = Depends(json_body(ChatRequest)),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -49,9 +97,9 @@ async def chat(
     return success(data=result)
 
 
-@router.post("/chat/stream", summary="AI对话（流式）")
+@router.post("/chat/stream", summary="AI对话（流式）", openapi_extra=json_body_openapi(ChatRequest))
 async def chat_stream(
-    request: ChatRequest,
+    request: ChatRequest = Depends(json_body(ChatRequest)),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -73,32 +121,39 @@ async def chat_stream(
     
     async def generate_stream():
         """生成SSE流"""
+        async for chunk in ai_service.stream_chat(
+            messages=messages,
+            model=request.model,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            top_p=request.top_p,
+            frequency_penalty=request.frequency_penalty,
+            presence_penalty=request.presence_penalty,
+        ):
+            # 格式化为SSE格式（直接输出字节）
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            yield _SSE_DATA + chunk + _SSE_END
+    
+    async def generate_response():
+        """合并发送SSE帧，结束标记单独发送"""
         try:
-            async for chunk in ai_service.stream_chat(
-                messages=messages,
-                model=request.model,
-                temperature=request.temperature,
-                max_tokens=request.max_tokens,
-                top_p=request.top_p,
-                frequency_penalty=request.frequency_penalty,
-                presence_penalty=request.presence_penalty,
-            ):
-                # 格式化为SSE格式
-                yield f"data: {chunk}\n\n"
+            async for data in _coalesce_frames(generate_stream()):
+                yield data
             
             # 发送结束标记
-            yield "data: [DONE]\n\n"
+            yield _SSE_DONE
         except Exception as e:
             error_chunk = json.dumps({
                 "error": {
                     "message": str(e),
                     "type": type(e).__name__
                 }
-            })
-            yield f"data: {error_chunk}\n\n"
+            }).encode("utf-8")
+            yield _SSE_DATA + error_chunk + _SSE_END
     
     return StreamingResponse(
-        generate_stream(),
+        generate_response(),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -120,18 +175,8 @@ async def get_models(
     from services.resource import LLMModelService
     
     llm_model_service = LLMModelService(db)
-    models = await llm_model_service.get_enabled_models()
-    
-    # 转换为前端需要的格式
-    items = [
-        {
-            "id": str(model.id),
-            "name": model.name,
-            "model_id": model.model_id,
-            "provider": model.provider,
-        }
-        for model in models
-    ]
+    # 选项格式即前端需要的格式（id/name/model_id/provider）
+    items = await llm_model_service.get_enabled_model_options()
     
     return success(data=items)
 
@@ -7,9 +7,8 @@ from fastapi import APIRouter, Depends, Query, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from schemas.article import (
     ArticleCategoryCode,
     ArticleCreate,
@@ -23,7 +22,7 @@ from utils.response import success, page_response, ResponseMsg
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     """与智能体、小程序用户一致：登录名纠偏 + 严格租户隔离"""
     return await resolve_admin_agent_scope_tenant_id(
         db,
@@ -45,7 +44,7 @@ async def get_articles(
     is_published: Optional[bool] = Query(None, description="是否已发布"),
     is_enabled: Optional[bool] = Query(None, description="是否启用"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取文章列表（分页）
@@ -81,7 +80,7 @@ async def get_articles(
 async def get_article(
     article_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取文章详情"""
     article_service = ArticleService(db)
@@ -95,7 +94,7 @@ async def get_article(
 async def create_article(
     article_data: ArticleCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建新文章"""
     article_service = ArticleService(db)
@@ -111,7 +110,7 @@ async def update_article(
     article_id: int,
     article_data: ArticleUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新文章信息"""
     article_service = ArticleService(db)
@@ -127,7 +126,7 @@ async def update_article(
 async def delete_article(
     article_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除文章"""
     article_service = ArticleService(db)
@@ -142,7 +141,7 @@ async def update_article_status(
     article_id: int,
     request: ArticleStatusRequest,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新文章发布状态或启用状态"""
     article_service = ArticleService(db)
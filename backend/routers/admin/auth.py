@@ -3,13 +3,13 @@ Authentication Endpoints
 认证相关接口
 """
 from typing import Optional
-from fastapi import APIRouter, Depends, Header
+from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from db import get_db
 from core.constants import admin_has_platform_privilege
-from core.deps import get_current_user
+from core.deps import get_current_user, AuthedAdmin
 from models.admin_user import AdminUser
 from schemas import LoginRequest, LoginResponse
 from services.system import AuthService
@@ -19,6 +19,7 @@ from utils.response import success, ResponseMsg
 from core.security import decode_token, create_access_token, create_refresh_token
 from core.config import settings
 from utils.exceptions import BadRequestException
+from utils.security import get_proxy_client_ip
 
 router = APIRouter()
 
@@ -26,6 +27,7 @@ router = APIRouter()
 @router.post("/login", summary="用户登录")
 async def login(
     request: LoginRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -36,8 +38,12 @@ async def login(
     
     返回访问令牌
     """
-    auth_service = AuthService(db)
-    tokens = await auth_service.login(request.username, request.password)
+    tokens = await AuthService.login(
+        db,
+        request.username,
+        request.password,
+        client_ip=get_proxy_client_ip(http_request, settings.TRUST_PROXY_HEADERS),
+    )
 
     return success(
         data={
@@ -62,7 +68,7 @@ async def logout():
 @router.get("/me", summary="当前管理员信息")
 async def admin_profile(
     db: AsyncSession = Depends(get_db),
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
 ):
     """返回租户归属与角色信息；tenant_id 为空表示平台超级管理员。"""
     from sqlalchemy import select
@@ -122,7 +128,7 @@ async def get_auth_buttons(
 @router.get("/menus", summary="获取菜单权限")
 async def get_auth_menus(
     db: AsyncSession = Depends(get_db),
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
 ):
     """
     获取菜单权限列表
@@ -7,9 +7,8 @@ from fastapi import APIRouter, Depends, Query, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from schemas.banner import (
     BannerCreate,
     BannerUpdate,
@@ -23,7 +22,7 @@ from utils.response import success, page_response, ResponseMsg
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     """与智能体、小程序用户一致：登录名纠偏 + 严格租户隔离"""
     return await resolve_admin_agent_scope_tenant_id(
         db,
@@ -40,7 +39,7 @@ async def get_banners(
     position: Optional[str] = Query(None, description="位置筛选"),
     is_enabled: Optional[bool] = Query(None, description="是否启用"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取Banner列表（分页）
@@ -72,7 +71,7 @@ async def get_banners(
 async def get_banner(
     banner_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取Banner详情"""
     banner_service = BannerService(db)
@@ -86,7 +85,7 @@ async def get_banner(
 async def create_banner(
     banner_data: BannerCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建新Banner"""
     banner_service = BannerService(db)
@@ -102,7 +101,7 @@ async def update_banner(
     banner_id: int,
     banner_data: BannerUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新Banner信息"""
     banner_service = BannerService(db)
@@ -118,7 +117,7 @@ async def update_banner(
 async def delete_banner(
     banner_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除Banner"""
     banner_service = BannerService(db)
@@ -133,7 +132,7 @@ async def update_banner_status(
     banner_id: int,
     request: BannerStatusRequest,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """启用/禁用Banner"""
     banner_service = BannerService(db)
@@ -149,7 +148,7 @@ async def update_banner_status(
 async def update_banner_sort(
     request: BannerSortRequest,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """批量更新Banner排序"""
     banner_service = BannerService(db)
@@ -7,16 +7,15 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from services.resource import ComputeService
 from utils.response import success, page_response
 
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     return await resolve_admin_agent_scope_tenant_id(
         db,
         admin_tenant_id=admin.tenant_id,
@@ -27,7 +26,7 @@ async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
 @router.get("/stats", summary="获取系统算力统计")
 async def get_compute_stats(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取系统级算力统计
@@ -48,7 +47,7 @@ async def get_compute_user_summary(
     startTime: Optional[str] = Query(None, description="开始时间 ISO 格式"),
     endTime: Optional[str] = Query(None, description="结束时间 ISO 格式"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取用户算力汇总列表（分页）
@@ -80,7 +79,7 @@ async def get_user_compute_logs(
     pageSize: int = Query(10, ge=1, le=100, description="每页数量"),
     type: Optional[str] = Query(None, description="流水类型：consume/recharge"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取指定用户的算力消耗和充值明细
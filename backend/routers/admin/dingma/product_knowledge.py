@@ -9,10 +9,9 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
 from db import get_db
-from models.admin_user import AdminUser
 from schemas.dingma.knowledge import (
     ComponentCreate,
     ComponentQueryParams,
@@ -27,7 +26,7 @@ from utils.response import success, page_response, ResponseMsg
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     return await resolve_admin_agent_scope_tenant_id(
         db,
         admin_tenant_id=admin.tenant_id,
@@ -45,7 +44,7 @@ async def get_sku_list(
     status: Optional[int] = Query(None, ge=0, le=1),
     keyword: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     params = SkuQueryParams(
@@ -64,7 +63,7 @@ async def get_sku_list(
 @router.get("/skus/categories", summary="获取 SKU 品类统计")
 async def get_sku_categories(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     categories = await service.get_sku_categories(
@@ -77,7 +76,7 @@ async def get_sku_categories(
 async def get_sku_detail(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.get_sku_detail(item_id, scoped_tenant_id=await _admin_scope_tid(db, current_admin))
@@ -88,7 +87,7 @@ async def get_sku_detail(
 async def create_sku(
     data: SkuCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.create_sku(data, scoped_tenant_id=await _admin_scope_tid(db, current_admin))
@@ -101,7 +100,7 @@ async def update_sku(
     item_id: int,
     data: SkuUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.update_sku(item_id, data, scoped_tenant_id=await _admin_scope_tid(db, current_admin))
@@ -114,7 +113,7 @@ async def update_sku_status(
     item_id: int,
     status: int = Query(..., ge=0, le=1),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.update_sku_status(
@@ -128,7 +127,7 @@ async def update_sku_status(
 async def delete_sku(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     await service.delete_sku(item_id, scoped_tenant_id=await _admin_scope_tid(db, current_admin))
@@ -141,7 +140,7 @@ async def delete_sku(
 @router.get("/components/options", summary="组件下拉选项")
 async def get_component_options(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     options = await service.list_component_options(
@@ -158,7 +157,7 @@ async def get_component_list(
     status: Optional[int] = Query(None, ge=0, le=1),
     keyword: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     params = ComponentQueryParams(
@@ -178,7 +177,7 @@ async def get_component_list(
 async def get_component_detail(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.get_component_detail(
@@ -191,7 +190,7 @@ async def get_component_detail(
 async def create_component(
     data: ComponentCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.create_component(
@@ -206,7 +205,7 @@ async def update_component(
     item_id: int,
     data: ComponentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.update_component(
@@ -221,7 +220,7 @@ async def update_component_status(
     item_id: int,
     status: int = Query(..., ge=0, le=1),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     item = await service.update_component_status(
@@ -235,7 +234,7 @@ async def update_component_status(
 async def delete_component(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     service = DingmaKnowledgeAdminService(db)
     await service.delete_component(item_id, scoped_tenant_id=await _admin_scope_tid(db, current_admin))
@@ -8,20 +8,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from schemas.home_config import (
     HomeConfigUpdate,
     HomeConfigBatchUpdate,
 )
 from services.system import HomeConfigService
-from utils.response import success, ResponseMsg
+from utils.response import ORJSONResponse, success, ResponseMsg
 
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     """与智能体、小程序用户一致：登录名纠偏 + 严格租户隔离"""
     return await resolve_admin_agent_scope_tenant_id(
         db,
@@ -34,7 +33,7 @@ async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
 async def get_all_configs(
     use_cache: bool = Query(True, description="是否使用缓存"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取所有首页配置
@@ -44,8 +43,10 @@ async def get_all_configs(
     config_service = HomeConfigService(db)
     configs = await config_service.get_all_configs(
         scoped_tenant_id=await _admin_scope_tid(db, current_admin),
+        use_cache=use_cache,
     )
-    return success(data={"list": configs, "total": len(configs)})
+    # 配置项均为基础类型字典，直接交给 orjson 编码，跳过 FastAPI 的 jsonable_encoder 逐项遍历
+    return ORJSONResponse(success(data={"list": configs, "total": len(configs)}))
 
 
 @router.get("/{config_key}", summary="获取指定配置")
@@ -53,7 +54,7 @@ async def get_config(
     config_key: str,
     use_cache: bool = Query(True, description="是否使用缓存"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     根据配置键获取配置
@@ -75,7 +76,7 @@ async def update_config(
     config_key: str,
     config_data: HomeConfigUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     更新指定配置
@@ -90,6 +91,8 @@ async def update_config(
         config_data,
         scoped_tenant_id=await _admin_scope_tid(db, current_admin),
     )
+    await db.commit()
+    await config_service.sync_hash_cache([config])
     return success(data=config, msg=ResponseMsg.UPDATED)
 
 
@@ -97,7 +100,7 @@ async def update_config(
 async def batch_update_configs(
     batch_data: HomeConfigBatchUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     批量更新配置
@@ -109,5 +112,7 @@ async def batch_update_configs(
         batch_data,
         scoped_tenant_id=await _admin_scope_tid(db, current_admin),
     )
+    await db.commit()
+    await config_service.sync_hash_cache(configs)
     return success(data={"list": configs, "total": len(configs)}, msg="批量更新成功")
 
@@ -14,7 +14,7 @@ from schemas.llm_model import (
     BalanceRefreshResponse,
 )
 from services.resource import LLMModelService
-from utils.response import success, page_response
+from utils.response import ORJSONResponse, success, page_response
 from utils.serializers import llm_model_to_response
 
 router = APIRouter()
@@ -47,12 +47,13 @@ async def get_llm_models(
     result = await llm_model_service.get_llm_model_list(params)
     items = [llm_model_to_response(model) for model in result.list]
     
-    return page_response(
+    # 列表项均为基础类型字典，直接交给 orjson 编码，跳过 FastAPI 的 jsonable_encoder 逐项遍历
+    return ORJSONResponse(page_response(
         items=items,
         total=result.total,
         page_num=pageNum,
         page_size=pageSize,
-    )
+    ))
 
 
 @router.get("/available", summary="获取可用模型列表")
@@ -65,18 +66,15 @@ async def get_available_models(
     只返回启用的模型，格式为前端需要的格式
     """
     llm_model_service = LLMModelService(db)
-    models = await llm_model_service.get_enabled_models()
+    options = await llm_model_service.get_enabled_model_options()
     
     # 转换为前端需要的格式
     items = [
         AvailableModelItem(
-            id=str(model.id),
-            name=model.name,
-            model_id=model.model_id,
-            provider=model.provider,
+            **option,
             max_tokens=4096,  # 默认值，可以根据模型类型设置不同值
         )
-        for model in models
+        for option in options
     ]
     
     return success(data=items)
@@ -102,6 +100,7 @@ async def create_llm_model(
     llm_model_service = LLMModelService(db)
     model = await llm_model_service.create_llm_model(model_data)
     await db.commit()
+    await llm_model_service.invalidate_enabled_model_cache()
     return success(data=llm_model_to_response(model), msg="创建成功")
 
 
@@ -115,6 +114,7 @@ async def update_llm_model(
     llm_model_service = LLMModelService(db)
     model = await llm_model_service.update_llm_model(model_id, model_data)
     await db.commit()
+    await llm_model_service.invalidate_enabled_model_cache()
     return success(data=llm_model_to_response(model), msg="更新成功")
 
 
@@ -127,6 +127,7 @@ async def delete_llm_model(
     llm_model_service = LLMModelService(db)
     await llm_model_service.delete_llm_model(model_id)
     await db.commit()
+    await llm_model_service.invalidate_enabled_model_cache()
     return success(msg="删除成功")
 
 
@@ -6,8 +6,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_user
-from models.admin_user import AdminUser
+from core.deps import get_current_user, AuthedAdmin
 from services.system import MenuService
 from services.system.role import RoleService
 from schemas.menu import MenuCreate, MenuUpdate
@@ -19,7 +18,7 @@ router = APIRouter()
 @router.get("/list", summary="获取菜单列表")
 async def get_menu_list(
     db: AsyncSession = Depends(get_db),
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
 ):
     """
     获取菜单列表（树形结构）
@@ -108,6 +107,8 @@ async def create_menu(
     """
     menu_service = MenuService(db)
     menu = await menu_service.create_menu(data)
+    await db.commit()
+    await menu_service.invalidate_cache()
     
     return success(data={"id": menu.id}, msg=ResponseMsg.CREATED)
 
@@ -123,6 +124,8 @@ async def update_menu(
     """
     menu_service = MenuService(db)
     menu = await menu_service.update_menu(menu_id, data)
+    await db.commit()
+    await menu_service.invalidate_cache()
     
     return success(data={"id": menu.id}, msg=ResponseMsg.UPDATED)
 
@@ -139,6 +142,8 @@ async def delete_menu(
     """
     menu_service = MenuService(db)
     await menu_service.delete_menu(menu_id)
+    await db.commit()
+    await menu_service.invalidate_cache()
     
     return success(msg=ResponseMsg.DELETED)
 
@@ -7,9 +7,8 @@ from fastapi import APIRouter, Depends, Query, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from schemas.quick_entry import (
     QuickEntryCreate,
     QuickEntryUpdate,
@@ -23,7 +22,7 @@ from utils.response import success, page_response, ResponseMsg
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     """与智能体、小程序用户一致：登录名纠偏 + 严格租户隔离"""
     return await resolve_admin_agent_scope_tenant_id(
         db,
@@ -41,7 +40,7 @@ async def get_quick_entries(
     tag: Optional[str] = Query(None, description="标签筛选（none/new/hot）"),
     title: Optional[str] = Query(None, description="标题（模糊搜索）"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取快捷入口列表（分页）
@@ -76,7 +75,7 @@ async def get_quick_entries(
 async def get_quick_entry(
     entry_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取快捷入口详情"""
     quick_entry_service = QuickEntryService(db)
@@ -90,7 +89,7 @@ async def get_quick_entry(
 async def create_quick_entry(
     entry_data: QuickEntryCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建新快捷入口"""
     quick_entry_service = QuickEntryService(db)
@@ -106,7 +105,7 @@ async def update_quick_entry(
     entry_id: int,
     entry_data: QuickEntryUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新快捷入口信息"""
     quick_entry_service = QuickEntryService(db)
@@ -122,7 +121,7 @@ async def update_quick_entry(
 async def delete_quick_entry(
     entry_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除快捷入口"""
     quick_entry_service = QuickEntryService(db)
@@ -137,7 +136,7 @@ async def update_quick_entry_status(
     entry_id: int,
     request: QuickEntryStatusRequest,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """启用/禁用快捷入口或设置为即将上线"""
     quick_entry_service = QuickEntryService(db)
@@ -153,7 +152,7 @@ async def update_quick_entry_status(
 async def update_quick_entry_sort(
     request: QuickEntrySortRequest,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """批量更新快捷入口排序"""
     quick_entry_service = QuickEntryService(db)
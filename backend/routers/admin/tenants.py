@@ -6,8 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
 from core.constants import admin_has_platform_privilege
-from core.deps import get_current_admin_user, require_platform_admin
-from models.admin_user import AdminUser
+from core.deps import get_current_admin_user, require_platform_admin, AuthedAdmin
 from schemas.tenant import TenantCreate, TenantUpdate, TenantQueryParams
 from services.tenant_service import TenantService
 from utils.response import success, page_response, ResponseMsg
@@ -18,7 +17,7 @@ router = APIRouter()
 @router.get("/options", summary="租户下拉选项")
 async def tenant_options(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     用于新建用户等场景选择租户。
@@ -43,7 +42,7 @@ async def list_tenants(
     code: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
-    _: AdminUser = Depends(require_platform_admin),
+    _: AuthedAdmin = Depends(require_platform_admin),
 ):
     svc = TenantService(db)
     params = TenantQueryParams(pageNum=pageNum, pageSize=pageSize, code=code, name=name)
@@ -55,7 +54,7 @@ async def list_tenants(
 async def get_tenant(
     tenant_id: int,
     db: AsyncSession = Depends(get_db),
-    _: AdminUser = Depends(require_platform_admin),
+    _: AuthedAdmin = Depends(require_platform_admin),
 ):
     svc = TenantService(db)
     data = await svc.get_by_id(tenant_id)
@@ -66,7 +65,7 @@ async def get_tenant(
 async def create_tenant(
     body: TenantCreate,
     db: AsyncSession = Depends(get_db),
-    _: AdminUser = Depends(require_platform_admin),
+    _: AuthedAdmin = Depends(require_platform_admin),
 ):
     svc = TenantService(db)
     data = await svc.create(body)
@@ -78,7 +77,7 @@ async def update_tenant(
     tenant_id: int,
     body: TenantUpdate,
     db: AsyncSession = Depends(get_db),
-    _: AdminUser = Depends(require_platform_admin),
+    _: AuthedAdmin = Depends(require_platform_admin),
 ):
     svc = TenantService(db)
     data = await svc.update(tenant_id, body)
@@ -7,9 +7,8 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from schemas.ticket import TicketCreate, TicketQueryParams
 from services.ticket import TicketService
 from utils.response import success, page_response, ResponseMsg
@@ -17,7 +16,7 @@ from utils.response import success, page_response, ResponseMsg
 router = APIRouter()
 
 
-async def _admin_scope_tid(db: AsyncSession, admin: AdminUser) -> Optional[int]:
+async def _admin_scope_tid(db: AsyncSession, admin: AuthedAdmin) -> Optional[int]:
     return await resolve_admin_agent_scope_tenant_id(
         db,
         admin_tenant_id=admin.tenant_id,
@@ -34,7 +33,7 @@ async def get_tickets(
     user_id: Optional[int] = Query(None, description="目标用户ID"),
     creator_id: Optional[int] = Query(None, description="创建人ID"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取工单列表（分页），支持按类型、状态、用户筛选"""
     params = TicketQueryParams(
@@ -60,7 +59,7 @@ async def get_tickets(
 async def get_ticket(
     ticket_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取工单详情"""
     service = TicketService(db)
@@ -72,7 +71,7 @@ async def get_ticket(
 @router.post("", summary="创建工单")
 async def create_ticket(
     data: TicketCreate,
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
     db=Depends(get_db),
 ):
     """创建工单（开通会员或充值算力）"""
@@ -89,7 +88,7 @@ async def create_ticket(
 @router.post("/{ticket_id}/handle", summary="处理工单")
 async def handle_ticket(
     ticket_id: int,
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """处理工单：执行开通会员或充值算力"""
@@ -4,8 +4,7 @@ B 端：抖音文案提取（与 C 端能力一致，便于在工具包内自测
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 
-from core.deps import get_current_user
-from models.admin_user import AdminUser
+from core.deps import get_current_user, AuthedAdmin
 from services.tools.douyin_caption_service import DouyinCaptionService
 from utils.response import success
 
@@ -19,7 +18,7 @@ class DouyinCaptionExtractRequest(BaseModel):
 @router.post("/extract", summary="抖音链接提取口播文案")
 async def extract_caption(
     body: DouyinCaptionExtractRequest,
-    _admin: AdminUser = Depends(get_current_user),
+    _admin: AuthedAdmin = Depends(get_current_user),
 ):
     svc = DouyinCaptionService()
     r = await svc.extract(body.url.strip())
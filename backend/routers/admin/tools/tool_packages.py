@@ -7,8 +7,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_user
-from models.admin_user import AdminUser
+from core.deps import get_current_user, AuthedAdmin
 from schemas.tool_package import (
     ToolPackageCreate,
     ToolPackageUpdate,
@@ -24,7 +23,7 @@ router = APIRouter()
 @router.put("/sort/batch", summary="批量调整排序")
 async def sort_tool_packages(
     body: ToolPackageSortRequest,
-    _: AdminUser = Depends(get_current_user),
+    _: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     svc = ToolPackageService(db)
@@ -38,7 +37,7 @@ async def list_tool_packages(
     pageSize: int = Query(10, ge=1, le=1000),
     status: Optional[int] = Query(None, ge=0, le=1),
     keyword: Optional[str] = Query(None),
-    _: AdminUser = Depends(get_current_user),
+    _: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     svc = ToolPackageService(db)
@@ -54,7 +53,7 @@ async def list_tool_packages(
 @router.get("/{package_id}", summary="工具包详情")
 async def get_tool_package(
     package_id: int,
-    _: AdminUser = Depends(get_current_user),
+    _: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     svc = ToolPackageService(db)
@@ -65,7 +64,7 @@ async def get_tool_package(
 @router.post("", summary="创建工具包")
 async def create_tool_package(
     body: ToolPackageCreate,
-    _: AdminUser = Depends(get_current_user),
+    _: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     svc = ToolPackageService(db)
@@ -77,7 +76,7 @@ async def create_tool_package(
 async def update_tool_package(
     package_id: int,
     body: ToolPackageUpdate,
-    _: AdminUser = Depends(get_current_user),
+    _: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     svc = ToolPackageService(db)
@@ -88,7 +87,7 @@ async def update_tool_package(
 @router.delete("/{package_id}", summary="删除工具包")
 async def delete_tool_package(
     package_id: int,
-    _: AdminUser = Depends(get_current_user),
+    _: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     svc = ToolPackageService(db)
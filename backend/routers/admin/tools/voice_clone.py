@@ -5,8 +5,7 @@ import base64
 from fastapi import APIRouter, Depends, UploadFile, File
 
 from db import get_db
-from core.deps import get_current_user
-from models.admin_user import AdminUser
+from core.deps import get_current_user, AuthedAdmin
 from services.tools.voice_clone_service import VoiceCloneService
 from utils.response import success
 from utils.exceptions import BadRequestException
@@ -27,7 +26,7 @@ class SynthesizeRequest(BaseModel):
 @router.post("/upload", summary="上传训练音频")
 async def upload_audio(
     file: UploadFile = File(...),
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
     db=Depends(get_db),
 ):
     """上传 5 秒以上音频，用于训练专属音色"""
@@ -50,7 +49,7 @@ async def upload_audio(
 
 @router.get("/status", summary="查询训练状态")
 async def get_status(
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
     db=Depends(get_db),
 ):
     """查询当前管理员的音色训练状态"""
@@ -62,7 +61,7 @@ async def get_status(
 @router.post("/synthesize", summary="文本转语音")
 async def synthesize(
     body: SynthesizeRequest,
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
     db=Depends(get_db),
 ):
     """使用已训练音色将文本转为语音，返回 base64 音频"""
@@ -9,8 +9,7 @@ from db import get_db
 from utils.exceptions import BadRequestException, ServerErrorException
 from utils.response import success
 from utils.oss_service import oss_service
-from core.deps import get_current_user
-from models.admin_user import AdminUser
+from core.deps import get_current_user, AuthedAdmin
 
 router = APIRouter()
 
@@ -23,7 +22,7 @@ MAX_FILE_SIZE = 2 * 1024 * 1024
 @router.post("/upload", summary="上传图片")
 async def upload_image(
     file: UploadFile = File(...),
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -77,7 +76,7 @@ async def upload_image(
 @router.post("/upload/avatar", summary="上传头像")
 async def upload_avatar(
     file: UploadFile = File(...),
-    current_user: AdminUser = Depends(get_current_user),
+    current_user: AuthedAdmin = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
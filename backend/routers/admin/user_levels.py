@@ -7,8 +7,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
-from models.admin_user import AdminUser
+from core.deps import get_current_admin_user, AuthedAdmin
 from services.system.user_level import UserLevelService
 from schemas.user_level import (
     UserLevelCreate,
@@ -25,7 +24,7 @@ router = APIRouter()
 async def list_user_levels(
     page_params: PageParams = Depends(),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取用户等级列表（分页）"""
     user_level_service = UserLevelService(db)
@@ -47,7 +46,7 @@ async def list_user_levels(
 @router.get("/all", summary="获取所有启用的用户等级")
 async def get_all_enabled_levels(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取所有启用的用户等级（不分页，用于下拉选择）"""
     user_level_service = UserLevelService(db)
@@ -63,7 +62,7 @@ async def get_all_enabled_levels(
 async def get_user_level(
     level_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取指定用户等级的详情"""
     user_level_service = UserLevelService(db)
@@ -79,7 +78,7 @@ async def get_user_level(
 async def create_user_level(
     data: UserLevelCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建新的用户等级配置"""
     user_level_service = UserLevelService(db)
@@ -108,7 +107,7 @@ async def update_user_level(
     level_id: int,
     data: UserLevelUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新用户等级配置"""
     user_level_service = UserLevelService(db)
@@ -125,7 +124,7 @@ async def update_user_level(
 async def delete_user_level(
     level_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除用户等级配置（硬删除）"""
     user_level_service = UserLevelService(db)
@@ -8,9 +8,8 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
-from core.deps import get_current_admin_user
+from core.deps import get_current_admin_user, AuthedAdmin
 from core.tenant_helpers import resolve_admin_agent_scope_tenant_id
-from models.admin_user import AdminUser
 from schemas.user import (
     UserCreate,
     UserUpdate,
@@ -20,7 +19,7 @@ from schemas.user import (
     ChangeLevelRequest,
 )
 from services.user import UserService
-from utils.response import success, page_response, ResponseMsg
+from utils.response import ORJSONResponse, success, page_response, ResponseMsg
 
 router = APIRouter()
 
@@ -36,7 +35,7 @@ async def get_users(
     minBalance: Optional[Decimal] = Query(None, description="最小算力余额"),
     maxBalance: Optional[Decimal] = Query(None, description="最大算力余额"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     获取用户列表（分页）
@@ -64,18 +63,19 @@ async def get_users(
     
     users, total = await user_service.get_users(params, scoped_tenant_id=scope_tid)
     
-    return page_response(
+    # 列表项均为基础类型字典，直接交给 orjson 编码，跳过 FastAPI 的 jsonable_encoder 逐项遍历
+    return ORJSONResponse(page_response(
         items=users,
         total=total,
         page_num=pageNum,
         page_size=pageSize,
-    )
+    ))
 
 
 @router.get("/options", summary="获取用户选项（状态和等级）")
 async def get_user_options(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取用户相关的所有选项（状态和等级）"""
     from services.system.user_level import UserLevelService
@@ -110,7 +110,7 @@ async def get_user_options(
 @router.get("/statistics/unionid", summary="获取用户 unionid 统计信息")
 async def get_unionid_statistics(
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取用户 unionid 统计（租户管理员仅限本租户）。"""
     from sqlalchemy import select, func, and_
@@ -165,7 +165,7 @@ async def get_unionid_statistics(
 async def get_user(
     user_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """获取用户详情"""
     user_service = UserService(db)
@@ -185,7 +185,7 @@ async def get_user(
 async def create_user(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """创建新用户"""
     user_service = UserService(db)
@@ -206,7 +206,7 @@ async def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """更新用户信息"""
     user_service = UserService(db)
@@ -227,7 +227,7 @@ async def update_user(
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """删除用户（软删除）"""
     user_service = UserService(db)
@@ -245,7 +245,7 @@ async def change_user_status(
     user_id: int,
     status: int = Query(..., ge=0, le=1, description="状态: 0-封禁, 1-正常"),
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """修改用户状态"""
     user_service = UserService(db)
@@ -265,7 +265,7 @@ async def change_user_status(
 @router.post("/recharge", summary="用户充值")
 async def recharge_user(
     request: RechargeRequest,
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """为用户充值算力"""
@@ -288,7 +288,7 @@ async def recharge_user(
 @router.post("/deduct", summary="用户扣费")
 async def deduct_user(
     request: DeductRequest,
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """扣除用户算力"""
@@ -310,7 +310,7 @@ async def deduct_user(
 @router.post("/change-level", summary="修改用户等级")
 async def change_user_level(
     request: ChangeLevelRequest,
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """修改用户等级"""
@@ -354,7 +354,7 @@ async def change_user_level(
 async def reset_user_password(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin_user),
+    current_admin: AuthedAdmin = Depends(get_current_admin_user),
 ):
     """
     重置用户密码为默认密码 123456
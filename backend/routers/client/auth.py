@@ -6,6 +6,7 @@ C端认证接口（小程序）
 import secrets
 import string
 import httpx
+import orjson
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends
@@ -25,7 +26,8 @@ from core.config import settings
 from core.deps import get_current_miniprogram_user
 from services.user import UserService
 from services.tenant_resolver import resolve_wechat_miniprogram_credentials
-from utils.response import success
+from utils.response import success, ORJSONResponse
+from utils.http_client import get_wechat_client
 from utils.exceptions import BadRequestException, ServerErrorException
 
 router = APIRouter()
@@ -40,6 +42,9 @@ class LoginRequest(BaseModel):
     scene: Optional[str] = Field(default=None, description="扫码场景值，提供时表示PC扫码登录，需同时提供phone_code，登录结果存入Redis供PC轮询")
     wechat_app_id: Optional[str] = Field(default=None, description="小程序 AppID；不传则使用服务端 WECHAT_APP_ID 并归入主租户映射")
 
+    class Config:
+        frozen = True
+
 
 class UserLevelInfo(BaseModel):
     """用户等级信息模型"""
@@ -51,6 +56,9 @@ class UserLevelInfo(BaseModel):
     can_use_advanced_agent: bool = Field(default=False, description="是否可使用高级智能体")
     unlimited_conversations: bool = Field(default=False, description="是否无限制对话")
 
+    class Config:
+        frozen = True
+
 
 class UserInfo(BaseModel):
     """用户信息模型（完整信息）"""
@@ -79,6 +87,10 @@ class UserInfo(BaseModel):
     vip_expire_date: Optional[str] = Field(default=None, description="会员到期时间 YYYY-MM-DD")
     expireDate: Optional[str] = Field(default=None, description="会员到期时间（兼容字段，与vip_expire_date相同）")
 
+    class Config:
+        # 由 build_user_info 一次性构建，之后只做序列化
+        frozen = True
+
 
 # ============== Helper Functions ==============
 
@@ -95,42 +107,42 @@ async def get_wechat_openid(
         raise ServerErrorException("微信小程序 AppID 或 AppSecret 未配置")
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                "https://api.weixin.qq.com/sns/jscode2session",
-                params={
-                    "appid": app_id,
-                    "secret": app_secret,
-                    "js_code": code,
-                    "grant_type": "authorization_code"
-                }
-            )
-            
-            data = response.json()
-            logger.info(f"WeChat API response: {data}")
-            
-            # 检查错误
-            if "errcode" in data:
-                errcode = data.get("errcode")
-                errmsg = data.get("errmsg", "未知错误")
-                logger.error(f"WeChat API error: errcode={errcode}, errmsg={errmsg}, code={code[:10]}...")
-                raise BadRequestException(f"微信登录失败: {errmsg} (错误码: {errcode})")
-            
-            openid = data.get("openid")
-            unionid = data.get("unionid")
-            session_key = data.get("session_key")
-            
-            if not openid:
-                logger.error(f"WeChat API returned no openid: {data}")
-                raise BadRequestException("微信登录失败: 未获取到 openid")
-            
-            # 检测 mock openid（微信开发者工具返回的测试数据）
-            if openid.startswith("o_mock_"):
-                logger.warning(f"检测到 mock openid（可能是微信开发者工具测试环境）: {openid}")
-            
-            logger.info(f"Successfully got openid: {openid[:10]}..., unionid: {unionid[:10] if unionid else 'None'}...")
-            
-            return openid, unionid
+        client = get_wechat_client()
+        response = await client.get(
+            "/sns/jscode2session",
+            params={
+                "appid": app_id,
+                "secret": app_secret,
+                "js_code": code,
+                "grant_type": "authorization_code"
+            }
+        )
+        
+        data = orjson.loads(response.content)
+        logger.info(f"WeChat API response: {data}")
+        
+        # 检查错误（errcode 缺省或为 0 表示成功）
+        errcode = data.get("errcode")
+        if errcode:
+            errmsg = data.get("errmsg", "未知错误")
+            logger.error(f"WeChat API error: errcode={errcode}, errmsg={errmsg}, code={code[:10]}...")
+            raise BadRequestException(f"微信登录失败: {errmsg} (错误码: {errcode})")
+        
+        openid = data.get("openid")
+        unionid = data.get("unionid")
+        session_key = data.get("session_key")
+        
+        if not openid:
+            logger.error(f"WeChat API returned no openid: {data}")
+            raise BadRequestException("微信登录失败: 未获取到 openid")
+        
+        # 检测 mock openid（微信开发者工具返回的测试数据）
+        if openid.startswith("o_mock_"):
+            logger.warning(f"检测到 mock openid（可能是微信开发者工具测试环境）: {openid}")
+        
+        logger.info(f"Successfully got openid: {openid[:10]}..., unionid: {unionid[:10] if unionid else 'None'}...")
+        
+        return openid, unionid
             
     except httpx.TimeoutException:
         raise ServerErrorException("微信 API 请求超时，请稍后重试")
@@ -155,46 +167,46 @@ async def get_wechat_phone_number(
         return None
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            token_response = await client.get(
-                "https://api.weixin.qq.com/cgi-bin/token",
-                params={
-                    "grant_type": "client_credential",
-                    "appid": app_id,
-                    "secret": app_secret,
-                }
-            )
-            token_data = token_response.json()
-            
-            if "errcode" in token_data:
-                # 获取 access_token 失败
-                return None
-            
-            access_token = token_data.get("access_token")
-            if not access_token:
-                return None
-            
-            # 2. 使用 access_token 和 phone_code 获取手机号
-            phone_response = await client.post(
-                "https://api.weixin.qq.com/wxa/business/getuserphonenumber",
-                params={"access_token": access_token},
-                json={"code": phone_code}
-            )
-            
-            phone_data = phone_response.json()
-            logger.info(f"WeChat phone API response: {phone_data}")
-            
-            if phone_data.get("errcode") == 0:
-                phone_info = phone_data.get("phone_info", {})
-                phone_number = phone_info.get("phoneNumber")
-                logger.info(f"Successfully got phone number: {phone_number}")
-                return phone_number
-            else:
-                errcode = phone_data.get("errcode")
-                errmsg = phone_data.get("errmsg", "未知错误")
-                logger.error(f"Failed to get phone number: errcode={errcode}, errmsg={errmsg}")
-            
+        client = get_wechat_client()
+        token_response = await client.get(
+            "/cgi-bin/token",
+            params={
+                "grant_type": "client_credential",
+                "appid": app_id,
+                "secret": app_secret,
+            }
+        )
+        token_data = orjson.loads(token_response.content)
+        
+        if token_data.get("errcode"):
+            # 获取 access_token 失败
             return None
+        
+        access_token = token_data.get("access_token")
+        if not access_token:
+            return None
+        
+        # 2. 使用 access_token 和 phone_code 获取手机号
+        phone_response = await client.post(
+            "/wxa/business/getuserphonenumber",
+            params={"access_token": access_token},
+            json={"code": phone_code}
+        )
+        
+        phone_data = orjson.loads(phone_response.content)
+        logger.info(f"WeChat phone API response: {phone_data}")
+        
+        if phone_data.get("errcode") == 0:
+            phone_info = phone_data.get("phone_info", {})
+            phone_number = phone_info.get("phoneNumber")
+            logger.info(f"Successfully got phone number: {phone_number}")
+            return phone_number
+        else:
+            errcode = phone_data.get("errcode")
+            errmsg = phone_data.get("errmsg", "未知错误")
+            logger.error(f"Failed to get phone number: errcode={errcode}, errmsg={errmsg}")
+        
+        return None
             
     except Exception as e:
         # 获取手机号失败，不影响登录流程
@@ -203,9 +215,8 @@ async def get_wechat_phone_number(
 
 
 def generate_username() -> str:
-    """生成随机用户名"""
-    random_str = ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(8))
-    return f"user_{random_str}"
+    """生成随机用户名（user_ + 8 位小写十六进制，一次读取随机数）"""
+    return f"user_{secrets.token_hex(4)}"
 
 
 def generate_scene_str() -> str:
@@ -369,7 +380,7 @@ def build_user_info(user: User) -> UserInfo:
     # 构建等级详细信息
     level_info = None
     if user.user_level:
-        level_info = UserLevelInfo(
+        level_info = UserLevelInfo.model_construct(
             code=user.user_level.code,
             name=user.user_level.name,
             max_ip_count=user.user_level.max_ip_count,
@@ -404,7 +415,8 @@ def build_user_info(user: User) -> UserInfo:
     # 处理手机号：将中间四位替换为*号
     masked_phone = mask_phone(user.phone)
     
-    return UserInfo(
+    # 字段均由服务端从数据库记录计算得出，使用 model_construct 跳过逐字段校验
+    return UserInfo.model_construct(
         user_id=user.id,
         openid=user.openid or "",
         nickname=user.nickname or "微信用户",
@@ -509,65 +521,29 @@ async def miniprogram_login(
         
         if not user:
             # 创建新用户前，检查 openid/unionid 是否属于已删除或封禁用户（避免 Duplicate entry 错误并给出友好提示）
-            if openid:
-                existing_raw = await user_service.get_user_by_openid_raw(openid)
-                if existing_raw and (existing_raw.is_deleted or not existing_raw.is_active):
-                    raise BadRequestException(msg="该用户信息异常，请联系管理员")
-            if unionid:
-                existing_raw = await user_service.get_user_by_unionid_raw(unionid)
-                if existing_raw and (existing_raw.is_deleted or not existing_raw.is_active):
-                    raise BadRequestException(msg="该用户信息异常，请联系管理员")
+            # 未删除用户已在上面按 unionid/openid/手机号查过，这里无需重复查询；
+            # 并发创建的极端情况由 openid 唯一索引兜底
+            if await user_service.has_blocked_wechat_identity(openid, unionid):
+                raise BadRequestException(msg="该用户信息异常，请联系管理员")
             
-            # 用户不存在，创建新用户
-            # 但在创建前，需要检查唯一性冲突
-            # 检查 openid 是否已被其他用户使用（虽然理论上不可能，因为 openid 有唯一索引）
-            if openid:
-                existing_by_openid = await user_service.get_user_by_openid(openid)
-                if existing_by_openid:
-                    logger.warning(f"Openid {openid} already exists for user {existing_by_openid.id}, but not found in previous search")
-                    user = existing_by_openid
-                    is_new_user = False
-                else:
-                    # 检查手机号是否已被其他用户使用
-                    if phone_number:
-                        existing_by_phone = await user_service.get_user_by_phone(phone_number)
-                        if existing_by_phone:
-                            logger.warning(f"Phone {phone_number} already exists for user {existing_by_phone.id}, binding to existing user")
-                            # 绑定到已存在的用户，更新 openid 和 unionid
-                            user = existing_by_phone
-                            user.openid = openid
-                            if unionid:
-                                user.unionid = unionid
-                            user.updated_at = datetime.now()
-                            await db.commit()
-                            await db.refresh(user)
-                            logger.info(f"Bound existing user: id={user.id}, phone={user.phone}, openid={user.openid}, unionid={user.unionid}")
-                            is_new_user = False
+            # 创建新用户：用户名由服务层随机生成，依赖唯一索引处理（极少出现的）冲突
+            user_data = {
+                "openid": openid,
+                "unionid": unionid,
+                "nickname": "微信用户",
+                "phone": phone_number,  # 保存手机号
+                "is_active": True,
+                "tenant_id": login_tenant_id,
+            }
+            logger.info(f"Creating new user: phone={phone_number}, openid={openid}, unionid={unionid if unionid else 'None'}")
             
-            # 如果仍然没有找到用户，创建新用户
-            if not user:
-                username = generate_username()
-                
-                # 检查用户名是否已存在（理论上不太可能，但确保唯一性）
-                while await user_service.get_user_by_username(username):
-                    username = generate_username()
-                
-                user_data = {
-                    "username": username,
-                    "openid": openid,
-                    "unionid": unionid,
-                    "nickname": "微信用户",
-                    "phone": phone_number,  # 保存手机号
-                    "is_active": True,
-                    "tenant_id": login_tenant_id,
-                }
-                logger.info(f"Creating new user: phone={phone_number}, openid={openid}, unionid={unionid if unionid else 'None'}")
-                
-                user = await user_service.create_user_from_dict(user_data)
-                await db.commit()
-                await db.refresh(user)
-                logger.info(f"User created: id={user.id}, phone={user.phone}, openid={user.openid}, unionid={user.unionid}")
-                is_new_user = True
+            user = await user_service.create_user_from_dict(
+                user_data, username_factory=generate_username
+            )
+            await db.commit()
+            await db.refresh(user)
+            logger.info(f"User created: id={user.id}, phone={user.phone}, openid={user.openid}, unionid={user.unionid}")
+            is_new_user = True
         else:
             # 用户已存在（通过unionid、openid或手机号找到），更新微信数据和登录状态
             logger.info(f"User exists: id={user.id}, current openid={user.openid}, current unionid={user.unionid}, current phone={user.phone}, new openid={openid}, new unionid={unionid}, new phone={phone_number}")
@@ -642,7 +618,8 @@ async def miniprogram_login(
             token_payload["tid"] = user_with_level.tenant_id
         access_token = create_access_token(data=token_payload)
         refresh_token = create_refresh_token(data={"sub": str(user_with_level.id)}, long_lived=True)
-        return success(
+        # 响应内容均为基础类型，直接返回 ORJSONResponse，跳过 FastAPI 对返回值的 jsonable_encoder 遍历
+        return ORJSONResponse(success(
             data={
                 "success": True,
                 "token": access_token,
@@ -652,7 +629,7 @@ async def miniprogram_login(
                 "is_new_user": is_new_user
             },
             msg="登录成功"
-        )
+        ))
         
     except (BadRequestException, ServerErrorException):
         raise
@@ -864,14 +841,14 @@ async def change_password(
 
     需要 Authorization header 携带 Bearer token
     """
-    from core.security import get_password_hash, verify_password
+    from core.security import hash_password_async, verify_password_async
 
     # 1. 检查用户是否已设置密码
     if not current_user.password_hash:
         raise BadRequestException("该账号未设置密码，无法修改密码")
 
     # 2. 验证原密码
-    if not verify_password(request.old_password, current_user.password_hash):
+    if not await verify_password_async(request.old_password, current_user.password_hash):
         raise BadRequestException("原密码错误")
 
     # 3. 检查新密码是否与原密码相同
@@ -888,7 +865,7 @@ async def change_password(
         raise BadRequestException("用户不存在")
 
     # 5. 更新密码（将MD5密码转为bcrypt哈希存储）
-    user.password_hash = get_password_hash(request.new_password)
+    user.password_hash = await hash_password_async(request.new_password)
 
     # 6. 提交更改
     await db.commit()
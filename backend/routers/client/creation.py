@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
 from models.user import User
-from core.deps import get_current_miniprogram_user, get_current_miniprogram_user_optional
+from core.deps import get_current_miniprogram_user, get_current_miniprogram_user_optional, json_body, json_body_openapi
 from core.tenant_constants import DEFAULT_TENANT_ID
 from core.client_public_scope import resolve_optional_public_tenant_id
 from services.resource import ProjectService
@@ -664,10 +664,10 @@ async def get_agent_detail(
     return success(data=data, msg="获取成功")
 
 
-@router.post("/chat")
+@router.post("/chat", openapi_extra=json_body_openapi(ChatRequest))
 async def generate_chat(
-    request: ChatRequest,
     background_tasks: BackgroundTasks,
+    request: ChatRequest = Depends(json_body(ChatRequest)),
     current_user: User = Depends(get_current_miniprogram_user),
     db: AsyncSession = Depends(get_db),
     scoped_public_tenant_id: Optional[int] = Depends(resolve_optional_public_tenant_id),
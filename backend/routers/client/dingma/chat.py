@@ -8,7 +8,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.client_public_scope import resolve_optional_public_tenant_id
-from core.deps import get_current_miniprogram_user
+from core.deps import get_current_miniprogram_user, json_body, json_body_openapi
 from db import get_db
 from models.user import User
 from routers.client.creation import ChatRequest
@@ -17,10 +17,10 @@ from services.dingma.chat_executor import generate_dingma_chat
 router = APIRouter()
 
 
-@router.post("/chat")
+@router.post("/chat", openapi_extra=json_body_openapi(ChatRequest))
 async def dingma_chat(
-    request: ChatRequest,
     background_tasks: BackgroundTasks,
+    request: ChatRequest = Depends(json_body(ChatRequest)),
     current_user: User = Depends(get_current_miniprogram_user),
     db: AsyncSession = Depends(get_db),
     scoped_public_tenant_id: Optional[int] = Depends(resolve_optional_public_tenant_id),
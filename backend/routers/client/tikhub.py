@@ -4,6 +4,8 @@ C端抖音分析接口（小程序 & PC官网）
 支持抖音账号分析、IP画像提取、热点智能体ID等功能
 注：热点榜单已迁移至 /api/v1/client/coze/hotspot-list
 """
+import asyncio
+import hashlib
 import re
 import httpx
 from typing import Optional, List
@@ -118,12 +120,9 @@ def extract_keywords_from_signature(signature: str) -> List[str]:
 
 async def mock_analyze_douyin(url: str) -> AnalyzeDouyinResponse:
     """Mock 数据用于演示和开发测试"""
-    import hashlib
-    import asyncio
-    
     await asyncio.sleep(2)
     
-    url_hash = hashlib.md5(url.encode()).hexdigest()
+    url_hash = hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
     
     mock_profiles = [
         {
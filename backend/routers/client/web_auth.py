@@ -17,7 +17,7 @@ from loguru import logger
 
 from db import get_db
 from db.redis import RedisCache
-from core.security import create_access_token, create_refresh_token, verify_password
+from core.security import create_access_token, create_refresh_token, verify_password_async
 from core.config import settings
 from models.user import User
 from services.tenant_resolver import resolve_wechat_miniprogram_credentials
@@ -110,7 +110,7 @@ async def account_login(
             raise BadRequestException("该账号未设置密码，请使用微信扫码登录")
 
         # 将前端传来的MD5密码与数据库中的bcrypt哈希进行验证
-        if not verify_password(request.password, user.password_hash):
+        if not await verify_password_async(request.password, user.password_hash):
             raise BadRequestException("手机号或密码错误")
 
         # 4. 检查会员是否过期
@@ -270,20 +270,10 @@ async def qrcode_login(
         # 如果用户不存在，自动创建新用户
         if not user:
             # 创建前检查 openid/unionid 是否属于已删除或封禁用户
-            if openid:
-                existing_raw = await user_service.get_user_by_openid_raw(openid)
-                if existing_raw and (existing_raw.is_deleted or not existing_raw.is_active):
-                    raise BadRequestException(msg="该用户信息异常，请联系管理员")
-            if unionid:
-                existing_raw = await user_service.get_user_by_unionid_raw(unionid)
-                if existing_raw and (existing_raw.is_deleted or not existing_raw.is_active):
-                    raise BadRequestException(msg="该用户信息异常，请联系管理员")
-            username = generate_username()
-            while await user_service.get_user_by_username(username):
-                username = generate_username()
-
+            if await user_service.has_blocked_wechat_identity(openid, unionid):
+                raise BadRequestException(msg="该用户信息异常，请联系管理员")
+            # 用户名由服务层随机生成，依赖唯一索引处理（极少出现的）冲突
             user_data = {
-                "username": username,
                 "openid": openid,
                 "unionid": unionid,
                 "nickname": "微信用户",
@@ -291,7 +281,9 @@ async def qrcode_login(
                 "tenant_id": login_tenant_id,
             }
             logger.info(f"Creating new user for QR code login: openid={openid}, unionid={unionid}")
-            user = await user_service.create_user_from_dict(user_data)
+            user = await user_service.create_user_from_dict(
+                user_data, username_factory=generate_username
+            )
             await db.commit()
             await db.refresh(user)
             logger.info(f"User created: id={user.id}, openid={user.openid}")
@@ -148,6 +148,7 @@ class AgentQueryParams(PageParams):
         - name: 按名称模糊查询
         - status: 按状态筛选
         - agentMode: 按智能体模式筛选（0-普通模式, 1-Skill 组装模式）
+        - cursor: 游标分页标记（上一页返回的 nextCursor），传入时忽略 pageNum 且不统计总数
     """
     name: Optional[str] = Field(None, description="智能体名称（模糊查询）")
     status: Optional[StatusType] = Field(None, description="状态")
@@ -156,6 +157,7 @@ class AgentQueryParams(PageParams):
         ge=0,
         description="智能体模式：0-普通模式, 1-Skill 组装模式",
     )
+    cursor: Optional[str] = Field(None, max_length=128, description="游标分页标记")
 
 
 class PromptTemplate(BaseModel):
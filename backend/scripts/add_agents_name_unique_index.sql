@@ -0,0 +1,5 @@
+-- MySQL：agents.name 唯一索引，兜底创建/改名时同名查询之后的并发写入
+-- 与 models.agent.Agent.__table_args__ 中的 ix_agents_name 一致。
+-- 执行前先确认没有重名数据（有结果时需先人工改名）：
+--   SELECT name, COUNT(*) FROM agents GROUP BY name HAVING COUNT(*) > 1;
+ALTER TABLE agents ADD UNIQUE INDEX ix_agents_name (name), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,3 @@
+-- MySQL：为智能体列表游标分页（ORDER BY sort_order ASC, created_at DESC, id DESC）添加复合索引
+-- 与 models.agent 中的 ix_agents_sort_created_id 一致；MySQL 8 支持按列声明降序，混合方向排序可直接走索引。
+ALTER TABLE agents ADD INDEX ix_agents_sort_created_id (sort_order, created_at DESC, id DESC), ALGORITHM=INPLACE, LOCK=NONE;
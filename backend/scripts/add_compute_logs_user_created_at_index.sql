@@ -0,0 +1,4 @@
+-- MySQL：为用户算力流水分页（WHERE user_id = ? ORDER BY created_at DESC LIMIT ?）添加复合索引
+-- 与 models.compute.ComputeLog.__table_args__ 中的 ix_compute_logs_user_created_at 一致。
+-- InnoDB 可反向扫描该索引满足倒序，无需声明 DESC；大表建议在低峰期执行。
+ALTER TABLE compute_logs ADD INDEX ix_compute_logs_user_created_at (user_id, created_at), ALGORITHM=INPLACE, LOCK=NONE;
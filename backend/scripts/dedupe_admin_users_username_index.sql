@@ -0,0 +1,5 @@
+-- MySQL：admin_users.username 原先同时存在唯一约束（索引名 username）和普通索引 ix_admin_users_username，
+-- 两个索引覆盖同一列，写入时重复维护。保留唯一索引并重命名为 ix_admin_users_username，
+-- 与 models.admin_user.AdminUser.__table_args__ 一致。执行前请用 SHOW INDEX FROM admin_users 确认索引名。
+ALTER TABLE admin_users DROP INDEX ix_admin_users_username;
+ALTER TABLE admin_users RENAME INDEX username TO ix_admin_users_username;
@@ -2,8 +2,12 @@
 Agent Service
 智能体管理服务
 """
-from typing import List, Optional
-from sqlalchemy import select, func, and_, or_, desc, asc
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import bindparam, case, select, update, func, and_, or_, desc, asc
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.agent import Agent
@@ -17,13 +21,58 @@ from utils.exceptions import (
     BadRequestException,
 )
 from utils.pagination import paginate_query, PageResult
+from db.redis import RedisCache
 from services.base import BaseService
 from core.tenant_constants import DEFAULT_TENANT_ID
+from core.agent_cache import AGENT_COUNT_CACHE_TTL, agent_count_cache_key, invalidate_agent_count_cache
+
+
+def encode_agent_cursor(agent: Agent) -> str:
+    """将列表排序键（sort_order:created_at:id）编码为 URL 安全的游标"""
+    raw = f"{agent.sort_order}:{agent.created_at.isoformat()}:{agent.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_agent_cursor(cursor: str) -> Tuple[int, datetime, int]:
+    """解析游标，格式非法时抛出 BadRequestException"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_order, rest = raw.split(":", 1)
+        created_at, agent_id = rest.rsplit(":", 1)
+        return int(sort_order), datetime.fromisoformat(created_at), int(agent_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise BadRequestException("无效的分页游标")
+
+
+# 按 ID 查询智能体：模块级构建一次，按参数执行，命中 SQLAlchemy 编译缓存
+_AGENT_BY_ID = select(Agent).where(Agent.id == bindparam("agent_id"))
+
+
+# 名称唯一索引名：写入冲突时据此区分名称重复与其他约束错误
+# 索引由 scripts/add_agents_name_unique_index.sql 手动创建，未执行迁移的库仍靠写入前的同名查询保证唯一
+AGENT_NAME_INDEX = "ix_agents_name"
+
+# MySQL 唯一键冲突错误码（ER_DUP_ENTRY）
+_MYSQL_DUP_ENTRY = 1062
+
+
+def _is_agent_name_conflict(exc: IntegrityError) -> bool:
+    """判断完整性错误是否由名称唯一索引冲突引起（MySQL 校验错误码与索引名，SQLite 校验约束列）"""
+    args = getattr(exc.orig, "args", ())
+    if args and args[0] == _MYSQL_DUP_ENTRY:
+        # 错误信息形如 Duplicate entry 'xxx' for key 'agents.ix_agents_name'
+        return len(args) > 1 and f"{AGENT_NAME_INDEX}'" in str(args[1])
+    return "UNIQUE constraint failed: agents.name" in str(exc.orig)
 
 
 class AgentService(BaseService):
     """智能体管理服务类"""
     
+    @staticmethod
+    async def invalidate_count_cache() -> None:
+        """清除列表总数缓存（需在事务提交后调用，写操作方法本身不清除）"""
+        await invalidate_agent_count_cache()
+    
     def __init__(self, db: AsyncSession):
         super().__init__(db, Agent, "智能体", check_soft_delete=False)
     
@@ -37,10 +86,10 @@ class AgentService(BaseService):
         获取智能体列表（分页）
         
         Args:
-            params: 查询参数
+            params: 查询参数（传入 cursor 时走游标分页，否则按 pageNum 偏移分页）
             
         Returns:
-            PageResult[Agent]: 分页结果
+            PageResult[Agent]: 分页结果（游标分页时 total 为 0，由 nextCursor 判断是否有下一页）
         """
         # 基础查询语句
         query = select(Agent)
@@ -79,24 +128,67 @@ class AgentService(BaseService):
         if conditions:
             query = query.where(and_(*conditions))
         
-        query = query.order_by(asc(Agent.sort_order), desc(Agent.created_at))
+        # id 作为末位排序键保证顺序稳定，与 ix_agents_sort_created_id 索引方向一致
+        query = query.order_by(
+            asc(Agent.sort_order), desc(Agent.created_at), desc(Agent.id)
+        )
+
+        if params.cursor:
+            # 游标分页：从上一页最后一条之后继续取，避免深分页 OFFSET 扫描，且不再统计总数。
+            # 排序方向混合（升序 + 降序），无法直接使用 tuple_ 行比较，这里展开为等价条件
+            sort_order, created_at, last_id = decode_agent_cursor(params.cursor)
+            query = query.where(
+                or_(
+                    Agent.sort_order > sort_order,
+                    and_(
+                        Agent.sort_order == sort_order,
+                        or_(
+                            Agent.created_at < created_at,
+                            and_(Agent.created_at == created_at, Agent.id < last_id),
+                        ),
+                    ),
+                )
+            ).limit(params.pageSize + 1)
+            items = list((await self.db.execute(query)).scalars().all())
+            has_more = len(items) > params.pageSize
+            items = items[: params.pageSize]
+            return PageResult(
+                list=items,
+                total=0,
+                pageNum=params.pageNum,
+                pageSize=params.pageSize,
+                nextCursor=encode_agent_cursor(items[-1]) if has_more else None,
+            )
         
         # 统计总数查询（需要与列表查询条件保持一致）
         count_query = select(func.count(Agent.id))
         if conditions:
             count_query = count_query.where(and_(*conditions))
+
+        # 总数优先取缓存（短 TTL + 写操作失效），命中时每页只执行一条列表查询
+        count_cache_key = await agent_count_cache_key(scoped_tenant_id, params.name, params.status, params.agentMode)
+        cached_total = await RedisCache.get(count_cache_key)
         
-        return await paginate_query(
+        result = await paginate_query(
             self.db,
             query,
             count_query,
             page_num=params.pageNum,
             page_size=params.pageSize,
+            total=int(cached_total) if cached_total is not None else None,
         )
+        if cached_total is None:
+            await RedisCache.set(count_cache_key, str(result.total), expire=AGENT_COUNT_CACHE_TTL)
+        # 偏移分页同样返回游标，便于客户端从任意页切换到游标续页
+        if result.list and params.pageNum * params.pageSize < result.total:
+            result.nextCursor = encode_agent_cursor(result.list[-1])
+        return result
     
     async def get_agent_by_id(self, agent_id: int, scoped_tenant_id: Optional[int] = None) -> Agent:
         """根据ID获取智能体"""
-        agent = await super().get_by_id(agent_id, error_msg=f"智能体 {agent_id} 不存在")
+        agent = (await self.db.execute(_AGENT_BY_ID, {"agent_id": agent_id})).scalar_one_or_none()
+        if not agent:
+            raise NotFoundException(msg=f"智能体 {agent_id} 不存在")
         aid = getattr(agent, "tenant_id", None)
         if scoped_tenant_id is not None:
             if aid is not None and aid != scoped_tenant_id:
@@ -116,6 +208,19 @@ class AgentService(BaseService):
         if agent.tenant_id != scoped_tenant_id:
             raise NotFoundException(msg=f"智能体 {agent.id} 不存在")
     
+    async def _flush_agent_name_checked(self, name: str) -> None:
+        """
+        刷新写入并将名称唯一索引冲突转换为业务异常
+
+        写入前的同名查询无法避免并发插入，唯一索引兜底；两者给出相同的错误信息
+        """
+        try:
+            await self.db.flush()
+        except IntegrityError as e:
+            if _is_agent_name_conflict(e):
+                raise BadRequestException(msg=f"智能体名称 '{name}' 已存在") from None
+            raise
+    
     async def create_agent(self, agent_data: AgentCreate, *, scoped_tenant_id: Optional[int] = None) -> Agent:
         """创建智能体"""
         if scoped_tenant_id is not None:
@@ -162,7 +267,7 @@ class AgentService(BaseService):
         )
         
         self.db.add(agent)
-        await self.db.flush()
+        await self._flush_agent_name_checked(agent_data.name)
         await self.db.refresh(agent)
         return agent
     
@@ -222,7 +327,7 @@ class AgentService(BaseService):
         if "isRoutingEnabled" in update_data:
             agent.is_routing_enabled = update_data["isRoutingEnabled"]
         
-        await self.db.flush()
+        await self._flush_agent_name_checked(agent.name)
         await self.db.refresh(agent)
         return agent
     
@@ -252,15 +357,39 @@ class AgentService(BaseService):
         return agent
     
     async def batch_update_sort(self, items: List[dict], *, scoped_tenant_id: Optional[int] = None) -> None:
-        """批量更新智能体排序"""
-        for item in items:
-            agent_id = item.get("id")
-            sort_order = item.get("sortOrder")
-            if agent_id and sort_order is not None:
-                try:
-                    agent = await self.get_agent_by_id(agent_id, scoped_tenant_id=scoped_tenant_id)
-                    self._assert_agent_mutable_for_scope(agent, scoped_tenant_id)
-                    agent.sort_order = sort_order
-                except NotFoundException:
+        """
+        批量更新智能体排序
+
+        先一次查询出目标智能体的租户归属做权限判断，再以一条 UPDATE ... CASE 写入全部排序值，
+        不再逐条查询与更新；不存在或不在数据范围内的智能体跳过
+        """
+        orders = {
+            item["id"]: item["sortOrder"]
+            for item in items
+            if item.get("id") and item.get("sortOrder") is not None
+        }
+        if not orders:
+            return
+        
+        rows = (await self.db.execute(
+            select(Agent.id, Agent.tenant_id).where(Agent.id.in_(orders))
+        )).all()
+        
+        allowed = []
+        for agent_id, tenant_id in rows:
+            if scoped_tenant_id is not None:
+                if tenant_id is None:
+                    raise BadRequestException(msg="全租户公用智能体仅平台管理员可编辑或删除")
+                if tenant_id != scoped_tenant_id:
                     continue
-        await self.db.flush()
+            elif tenant_id is not None and tenant_id != DEFAULT_TENANT_ID:
+                continue
+            allowed.append(agent_id)
+        
+        if allowed:
+            await self.db.execute(
+                update(Agent)
+                .where(Agent.id.in_(allowed))
+                .values(sort_order=case({agent_id: orders[agent_id] for agent_id in allowed}, value=Agent.id))
+                .execution_options(synchronize_session=False)
+            )
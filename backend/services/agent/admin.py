@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from loguru import logger
 
+from core.agent_cache import invalidate_agent_count_cache
 from models.agent import Agent
 from services.shared.prompt_builder import PromptBuilder
 from services.skill import SkillService
@@ -93,6 +94,7 @@ class AgentAdminService:
         
         await db.commit()
         await db.refresh(agent)
+        await invalidate_agent_count_cache()
         return agent
     
     @staticmethod
@@ -166,6 +168,7 @@ class AgentAdminService:
         
         await db.commit()
         await db.refresh(agent)
+        await invalidate_agent_count_cache()
         return agent
     
     @staticmethod
@@ -307,6 +310,7 @@ class AgentAdminService:
         await db.delete(agent)
         await db.flush()
         await db.commit()
+        await invalidate_agent_count_cache()
         return True
     
     @staticmethod
@@ -9,16 +9,21 @@ import asyncio
 
 from core.config import settings
 from schemas.ai import ChatMessage
+from utils.http_client import get_llm_client
 from services.resource import LLMModelService
 from services.shared.llm_service import (
     normalize_model_id_for_google_gemini_api,
     resolve_google_gemini_chat_completions_url,
 )
 import httpx
-import json
+import orjson
 import uuid
 
 
+# 默认 OpenAI 兼容接口地址（未配置模型时使用）
+_DEFAULT_BASE_URL = "https://api.deepseek.com"
+
+
 class AIService:
     """AI对话服务类"""
 
@@ -27,19 +32,7 @@ class AIService:
         self.llm_model_service = LLMModelService(db)
         # 兼容旧代码：如果没有配置模型，使用环境变量
         self.openai_api_key = settings.OPENAI_API_KEY
-        self.openai_base_url = "https://api.deepseek.com"
-
-        # HTTP/2 + Gzip 压缩的客户端配置
-        # 支持 HTTP/2 以提升性能（头部压缩、多路复用）
-        # httpx 会自动处理 gzip 压缩（自动添加 Accept-Encoding: gzip）
-        self._client_config = {
-            "timeout": httpx.Timeout(120.0, connect=10.0),
-            "limits": httpx.Limits(max_keepalive_connections=20, max_connections=100),
-            "http2": True,  # 启用 HTTP/2 支持
-            "verify": False,  # 验证 SSL 证书
-            "follow_redirects": True,
-            "trust_env": False,   # ⬅️ 关键：禁用读取系统代理环境变量
-        }
+        self.openai_base_url = _DEFAULT_BASE_URL
 
     @staticmethod
     def _upstream_error_user_message(status_code: int) -> str:
@@ -77,6 +70,19 @@ class AIService:
         # 创建后台任务
         asyncio.create_task(_do_update())
 
+    @staticmethod
+    def _format_messages(messages: List[Union[dict, ChatMessage]]) -> List[dict]:
+        """
+        将消息统一为 {"role", "content"} 字典列表。
+        调用方传入的通常已全是字典，此时直接复用原列表（后续流程只读不改）。
+        """
+        if all(type(m) is dict for m in messages):
+            return messages
+        return [
+            m if isinstance(m, dict) else {"role": m.role, "content": m.content}
+            for m in messages
+        ]
+
     def _apply_cache_control_for_claude(
         self,
         messages: List[dict],
@@ -227,12 +233,10 @@ class AIService:
             "thinking": {"type": "enabled"},
         }
 
-    def _resolve_client_config(self, base_url: Optional[str]) -> dict:
-        """按上游地址选择 HTTP 客户端配置（DeepSeek 官方 API 在 HTTP/2 下偶发 StreamReset）。"""
-        config = dict(self._client_config)
-        if base_url and "deepseek.com" in base_url.lower():
-            config["http2"] = False
-        return config
+    @staticmethod
+    def _use_http2(base_url: Optional[str]) -> bool:
+        """按上游地址决定是否启用 HTTP/2（DeepSeek 官方 API 在 HTTP/2 下偶发 StreamReset）。"""
+        return not (base_url and "deepseek.com" in base_url.lower())
 
     @staticmethod
     def _sanitize_request_body_for_gemini(request_body: dict) -> None:
@@ -286,15 +290,7 @@ class AIService:
                 raise ValueError("模型未配置 API Key，且环境变量也未配置（请设置 AI_COLLECT_API_KEY 或 OPENAI_API_KEY）")
         
         # 转换消息格式（支持ChatMessage对象或字典）
-        formatted_messages = []
-        for msg in messages:
-            if isinstance(msg, dict):
-                formatted_messages.append(msg)
-            else:
-                formatted_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+        formatted_messages = self._format_messages(messages)
         
         # 确定实际使用的模型标识与 provider（用于 DeepSeek 思考模式等）
         actual_model_id, db_provider = await self._resolve_model_identity(model)
@@ -341,8 +337,9 @@ class AIService:
             self._sanitize_request_body_for_gemini(request_body)
 
         # 手动序列化JSON,确保正确的编码
-        request_body_json = json.dumps(request_body, ensure_ascii=False)
-        request_body_size = len(request_body_json.encode('utf-8'))
+        # orjson 直接输出 UTF-8 字节（中文不转义），无需再 encode
+        request_body_bytes = orjson.dumps(request_body)
+        request_body_size = len(request_body_bytes)
 
         # 构建请求头
         # httpx 会自动添加 Accept-Encoding: gzip, deflate
@@ -356,80 +353,80 @@ class AIService:
         }
 
         # 调用 API（使用 HTTP/2 和 Gzip 支持）
-        async with httpx.AsyncClient(**self._resolve_client_config(base_url)) as client:
-            response = await client.post(
-                api_url,
-                headers=request_headers,
-                content=request_body_json.encode('utf-8'),  # 手动编码,使用content而不是json
-            )
-            
-            if response.status_code != 200:
-                error_text = response.text
-
-                # 🔍 详细错误日志
-                # 查找system prompt长度(可能在任何位置)
-                system_prompt_length = 'N/A'
-                for m in formatted_messages:
-                    if m.get('role') == 'system':
-                        c = m.get('content', '')
-                        if isinstance(c, str):
-                            system_prompt_length = len(c)
-                        elif isinstance(c, list):
-                            system_prompt_length = sum(
-                                len(b.get('text', '')) for b in c
-                                if isinstance(b, dict) and b.get('type') == 'text'
-                            )
-                        break
-
-                logger.error(f"❌ [API] LLM API请求失败 (非流式):")
-                logger.error(f"  - HTTP Status: {response.status_code}")
-                logger.error(f"  - API URL: {api_url}")
-                logger.error(f"  - Request Model: {model_for_upstream}")
-                if model_for_upstream != actual_model_id:
-                    logger.error(f"  - Catalog Model: {actual_model_id}")
-                logger.error(f"  - Model Type: {model}")
-                logger.error(f"  - Response Headers: {dict(response.headers)}")
-                logger.error(f"  - Error Response: {error_text[:1000]}")  # 限制长度
-                logger.error(f"  - Request Messages Count: {len(formatted_messages)}")
-                logger.error(f"  - System Prompt Length: {system_prompt_length}")
-
-                # 如果是503,提供特别提示
-                if response.status_code == 503:
-                    logger.error(f"  ⚠️ 503错误可能原因:")
-                    logger.error(f"    1. API网关过载或不可用")
-                    logger.error(f"    2. Base URL配置错误: {api_url}")
-                    logger.error(f"    3. 网关认证密钥(X-My-Gate-Key)无效")
-                    logger.error(f"    4. 外部API服务暂时不可用")
-                    logger.error(f"    💡 建议: 检查数据库中的base_url和api_key配置")
-
-                raise Exception(self._upstream_error_user_message(response.status_code))
-            
-            data = response.json()
-
-            # 更新 token 使用统计（异步后台任务，不阻塞响应）
-            usage = data.get("usage")
-            if usage and isinstance(usage, dict):
-                total_tokens = usage.get("total_tokens", 0)
-                if total_tokens > 0:
-                    # 使用异步后台任务更新，不阻塞主流程
-                    self._update_token_usage_async(actual_model_id, total_tokens)
-
-            # 格式化响应（DeepSeek 思考模式会返回 reasoning_content）
-            raw_msg = data["choices"][0]["message"]
-            message_out = {
-                "role": raw_msg["role"],
-                "content": raw_msg.get("content"),
-            }
-            if raw_msg.get("reasoning_content"):
-                message_out["reasoning_content"] = raw_msg["reasoning_content"]
-
-            return {
-                "id": data.get("id", str(uuid.uuid4())),
-                "model": data.get("model", actual_model_id),
-                "message": message_out,
-                "usage": usage,
-                "finish_reason": data["choices"][0].get("finish_reason"),
-            }
+        client = get_llm_client(http2=self._use_http2(base_url))
+        response = await client.post(
+            api_url,
+            headers=request_headers,
+            content=request_body_bytes,  # 预先编码的字节,使用content而不是json
+        )
+        
+        if response.status_code != 200:
+            error_text = response.text
+
+            # 🔍 详细错误日志
+            # 查找system prompt长度(可能在任何位置)
+            system_prompt_length = 'N/A'
+            for m in formatted_messages:
+                if m.get('role') == 'system':
+                    c = m.get('content', '')
+                    if isinstance(c, str):
+                        system_prompt_length = len(c)
+                    elif isinstance(c, list):
+                        system_prompt_length = sum(
+                            len(b.get('text', '')) for b in c
+                            if isinstance(b, dict) and b.get('type') == 'text'
+                        )
+                    break
+
+            logger.error(f"❌ [API] LLM API请求失败 (非流式):")
+            logger.error(f"  - HTTP Status: {response.status_code}")
+            logger.error(f"  - API URL: {api_url}")
+            logger.error(f"  - Request Model: {model_for_upstream}")
+            if model_for_upstream != actual_model_id:
+                logger.error(f"  - Catalog Model: {actual_model_id}")
+            logger.error(f"  - Model Type: {model}")
+            logger.error(f"  - Response Headers: {dict(response.headers)}")
+            logger.error(f"  - Error Response: {error_text[:1000]}")  # 限制长度
+            logger.error(f"  - Request Messages Count: {len(formatted_messages)}")
+            logger.error(f"  - System Prompt Length: {system_prompt_length}")
+
+            # 如果是503,提供特别提示
+            if response.status_code == 503:
+                logger.error(f"  ⚠️ 503错误可能原因:")
+                logger.error(f"    1. API网关过载或不可用")
+                logger.error(f"    2. Base URL配置错误: {api_url}")
+                logger.error(f"    3. 网关认证密钥(X-My-Gate-Key)无效")
+                logger.error(f"    4. 外部API服务暂时不可用")
+                logger.error(f"    💡 建议: 检查数据库中的base_url和api_key配置")
+
+            raise Exception(self._upstream_error_user_message(response.status_code))
+        
+        data = orjson.loads(response.content)
+
+        # 更新 token 使用统计（异步后台任务，不阻塞响应）
+        usage = data.get("usage")
+        if usage and isinstance(usage, dict):
+            total_tokens = usage.get("total_tokens", 0)
+            if total_tokens > 0:
+                # 使用异步后台任务更新，不阻塞主流程
+                self._update_token_usage_async(actual_model_id, total_tokens)
+
+        # 格式化响应（DeepSeek 思考模式会返回 reasoning_content）
+        raw_msg = data["choices"][0]["message"]
+        message_out = {
+            "role": raw_msg["role"],
+            "content": raw_msg.get("content"),
+        }
+        if raw_msg.get("reasoning_content"):
+            message_out["reasoning_content"] = raw_msg["reasoning_content"]
+
+        return {
+            "id": data.get("id", str(uuid.uuid4())),
+            "model": data.get("model", actual_model_id),
+            "message": message_out,
+            "usage": usage,
+            "finish_reason": data["choices"][0].get("finish_reason"),
+        }
     
     async def stream_chat(
         self,
@@ -474,15 +471,7 @@ class AIService:
                 raise ValueError("模型未配置 API Key，且环境变量也未配置（请设置 AI_COLLECT_API_KEY 或 OPENAI_API_KEY）")
         
         # 转换消息格式（支持ChatMessage对象或字典）
-        formatted_messages = []
-        for msg in messages:
-            if isinstance(msg, dict):
-                formatted_messages.append(msg)
-            else:
-                formatted_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+        formatted_messages = self._format_messages(messages)
         
         # 确定实际使用的模型标识与 provider
         actual_model_id, db_provider = await self._resolve_model_identity(model)
@@ -526,8 +515,8 @@ class AIService:
         logger.info(f"  - API URL: {api_url}")
         logger.info(f"  - Model: {model_for_upstream}")
         logger.info(f"  - Messages count: {len(formatted_messages)}")
-        client_config = self._resolve_client_config(base_url)
-        logger.info(f"  - HTTP/2 enabled: {client_config.get('http2', False)}")
+        use_http2 = self._use_http2(base_url)
+        logger.info(f"  - HTTP/2 enabled: {use_http2}")
         logger.info(f"  - Gzip compression: enabled")
         logger.info(f"  - Request headers keys: {list(request_headers.keys())}")
 
@@ -568,8 +557,9 @@ class AIService:
 
         # 计算并打印请求体大小
         # 手动序列化JSON,使用ensure_ascii=False支持中文
-        request_body_json = json.dumps(request_body, ensure_ascii=False)
-        request_body_size = len(request_body_json.encode('utf-8'))
+        # orjson 直接输出 UTF-8 字节（中文不转义），无需再 encode
+        request_body_bytes = orjson.dumps(request_body)
+        request_body_size = len(request_body_bytes)
         logger.info(f"  - Request body size: {request_body_size} bytes ({request_body_size/1024:.2f} KB)")
         logger.info(f"  - Estimated compressed size: ~{request_body_size//3} bytes (gzip)")
 
@@ -583,247 +573,250 @@ class AIService:
         request_headers["Content-Length"] = str(request_body_size)
 
         # 使用 HTTP/2 + Gzip 压缩的客户端（DeepSeek 官方 API 自动降级 HTTP/1.1）
-        async with httpx.AsyncClient(**client_config) as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    api_url,
-                    headers=request_headers,
-                    content=request_body_json.encode('utf-8'),  # 手动编码,使用content而不是json
-                ) as response:
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        error_text_str = error_text.decode('utf-8', errors='ignore') if error_text else ""
-
-                        # 🔍 详细错误日志
-                        # 查找system prompt长度(可能在任何位置)
-                        system_prompt_length = 'N/A'
-                        for m in formatted_messages:
-                            if m.get('role') == 'system':
-                                c = m.get('content', '')
-                                if isinstance(c, str):
-                                    system_prompt_length = len(c)
-                                elif isinstance(c, list):
-                                    system_prompt_length = sum(
-                                        len(b.get('text', '')) for b in c
-                                        if isinstance(b, dict) and b.get('type') == 'text'
-                                    )
-                                break
-
-                        logger.error(f"❌ [API] LLM API请求失败:")
-                        logger.error(f"  - HTTP Status: {response.status_code}")
-                        logger.error(f"  - API URL: {api_url}")
-                        logger.error(f"  - Request Model: {model_for_upstream}")
-                        if model_for_upstream != actual_model_id:
-                            logger.error(f"  - Catalog Model: {actual_model_id}")
-                        logger.error(f"  - Model Type: {model}")
-                        logger.error(f"  - Response Headers: {dict(response.headers)}")
-                        logger.error(f"  - Error Response: {error_text_str[:1000]}")  # 限制长度
-                        logger.error(f"  - Request Messages Count: {len(formatted_messages)}")
-                        logger.error(f"  - System Prompt Length: {system_prompt_length}")
-
-                        # 如果是503,提供特别提示
-                        if response.status_code == 503:
-                            logger.error(f"  ⚠️ 503错误可能原因:")
-                            logger.error(f"    1. API网关过载或不可用")
-                            logger.error(f"    2. Base URL配置错误: {api_url}")
-                            logger.error(f"    3. 网关认证密钥(X-My-Gate-Key)无效")
-                            logger.error(f"    4. 外部API服务暂时不可用")
-                            logger.error(f"    💡 建议: 检查数据库中的base_url和api_key配置")
-
-                        error_chunk = {
-                            "error": {
-                                "message": self._upstream_error_user_message(response.status_code),
-                                "type": "APIError",
-                                "status_code": response.status_code,
-                                "api_url": api_url,
-                                "model_id": actual_model_id,
-                                "request_model": model_for_upstream,
-                            }
+        client = get_llm_client(http2=use_http2)
+        try:
+            async with client.stream(
+                "POST",
+                api_url,
+                headers=request_headers,
+                content=request_body_bytes,  # 预先编码的字节,使用content而不是json
+            ) as response:
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    error_text_str = error_text.decode('utf-8', errors='ignore') if error_text else ""
+
+                    # 🔍 详细错误日志
+                    # 查找system prompt长度(可能在任何位置)
+                    system_prompt_length = 'N/A'
+                    for m in formatted_messages:
+                        if m.get('role') == 'system':
+                            c = m.get('content', '')
+                            if isinstance(c, str):
+                                system_prompt_length = len(c)
+                            elif isinstance(c, list):
+                                system_prompt_length = sum(
+                                    len(b.get('text', '')) for b in c
+                                    if isinstance(b, dict) and b.get('type') == 'text'
+                                )
+                            break
+
+                    logger.error(f"❌ [API] LLM API请求失败:")
+                    logger.error(f"  - HTTP Status: {response.status_code}")
+                    logger.error(f"  - API URL: {api_url}")
+                    logger.error(f"  - Request Model: {model_for_upstream}")
+                    if model_for_upstream != actual_model_id:
+                        logger.error(f"  - Catalog Model: {actual_model_id}")
+                    logger.error(f"  - Model Type: {model}")
+                    logger.error(f"  - Response Headers: {dict(response.headers)}")
+                    logger.error(f"  - Error Response: {error_text_str[:1000]}")  # 限制长度
+                    logger.error(f"  - Request Messages Count: {len(formatted_messages)}")
+                    logger.error(f"  - System Prompt Length: {system_prompt_length}")
+
+                    # 如果是503,提供特别提示
+                    if response.status_code == 503:
+                        logger.error(f"  ⚠️ 503错误可能原因:")
+                        logger.error(f"    1. API网关过载或不可用")
+                        logger.error(f"    2. Base URL配置错误: {api_url}")
+                        logger.error(f"    3. 网关认证密钥(X-My-Gate-Key)无效")
+                        logger.error(f"    4. 外部API服务暂时不可用")
+                        logger.error(f"    💡 建议: 检查数据库中的base_url和api_key配置")
+
+                    error_chunk = {
+                        "error": {
+                            "message": self._upstream_error_user_message(response.status_code),
+                            "type": "APIError",
+                            "status_code": response.status_code,
+                            "api_url": api_url,
+                            "model_id": actual_model_id,
+                            "request_model": model_for_upstream,
                         }
-                        yield json.dumps(error_chunk)
-                        return
-                    
-                    # 检查响应内容类型，如果不是 SSE 格式，返回错误
-                    content_type = response.headers.get("content-type", "").lower()
-                    if "text/event-stream" not in content_type and "text/plain" not in content_type and "application/json" not in content_type:
-                        # 可能是 HTML 或其他格式的错误响应
-                        error_text = await response.aread()
-                        error_msg = error_text.decode('utf-8', errors='ignore')[:500]  # 限制长度
-                        logger.error(f"API returned non-SSE response: {content_type} - {error_msg[:200]}")
+                    }
+                    yield orjson.dumps(error_chunk).decode()
+                    return
+                
+                # 检查响应内容类型，如果不是 SSE 格式，返回错误
+                content_type = response.headers.get("content-type", "").lower()
+                if "text/event-stream" not in content_type and "text/plain" not in content_type and "application/json" not in content_type:
+                    # 可能是 HTML 或其他格式的错误响应
+                    error_text = await response.aread()
+                    error_msg = error_text.decode('utf-8', errors='ignore')[:500]  # 限制长度
+                    logger.error(f"API returned non-SSE response: {content_type} - {error_msg[:200]}")
+                    error_chunk = {
+                        "error": {
+                            "message": f"API 返回了非 SSE 格式的响应 (content-type: {content_type})，可能是认证失败或 URL 错误",
+                            "type": "InvalidResponseError",
+                            "details": error_msg[:200] if len(error_msg) > 0 else "无错误详情"
+                        }
+                    }
+                    yield orjson.dumps(error_chunk).decode()
+                    return
+                
+                # 解析 SSE 流：按字节累积到 bytearray，定位分隔符后原地删除已处理部分，
+                # 避免字符串拼接与 split 在长回复中反复复制整个缓冲区
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    # 检查第一个 chunk 是否是 HTML 响应
+                    head = chunk.lstrip()
+                    if head.startswith(b"<!DOCTYPE") or head.startswith(b"<html"):
+                        logger.error(f"API returned HTML response instead of SSE stream")
                         error_chunk = {
                             "error": {
-                                "message": f"API 返回了非 SSE 格式的响应 (content-type: {content_type})，可能是认证失败或 URL 错误",
+                                "message": "API 返回了 HTML 响应而不是 SSE 流，可能是认证失败或 URL 错误",
                                 "type": "InvalidResponseError",
-                                "details": error_msg[:200] if len(error_msg) > 0 else "无错误详情"
+                                "details": chunk[:200].decode("utf-8", errors="ignore") if len(chunk) > 0 else "无错误详情"
                             }
                         }
-                        yield json.dumps(error_chunk)
+                        yield orjson.dumps(error_chunk).decode()
                         return
                     
-                    # 解析 SSE 流
-                    buffer = ""
-                    async for chunk in response.aiter_text():
-                        # 检查第一个 chunk 是否是 HTML 响应
-                        if chunk.strip().startswith("<!DOCTYPE") or chunk.strip().startswith("<html"):
-                            logger.error(f"API returned HTML response instead of SSE stream")
-                            error_chunk = {
-                                "error": {
-                                    "message": "API 返回了 HTML 响应而不是 SSE 流，可能是认证失败或 URL 错误",
-                                    "type": "InvalidResponseError",
-                                    "details": chunk[:200] if len(chunk) > 0 else "无错误详情"
-                                }
-                            }
-                            yield json.dumps(error_chunk)
-                            return
+                    buffer.extend(chunk)
+                    
+                    # 处理完整的 SSE 消息（以 \n\n 分隔）
+                    while (idx := buffer.find(b"\n\n")) != -1:
+                        line = bytes(buffer[:idx])
+                        del buffer[:idx + 2]
                         
-                        buffer += chunk
+                        if not line.startswith(b"data: "):
+                            continue
                         
-                        # 处理完整的 SSE 消息（以 \n\n 分隔）
-                        while "\n\n" in buffer:
-                            line, buffer = buffer.split("\n\n", 1)
-                            
-                            if not line.startswith("data: "):
-                                continue
-                            
-                            data_str = line[6:]  # 移除 "data: " 前缀
-                            
-                            # 检查是否是结束标记
-                            if data_str.strip() == "[DONE]":
-                                # 流结束时更新 token 使用统计（异步后台任务，不阻塞响应）
-                                if usage_info and usage_info.get("total_tokens", 0) > 0:
-                                    # 使用异步后台任务更新，不阻塞主流程
-                                    self._update_token_usage_async(actual_model_id, usage_info["total_tokens"])
-                                return
+                        data_str = line[6:]  # 移除 "data: " 前缀（orjson.loads 可直接解析 bytes）
+                        
+                        # 检查是否是结束标记
+                        if data_str.strip() == b"[DONE]":
+                            # 流结束时更新 token 使用统计（异步后台任务，不阻塞响应）
+                            if usage_info and usage_info.get("total_tokens", 0) > 0:
+                                # 使用异步后台任务更新，不阻塞主流程
+                                self._update_token_usage_async(actual_model_id, usage_info["total_tokens"])
+                            return
+                        
+                        try:
+                            # 解析 JSON 数据
+                            data = orjson.loads(data_str)
                             
-                            try:
-                                # 解析 JSON 数据
-                                data = json.loads(data_str)
-                                
-                                # 保存 usage 信息（通常在最后一个 chunk 中）
+                            # 保存 usage 信息（通常在最后一个 chunk 中）
+                            if "usage" in data:
+                                usage_info = data["usage"]
+
+                            # 提取 delta content
+                            choices = data.get("choices", [])
+                            delta = choices[0]["delta"] if choices and "delta" in choices[0] else {}
+                            content = delta.get("content") or ""
+                            reasoning_piece = delta.get("reasoning_content") or ""
+
+                            if content or reasoning_piece:
+                                # 格式化为前端需要的格式，附带 usage 供调用方计费使用
+                                delta_out = {}
+                                if content:
+                                    delta_out["content"] = content
+                                if reasoning_piece:
+                                    delta_out["reasoning_content"] = reasoning_piece
+                                if delta.get("role") is not None:
+                                    delta_out["role"] = delta.get("role")
+                                chunk_data = {
+                                    "id": data.get("id", ""),
+                                    "delta": delta_out,
+                                    "finish_reason": choices[0].get("finish_reason") if choices else None,
+                                }
                                 if "usage" in data:
-                                    usage_info = data["usage"]
-
-                                # 提取 delta content
-                                choices = data.get("choices", [])
-                                delta = choices[0]["delta"] if choices and "delta" in choices[0] else {}
-                                content = delta.get("content") or ""
-                                reasoning_piece = delta.get("reasoning_content") or ""
-
-                                if content or reasoning_piece:
-                                    # 格式化为前端需要的格式，附带 usage 供调用方计费使用
-                                    delta_out = {}
-                                    if content:
-                                        delta_out["content"] = content
-                                    if reasoning_piece:
-                                        delta_out["reasoning_content"] = reasoning_piece
-                                    if delta.get("role") is not None:
-                                        delta_out["role"] = delta.get("role")
-                                    chunk_data = {
-                                        "id": data.get("id", ""),
-                                        "delta": delta_out,
-                                        "finish_reason": choices[0].get("finish_reason") if choices else None,
-                                    }
-                                    if "usage" in data:
-                                        chunk_data["usage"] = data["usage"]
-                                    yield json.dumps(chunk_data)
-                                elif "usage" in data:
-                                    # 最后一个 chunk 可能仅有 usage 无 content，单独 yield 供调用方计费
-                                    chunk_data = {
-                                        "usage": data["usage"],
-                                        "finish_reason": choices[0].get("finish_reason") if choices else None,
-                                    }
-                                    yield json.dumps(chunk_data)
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Failed to parse SSE data: {data_str[:100]} - {e}")
-                                continue
-            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
-                # 连接错误：无法建立到API服务器的连接
-                logger.error(f"❌ [API] 连接失败:")
-                logger.error(f"  - Error Type: {type(e).__name__}")
-                logger.error(f"  - Error Message: {str(e)}")
-                logger.error(f"  - API URL: {api_url}")
-                logger.error(f"  - Request Model: {model_for_upstream}")
-                
-                # 提取底层异常信息
-                if hasattr(e, '__cause__') and e.__cause__:
-                    logger.error(f"  - Underlying Error: {type(e.__cause__).__name__}: {str(e.__cause__)}")
-                
-                # 连接错误诊断
-                logger.error(f"  - 连接错误诊断:")
-                logger.error(f"    * 可能原因: 网络连接失败、DNS解析失败、防火墙阻止、API服务不可用")
-                logger.error(f"    * API地址: {api_url}")
-                logger.error(f"    * 建议检查: 网络连接、API服务状态、代理设置、防火墙规则")
-                
-                error_chunk = {
-                    "error": {
-                        "message": f"无法连接到AI服务: {str(e) if str(e) else '连接失败'}",
-                        "type": "ConnectionError",
-                        "api_url": api_url,
-                        "model_id": actual_model_id,
-                        "request_model": model_for_upstream,
-                        "details": "请检查网络连接和API服务状态"
-                    }
+                                    chunk_data["usage"] = data["usage"]
+                                yield orjson.dumps(chunk_data).decode()
+                            elif "usage" in data:
+                                # 最后一个 chunk 可能仅有 usage 无 content，单独 yield 供调用方计费
+                                chunk_data = {
+                                    "usage": data["usage"],
+                                    "finish_reason": choices[0].get("finish_reason") if choices else None,
+                                }
+                                yield orjson.dumps(chunk_data).decode()
+                        except orjson.JSONDecodeError as e:
+                            logger.warning(f"Failed to parse SSE data: {data_str[:100].decode('utf-8', errors='ignore')} - {e}")
+                            continue
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            # 连接错误：无法建立到API服务器的连接
+            logger.error(f"❌ [API] 连接失败:")
+            logger.error(f"  - Error Type: {type(e).__name__}")
+            logger.error(f"  - Error Message: {str(e)}")
+            logger.error(f"  - API URL: {api_url}")
+            logger.error(f"  - Request Model: {model_for_upstream}")
+            
+            # 提取底层异常信息
+            if hasattr(e, '__cause__') and e.__cause__:
+                logger.error(f"  - Underlying Error: {type(e.__cause__).__name__}: {str(e.__cause__)}")
+            
+            # 连接错误诊断
+            logger.error(f"  - 连接错误诊断:")
+            logger.error(f"    * 可能原因: 网络连接失败、DNS解析失败、防火墙阻止、API服务不可用")
+            logger.error(f"    * API地址: {api_url}")
+            logger.error(f"    * 建议检查: 网络连接、API服务状态、代理设置、防火墙规则")
+            
+            error_chunk = {
+                "error": {
+                    "message": f"无法连接到AI服务: {str(e) if str(e) else '连接失败'}",
+                    "type": "ConnectionError",
+                    "api_url": api_url,
+                    "model_id": actual_model_id,
+                    "request_model": model_for_upstream,
+                    "details": "请检查网络连接和API服务状态"
                 }
-                yield json.dumps(error_chunk)
-                return
-            except httpx.RemoteProtocolError as e:
-                # HTTP/2 流被上游重置（DeepSeek 等偶发 StreamReset）
-                logger.error(f"❌ [API] 上游连接被重置:")
-                logger.error(f"  - Error Type: {type(e).__name__}")
-                logger.error(f"  - Error Message: {str(e)}")
-                logger.error(f"  - API URL: {api_url}")
-                logger.error(f"  - Request Model: {model_for_upstream}")
-                logger.error(f"  - HTTP/2 enabled: {client_config.get('http2', False)}")
-
-                error_chunk = {
-                    "error": {
-                        "message": "AI服务连接异常，请稍后重试",
-                        "type": "RemoteProtocolError",
-                        "api_url": api_url,
-                        "model_id": actual_model_id,
-                        "request_model": model_for_upstream,
-                    }
+            }
+            yield orjson.dumps(error_chunk).decode()
+            return
+        except httpx.RemoteProtocolError as e:
+            # HTTP/2 流被上游重置（DeepSeek 等偶发 StreamReset）
+            logger.error(f"❌ [API] 上游连接被重置:")
+            logger.error(f"  - Error Type: {type(e).__name__}")
+            logger.error(f"  - Error Message: {str(e)}")
+            logger.error(f"  - API URL: {api_url}")
+            logger.error(f"  - Request Model: {model_for_upstream}")
+            logger.error(f"  - HTTP/2 enabled: {use_http2}")
+
+            error_chunk = {
+                "error": {
+                    "message": "AI服务连接异常，请稍后重试",
+                    "type": "RemoteProtocolError",
+                    "api_url": api_url,
+                    "model_id": actual_model_id,
+                    "request_model": model_for_upstream,
                 }
-                yield json.dumps(error_chunk)
-                return
-            except httpx.TimeoutException as e:
-                # 超时错误
-                logger.error(f"❌ [API] 请求超时:")
-                logger.error(f"  - API URL: {api_url}")
-                logger.error(f"  - Request Model: {model_for_upstream}")
-                logger.error(f"  - Timeout: {self._client_config.get('timeout')}")
-                
-                error_chunk = {
-                    "error": {
-                        "message": f"AI服务响应超时: {str(e) if str(e) else '请求超时'}",
-                        "type": "TimeoutError",
-                        "api_url": api_url,
-                        "model_id": actual_model_id,
-                        "request_model": model_for_upstream,
-                    }
+            }
+            yield orjson.dumps(error_chunk).decode()
+            return
+        except httpx.TimeoutException as e:
+            # 超时错误
+            logger.error(f"❌ [API] 请求超时:")
+            logger.error(f"  - API URL: {api_url}")
+            logger.error(f"  - Request Model: {model_for_upstream}")
+            logger.error(f"  - Timeout: {client.timeout}")
+            
+            error_chunk = {
+                "error": {
+                    "message": f"AI服务响应超时: {str(e) if str(e) else '请求超时'}",
+                    "type": "TimeoutError",
+                    "api_url": api_url,
+                    "model_id": actual_model_id,
+                    "request_model": model_for_upstream,
                 }
-                yield json.dumps(error_chunk)
-                return
-            except Exception as e:
-                # 其他未预期的错误
-                import traceback
-                logger.error(f"❌ [API] 未预期的错误:")
-                logger.error(f"  - Error Type: {type(e).__name__}")
-                logger.error(f"  - Error Message: {str(e)}")
-                logger.error(f"  - API URL: {api_url}")
-                logger.error(f"  - Request Model: {model_for_upstream}")
-                logger.error(f"  - Traceback:\n{traceback.format_exc()}")
-                
-                error_chunk = {
-                    "error": {
-                        "message": f"AI服务请求失败: {str(e)}",
-                        "type": type(e).__name__,
-                        "api_url": api_url,
-                        "model_id": actual_model_id,
-                        "request_model": model_for_upstream,
-                    }
+            }
+            yield orjson.dumps(error_chunk).decode()
+            return
+        except Exception as e:
+            # 其他未预期的错误
+            import traceback
+            logger.error(f"❌ [API] 未预期的错误:")
+            logger.error(f"  - Error Type: {type(e).__name__}")
+            logger.error(f"  - Error Message: {str(e)}")
+            logger.error(f"  - API URL: {api_url}")
+            logger.error(f"  - Request Model: {model_for_upstream}")
+            logger.error(f"  - Traceback:\n{traceback.format_exc()}")
+            
+            error_chunk = {
+                "error": {
+                    "message": f"AI服务请求失败: {str(e)}",
+                    "type": type(e).__name__,
+                    "api_url": api_url,
+                    "model_id": actual_model_id,
+                    "request_model": model_for_upstream,
                 }
-                yield json.dumps(error_chunk)
-                return
+            }
+            yield orjson.dumps(error_chunk).decode()
+            return
 
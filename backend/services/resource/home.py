@@ -24,6 +24,7 @@ from models.article import (
 from models.banner import Banner, BannerPosition
 from models.home_config import HomeConfig
 from services.resource import BannerService, ArticleService
+from services.system.home_config import get_local_config, set_local_config
 
 
 class HomeService:
@@ -343,6 +344,11 @@ class HomeService:
         Returns:
             推荐模块列表
         """
+        # 优先读取进程内缓存（首页每次渲染都会调用，配置极少变更）
+        cached = get_local_config(scoped_tenant_id, "featured_modules")
+        if cached is not None:
+            return cached
+        
         try:
             # 查询 featured_modules 配置
             query_base = [
@@ -357,6 +363,7 @@ class HomeService:
             config = result.scalar_one_or_none()
             
             if not config or not config.config_value:
+                set_local_config(scoped_tenant_id, "featured_modules", [])
                 return []
             
             # 解析 JSON 配置值
@@ -416,6 +423,7 @@ class HomeService:
                         "iconSize": module.get("iconSize", 20)  # 默认图标大小，与组件默认值保持一致
                     })
             
+            set_local_config(scoped_tenant_id, "featured_modules", featured_modules)
             return featured_modules
         except Exception as e:
             logger.error(f"获取 featured_modules 配置失败: {e}")
@@ -21,6 +21,12 @@ from utils.exceptions import (
 )
 from utils.pagination import paginate_query, PageResult
 from services.base import BaseService
+from db.redis import RedisCache
+
+
+# 启用模型选项缓存（智能体编辑页、AI 对话页下拉框使用，模型增删改时清除）
+CACHE_KEY_ENABLED_MODEL_OPTIONS = "llm_models:enabled_options"
+ENABLED_MODEL_OPTIONS_TTL = 60
 
 
 class LLMModelService(BaseService):
@@ -96,6 +102,36 @@ class LLMModelService(BaseService):
         )
         return list(result.scalars().all())
     
+    async def get_enabled_model_options(self) -> List[dict]:
+        """
+        获取启用模型的选项列表（带 Redis 缓存）
+
+        Returns:
+            [{"id": "1", "name": ..., "model_id": ..., "provider": ...}]，id 为字符串（前端需要）
+        """
+        async def _fetch() -> List[dict]:
+            models = await self.get_enabled_models()
+            return [
+                {
+                    "id": str(model.id),
+                    "name": model.name,
+                    "model_id": model.model_id,
+                    "provider": model.provider,
+                }
+                for model in models
+            ]
+
+        return await RedisCache.get_or_set(
+            CACHE_KEY_ENABLED_MODEL_OPTIONS,
+            _fetch,
+            expire=ENABLED_MODEL_OPTIONS_TTL,
+        )
+
+    @staticmethod
+    async def invalidate_enabled_model_cache() -> None:
+        """清除启用模型选项缓存（需在事务提交后调用）"""
+        await RedisCache.delete(CACHE_KEY_ENABLED_MODEL_OPTIONS)
+    
     async def create_llm_model(self, model_data: LLMModelCreate) -> LLMModel:
         """创建大模型配置"""
         # 检查 model_id 是否已存在
@@ -3,53 +3,99 @@ Authentication Service
 认证服务
 """
 from datetime import datetime, timezone
-from sqlalchemy import select
+from sqlalchemy import bindparam, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from models.admin_user import AdminUser
-from core.security import verify_password, create_access_token, create_refresh_token
+from core.security import verify_password_async, create_access_token, create_refresh_token
 from core.config import settings
+from db.redis import RedisCache
 from utils.exceptions import UnauthorizedException
 from typing import Dict
 
 
+# 热路径查询语句在模块加载时构建一次，按参数执行，命中 SQLAlchemy 编译缓存
+_ADMIN_BY_LOGIN = select(AdminUser).where(
+    or_(AdminUser.username == bindparam("login"), AdminUser.email == bindparam("login")),
+    AdminUser.is_deleted == False,
+)
+_ADMIN_BY_ID = select(AdminUser).where(
+    AdminUser.id == bindparam("uid"),
+    AdminUser.is_deleted == False,
+)
+
+
+def _login_fail_key(username: str, client_ip: str) -> str:
+    """登录失败计数缓存键（用户名 + 客户端 IP）"""
+    return f"auth:login_fail:{username}:{client_ip}"
+
+
+def _login_fail_user_key(username: str) -> str:
+    """登录失败计数缓存键（仅用户名，不区分来源）"""
+    return f"auth:login_fail:{username}"
+
+
+async def _record_login_failure(fail_key: str, user_fail_key: str) -> None:
+    """登录失败时同时累加来源计数与用户名总计数"""
+    await RedisCache.incr(fail_key, expire=settings.ADMIN_LOGIN_LOCK_SECONDS)
+    await RedisCache.incr(user_fail_key, expire=settings.ADMIN_LOGIN_LOCK_SECONDS)
+
+
 class AuthService:
-    """认证服务类"""
-    
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    """
+    认证服务类
+
+    服务不持有状态，方法均为静态方法，调用时直接传入数据库会话，
+    无需每次请求实例化：
+        tokens = await AuthService.login(db, username, password)
+    """
     
-    async def login(self, username: str, password: str) -> Dict[str, any]:
+    @staticmethod
+    async def login(
+        db: AsyncSession, username: str, password: str, client_ip: str = ""
+    ) -> Dict[str, any]:
         """
         管理员用户登录
 
         Args:
+            db: 异步数据库会话
             username: 用户名
             password: 密码
+            client_ip: 客户端 IP（登录失败限流按用户名 + IP 计数，另按用户名设总上限）
 
         Returns:
             包含 access_token 和 refresh_token 的字典
 
         Raises:
-            UnauthorizedException: 用户名或密码错误
+            UnauthorizedException: 用户名或密码错误，或连续失败次数过多
         """
+        # 同一来源对该用户名连续失败、或该用户名累计失败达到上限时直接拒绝，不再查询数据库与执行 bcrypt
+        fail_key = _login_fail_key(username, client_ip)
+        user_fail_key = _login_fail_user_key(username)
+        failures = await RedisCache.get(fail_key)
+        user_failures = await RedisCache.get(user_fail_key)
+        if (
+            failures is not None and int(failures) >= settings.ADMIN_LOGIN_MAX_FAILURES
+        ) or (
+            user_failures is not None and int(user_failures) >= settings.ADMIN_LOGIN_MAX_FAILURES_PER_USER
+        ):
+            logger.warning(f"Login rejected: too many failures - {username} from {client_ip}")
+            raise UnauthorizedException(msg="登录失败次数过多，请稍后再试")
+
         # 查找管理员用户（支持用户名或邮箱登录）
-        result = await self.db.execute(
-            select(AdminUser).where(
-                ((AdminUser.username == username) | (AdminUser.email == username)) &
-                (AdminUser.is_deleted == False)
-            )
-        )
+        result = await db.execute(_ADMIN_BY_LOGIN, {"login": username})
         user = result.scalar_one_or_none()
 
         if not user:
             logger.warning(f"Login failed: admin user not found - {username}")
+            await _record_login_failure(fail_key, user_fail_key)
             raise UnauthorizedException(msg="用户名或密码错误")
 
         # 验证密码
-        if not user.password_hash or not verify_password(password, user.password_hash):
+        if not user.password_hash or not await verify_password_async(password, user.password_hash):
             logger.warning(f"Login failed: wrong password - {username}")
+            await _record_login_failure(fail_key, user_fail_key)
             raise UnauthorizedException(msg="用户名或密码错误")
 
         # 检查用户状态
@@ -57,6 +103,9 @@ class AuthService:
             logger.warning(f"Login failed: admin user disabled - {username}")
             raise UnauthorizedException(msg="用户已被封禁")
 
+        if failures is not None or user_failures is not None:
+            await RedisCache.delete(fail_key, user_fail_key)
+
         token_data = {"sub": str(user.id)}
         # tid 写入 JWT（平台管理员为空时可省略或由前端忽略；服务端以数据库 AdminUser.tenant_id 为准）
         if user.tenant_id is not None:
@@ -74,22 +123,19 @@ class AuthService:
             "expires_in": settings.JWT_ADMIN_ACCESS_TOKEN_EXPIRE_HOURS * 3600  # 秒数
         }
     
-    async def get_user_by_token(self, user_id: int) -> AdminUser:
+    @staticmethod
+    async def get_user_by_token(db: AsyncSession, user_id: int) -> AdminUser:
         """
         根据用户ID获取管理员用户
         
         Args:
+            db: 异步数据库会话
             user_id: 用户ID
         
         Returns:
             管理员用户对象
         """
-        result = await self.db.execute(
-            select(AdminUser).where(
-                AdminUser.id == user_id,
-                AdminUser.is_deleted == False
-            )
-        )
+        result = await db.execute(_ADMIN_BY_ID, {"uid": user_id})
         user = result.scalar_one_or_none()
         
         if not user:
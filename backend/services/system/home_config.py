@@ -3,7 +3,8 @@ Home Config Service
 首页配置服务层
 """
 import json
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
@@ -18,6 +19,41 @@ from utils.exceptions import NotFoundException, BadRequestException
 from db.redis import get_redis
 
 
+# 全部配置的 Redis 哈希镜像：字段为 "{tenant_id}:{config_key}"，值为格式化后的配置 JSON
+HOME_CONFIG_HASH_KEY = "home_config:all"
+HOME_CONFIG_HASH_TTL = 3600
+# 哈希完整加载标记：仅写入单条配置产生的哈希不包含该字段，读取时视为未命中
+_HASH_LOADED_FIELD = "__loaded__"
+
+
+# 进程内读取缓存：小程序首页每次渲染都会读取配置，短 TTL 内直接复用解析结果，不访问数据库。
+# 配置更新时清空本进程缓存；其他 worker 进程最多在 TTL 后读到新值
+HOME_CONFIG_LOCAL_TTL = 30  # 秒
+_local_cache: Dict[Tuple[Optional[int], str], Tuple[float, Any]] = {}
+
+
+def get_local_config(scoped_tenant_id: Optional[int], key: str) -> Optional[Any]:
+    """读取进程内配置缓存，未命中或已过期返回 None"""
+    entry = _local_cache.get((scoped_tenant_id, key))
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _local_cache.pop((scoped_tenant_id, key), None)
+        return None
+    return value
+
+
+def set_local_config(scoped_tenant_id: Optional[int], key: str, value: Any) -> None:
+    """写入进程内配置缓存"""
+    _local_cache[(scoped_tenant_id, key)] = (time.monotonic() + HOME_CONFIG_LOCAL_TTL, value)
+
+
+def clear_local_config_cache() -> None:
+    """清空进程内配置缓存（配置变更后调用）"""
+    _local_cache.clear()
+
+
 class HomeConfigService:
     """首页配置服务类"""
     
@@ -80,21 +116,86 @@ class HomeConfigService:
         except Exception as e:
             logger.warning(f"Failed to delete config from cache: {e}")
     
+    async def _get_all_from_hash(self) -> Optional[List[dict]]:
+        """从 Redis 哈希读取全部配置，未命中或未完整加载时返回 None"""
+        try:
+            redis = await self._get_redis()
+            if redis:
+                data = await redis.hgetall(HOME_CONFIG_HASH_KEY)
+                if data and data.pop(_HASH_LOADED_FIELD, None) is not None:
+                    return [json.loads(v) for v in data.values()]
+        except Exception as e:
+            logger.warning(f"Failed to get configs from hash cache: {e}")
+        return None
+
+    async def _set_all_to_hash(self, configs: List[dict]):
+        """将全部配置写入 Redis 哈希"""
+        try:
+            redis = await self._get_redis()
+            if redis:
+                mapping = {
+                    f"{c['tenant_id']}:{c['config_key']}": json.dumps(c, ensure_ascii=False)
+                    for c in configs
+                }
+                mapping[_HASH_LOADED_FIELD] = "1"
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(HOME_CONFIG_HASH_KEY)
+                    pipe.hset(HOME_CONFIG_HASH_KEY, mapping=mapping)
+                    pipe.expire(HOME_CONFIG_HASH_KEY, HOME_CONFIG_HASH_TTL)
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to set configs to hash cache: {e}")
+
+    async def sync_hash_cache(self, configs: List[dict]):
+        """
+        将已提交的配置变更同步到 Redis 哈希
+
+        须在事务提交后调用，保证哈希中不会出现未提交的数据
+        """
+        if not configs:
+            return
+        try:
+            redis = await self._get_redis()
+            if redis:
+                await redis.hset(
+                    HOME_CONFIG_HASH_KEY,
+                    mapping={
+                        f"{c['tenant_id']}:{c['config_key']}": json.dumps(c, ensure_ascii=False)
+                        for c in configs
+                    },
+                )
+        except Exception as e:
+            logger.warning(f"Failed to sync configs to hash cache: {e}")
+
     async def get_all_configs(
-        self, *, scoped_tenant_id: Optional[int] = None
+        self,
+        *,
+        scoped_tenant_id: Optional[int] = None,
+        use_cache: bool = True,
     ) -> List[dict]:
         """
         获取配置列表
 
         scoped_tenant_id 非空时仅返回该租户配置；平台管理员为空时返回全部租户配置。
+        use_cache 为 True 时优先读取 Redis 哈希镜像（一次 HGETALL），未命中再查询数据库并回填。
         """
-        q = select(HomeConfig).order_by(HomeConfig.tenant_id, HomeConfig.config_key)
+        configs = await self._get_all_from_hash() if use_cache else None
+
+        if configs is None:
+            q = select(HomeConfig).order_by(HomeConfig.tenant_id, HomeConfig.config_key)
+            # 回填缓存时需加载全部租户配置，否则只按租户查询
+            if scoped_tenant_id is not None and not use_cache:
+                q = q.where(HomeConfig.tenant_id == scoped_tenant_id)
+            result = await self.db.execute(q)
+            configs = [self._format_config_response(config) for config in result.scalars().all()]
+            if use_cache:
+                await self._set_all_to_hash(configs)
+        else:
+            configs.sort(key=lambda c: (c["tenant_id"], c["config_key"]))
+
         if scoped_tenant_id is not None:
-            q = q.where(HomeConfig.tenant_id == scoped_tenant_id)
-        result = await self.db.execute(q)
-        configs = result.scalars().all()
-        
-        return [self._format_config_response(config) for config in configs]
+            configs = [c for c in configs if c["tenant_id"] == scoped_tenant_id]
+        return configs
     
     async def get_config_by_key(
         self,
@@ -197,6 +298,7 @@ class HomeConfigService:
             await self._set_to_cache(tid, config_key, config.config_value)
         else:
             await self._delete_from_cache(tid, config_key)
+        clear_local_config_cache()
         
         logger.info(f"Home config updated: {config_key} (tenant_id={tid})")
         
@@ -282,6 +384,7 @@ class HomeConfigService:
                 await self._set_to_cache(tid, config.config_key, config.config_value)
             else:
                 await self._delete_from_cache(tid, config.config_key)
+        clear_local_config_cache()
         
         logger.info(f"Batch updated {len(updated_configs)} home configs")
         
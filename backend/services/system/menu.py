@@ -2,17 +2,77 @@
 Menu Service
 菜单服务层
 """
+import time
 from collections import defaultdict
-from typing import List, Optional, Dict, Any, Set
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Set, Tuple
 from loguru import logger
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, exists
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from core.constants import PLATFORM_MENU_ROOT_NAME, admin_gets_unfiltered_menu_tree, is_full_menu_role
 from models.menu import Menu
 from schemas.menu import MenuCreate, MenuUpdate, MenuResponse
 from utils.exceptions import NotFoundException, BadRequestException
+from db.redis import RedisCache
+
+
+# 全量菜单（管理用）缓存，菜单增删改后清除
+CACHE_KEY_ALL_MENUS = "menu:all"
+ALL_MENUS_CACHE_TTL = 60
+
+# 菜单快照（进程内缓存）有效期（秒）：路由菜单树、角色菜单过滤均基于快照在内存中计算
+MENU_SNAPSHOT_TTL = 30
+
+
+@dataclass(slots=True)
+class _MenuNode:
+    """
+    菜单快照节点（仅包含建树与权限过滤所需字段，与数据库会话无关）
+
+    meta 由 Menu.to_meta_dict 预先生成并被所有请求的菜单树共享，只读，调用方不得修改
+    """
+    id: int
+    parent_id: Optional[int]
+    name: str
+    path: str
+    component: Optional[str]
+    redirect: Optional[str]
+    sort_order: int
+    is_hide: bool
+    is_enabled: bool
+    meta: Dict[str, Any]
+
+    @classmethod
+    def from_menu(cls, menu: Menu) -> "_MenuNode":
+        return cls(
+            id=int(menu.id),
+            parent_id=int(menu.parent_id) if menu.parent_id is not None else None,
+            name=menu.name,
+            path=menu.path,
+            component=menu.component,
+            redirect=menu.redirect,
+            sort_order=menu.sort_order,
+            is_hide=menu.is_hide,
+            is_enabled=menu.is_enabled,
+            meta=menu.to_meta_dict(),
+        )
+
+
+class _MenuSnapshot:
+    """全部菜单的只读快照（按 sort_order 排序）"""
+    __slots__ = ("nodes", "by_id", "children_by_parent")
+
+    def __init__(self, nodes: List[_MenuNode]):
+        self.nodes = nodes
+        self.by_id: Dict[int, _MenuNode] = {n.id: n for n in nodes}
+        self.children_by_parent: Dict[Optional[int], List[_MenuNode]] = defaultdict(list)
+        for n in nodes:
+            self.children_by_parent[n.parent_id].append(n)
+
+
+# (过期时间, 快照)；为 None 表示需要重新加载
+_snapshot_cache: Optional[Tuple[float, _MenuSnapshot]] = None
 
 
 class MenuService:
@@ -25,32 +85,38 @@ class MenuService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def _get_snapshot(self) -> "_MenuSnapshot":
+        """获取菜单快照（进程内缓存，过期或被清除后重新查询一次全部菜单）"""
+        global _snapshot_cache
+        now = time.monotonic()
+        if _snapshot_cache is not None and _snapshot_cache[0] > now:
+            return _snapshot_cache[1]
+
+        result = await self.db.execute(select(Menu).order_by(Menu.sort_order, Menu.id))
+        snapshot = _MenuSnapshot([_MenuNode.from_menu(m) for m in result.scalars().all()])
+        _snapshot_cache = (now + MENU_SNAPSHOT_TTL, snapshot)
+        return snapshot
+
     async def get_platform_menu_subtree_ids(self) -> Set[int]:
         """「系统管理」根菜单及其全部子孙菜单 ID（租户管理员须排除）。"""
-        result = await self.db.execute(select(Menu.id, Menu.parent_id, Menu.name))
-        rows = result.all()
-        root_ids = {int(r[0]) for r in rows if r[2] == PLATFORM_MENU_ROOT_NAME}
+        snapshot = await self._get_snapshot()
+        root_ids = {n.id for n in snapshot.nodes if n.name == PLATFORM_MENU_ROOT_NAME}
         if not root_ids:
             return set()
 
-        children_by_parent: Dict[int, List[int]] = defaultdict(list)
-        for mid, pid, _ in rows:
-            if pid is not None:
-                children_by_parent[int(pid)].append(int(mid))
-
         out: Set[int] = set(root_ids)
         stack = list(root_ids)
         while stack:
             cur = stack.pop()
-            for child in children_by_parent.get(cur, []):
-                if child not in out:
-                    out.add(child)
-                    stack.append(child)
+            for child in snapshot.children_by_parent.get(cur, []):
+                if child.id not in out:
+                    out.add(child.id)
+                    stack.append(child.id)
         return out
 
     async def get_all_enabled_menu_ids(self) -> Set[int]:
-        result = await self.db.execute(select(Menu.id).where(Menu.is_enabled == True))
-        return {int(x) for x in result.scalars().all()}
+        snapshot = await self._get_snapshot()
+        return {n.id for n in snapshot.nodes if n.is_enabled}
 
     async def resolve_admin_allowed_menu_ids(
         self,
@@ -82,17 +148,15 @@ class MenuService:
         """从若干菜单 id 沿 parent_id 走到根，得到路径上全部 id（用于把禁用父级也载入内存以便建树）。"""
         if not seed_ids:
             return set()
-        result = await self.db.execute(select(Menu.id, Menu.parent_id))
-        parent_map: Dict[int, Optional[int]] = {}
-        for mid, pid in result.all():
-            parent_map[int(mid)] = int(pid) if pid is not None else None
+        by_id = (await self._get_snapshot()).by_id
         out: Set[int] = set()
         for mid in seed_ids:
             cur: Optional[int] = int(mid)
             depth = 0
             while cur is not None and depth < 64:
                 out.add(cur)
-                cur = parent_map.get(cur)
+                node = by_id.get(cur)
+                cur = node.parent_id if node is not None else None
                 depth += 1
         return out
 
@@ -105,26 +169,17 @@ class MenuService:
         """
         if not allowed:
             return allowed
+        snapshot = await self._get_snapshot()
         out = set(allowed)
-        r1 = await self.db.execute(
-            select(Menu.parent_id).where(Menu.id.in_(allowed), Menu.parent_id.isnot(None))
-        )
-        parent_ids = {int(x) for x in r1.scalars().all() if x is not None}
-        if parent_ids:
-            r2 = await self.db.execute(
-                select(Menu.id).where(
-                    Menu.parent_id.in_(parent_ids),
-                    Menu.is_hide == True,
-                )
-            )
-            out.update(int(x) for x in r2.scalars().all())
-        r3 = await self.db.execute(
-            select(Menu.id).where(
-                Menu.parent_id.in_(allowed),
-                Menu.is_hide == True,
+        parent_ids = {
+            snapshot.by_id[mid].parent_id
+            for mid in allowed
+            if mid in snapshot.by_id and snapshot.by_id[mid].parent_id is not None
+        }
+        for pid in parent_ids | set(allowed):
+            out.update(
+                child.id for child in snapshot.children_by_parent.get(pid, []) if child.is_hide
             )
-        )
-        out.update(int(x) for x in r3.scalars().all())
         return out
     
     async def get_menu_tree(
@@ -135,7 +190,8 @@ class MenuService:
         """
         获取菜单树形结构
         
-        递归生成前端需要的树形菜单
+        递归生成前端需要的树形菜单；菜单数据来自进程内快照，
+        按角色过滤只在内存中进行，不再逐次查询数据库
         
         Args:
             include_hidden: 是否包含隐藏菜单
@@ -150,27 +206,20 @@ class MenuService:
             if len(allowed_menu_ids) > 0:
                 allowed_menu_ids = await self._expand_allowed_with_hidden_routes(allowed_menu_ids)
 
-        # 一次查出菜单并在内存建树（任意深度）
+        snapshot = await self._get_snapshot()
+
         # 按角色过滤时：必须把「授权菜单及其全部祖先」一并载入；若某级父菜单 is_enabled=false，
-        # 仅查启用菜单会导致子菜单从根不可达，整棵树为空（例如 menu_ids 含 [25,26] 仍无菜单）
+        # 仅取启用菜单会导致子菜单从根不可达，整棵树为空（例如 menu_ids 含 [25,26] 仍无菜单）
         if allowed_menu_ids is not None and len(allowed_menu_ids) > 0:
             chain_ids = await self._expand_to_ancestor_ids(allowed_menu_ids)
-            q = (
-                select(Menu)
-                .where(or_(Menu.is_enabled == True, Menu.id.in_(chain_ids)))
-                .order_by(Menu.sort_order)
-            )
+            all_menus = [n for n in snapshot.nodes if n.is_enabled or n.id in chain_ids]
         else:
-            q = select(Menu).where(Menu.is_enabled == True).order_by(Menu.sort_order)
-
-        result = await self.db.execute(q)
-        all_menus = list(result.scalars().all())
+            all_menus = [n for n in snapshot.nodes if n.is_enabled]
 
-        children_by_parent: Dict[Optional[int], List[Menu]] = defaultdict(list)
+        # 快照已按 sort_order 排序，分组后子列表保持有序
+        children_by_parent: Dict[Optional[int], List[_MenuNode]] = defaultdict(list)
         for m in all_menus:
             children_by_parent[m.parent_id].append(m)
-        for pid in children_by_parent:
-            children_by_parent[pid].sort(key=lambda x: x.sort_order)
 
         roots = children_by_parent.get(None, [])
         if not include_hidden:
@@ -188,8 +237,8 @@ class MenuService:
 
     def _build_menu_tree_from_map(
         self,
-        menu: Menu,
-        children_by_parent: Dict[Optional[int], List[Menu]],
+        menu: "_MenuNode",
+        children_by_parent: Dict[Optional[int], List["_MenuNode"]],
         include_hidden: bool = False,
         allowed_menu_ids: Optional[Set[int]] = None,
     ) -> Optional[Dict[str, Any]]:
@@ -213,10 +262,11 @@ class MenuService:
             if not menu.is_enabled:
                 return None
 
+        # meta 在快照构建时生成一次，各请求共享同一只读字典，不再逐次复制
         menu_dict = {
             "path": menu.path,
             "name": menu.name,
-            "meta": menu.to_meta_dict(),
+            "meta": menu.meta,
         }
 
         if menu.component:
@@ -231,27 +281,48 @@ class MenuService:
     
     async def get_all_menus(self) -> List[Dict[str, Any]]:
         """
-        获取所有菜单（用于管理后台）
+        获取所有菜单（用于管理后台，结果缓存 60 秒）
         
         Returns:
             List[Dict]: 所有菜单列表（树形结构）
         """
-        # 查询所有顶级菜单
-        query = select(Menu).where(
-            Menu.parent_id.is_(None)
-        ).order_by(Menu.sort_order).options(
-            selectinload(Menu.children).selectinload(Menu.children).selectinload(Menu.children)
-        )
-        
-        result = await self.db.execute(query)
-        menus = result.scalars().all()
-        
-        # 转换为管理格式
-        return [self._menu_to_admin_dict(menu) for menu in menus]
+        async def _fetch() -> List[Dict[str, Any]]:
+            # 一次查询全部菜单，在内存中按 parent_id 建树（任意深度，不依赖 children 关系加载）
+            result = await self.db.execute(select(Menu).order_by(Menu.sort_order, Menu.id))
+            children_by_parent: Dict[Optional[int], List[Menu]] = defaultdict(list)
+            for menu in result.scalars().all():
+                children_by_parent[menu.parent_id].append(menu)
+            
+            # 转换为管理格式
+            return [
+                self._menu_to_admin_dict(menu, children_by_parent)
+                for menu in children_by_parent.get(None, [])
+            ]
+
+        return await RedisCache.get_or_set(CACHE_KEY_ALL_MENUS, _fetch, expire=ALL_MENUS_CACHE_TTL)
+
+    @staticmethod
+    async def invalidate_cache() -> None:
+        """
+        清除菜单缓存（菜单增删改并提交事务后调用）
+
+        进程内快照只能清除当前进程，其他 worker 进程最多在 MENU_SNAPSHOT_TTL 秒后刷新
+        """
+        global _snapshot_cache
+        _snapshot_cache = None
+        await RedisCache.delete(CACHE_KEY_ALL_MENUS)
     
-    def _menu_to_admin_dict(self, menu: Menu) -> Dict[str, Any]:
+    def _menu_to_admin_dict(
+        self,
+        menu: Menu,
+        children_by_parent: Dict[Optional[int], List[Menu]],
+    ) -> Dict[str, Any]:
         """
         转换菜单为管理后台格式
+        
+        Args:
+            menu: 菜单对象
+            children_by_parent: parent_id -> 子菜单列表（已按 sort_order 排序）
         """
         menu_dict = {
             "id": menu.id,
@@ -273,10 +344,11 @@ class MenuService:
             "updatedAt": menu.updated_at.isoformat() if menu.updated_at else None,
         }
         
-        if menu.children:
+        children = children_by_parent.get(menu.id)
+        if children:
             menu_dict["children"] = [
-                self._menu_to_admin_dict(child)
-                for child in sorted(menu.children, key=lambda x: x.sort_order)
+                self._menu_to_admin_dict(child, children_by_parent)
+                for child in children
             ]
         
         return menu_dict
@@ -318,11 +390,9 @@ class MenuService:
         if data.parent_id:
             await self.get_menu_by_id(data.parent_id)
         
-        # 检查名称是否重复
-        existing = await self.db.execute(
-            select(Menu).where(Menu.name == data.name)
-        )
-        if existing.scalar_one_or_none():
+        # 检查名称是否重复（EXISTS 只返回布尔值，不加载整行菜单）
+        name_taken = await self.db.scalar(select(exists().where(Menu.name == data.name)))
+        if name_taken:
             raise BadRequestException(msg=f"菜单名称 '{data.name}' 已存在")
         
         # 创建菜单
@@ -355,10 +425,8 @@ class MenuService:
         
         # 检查名称是否重复
         if data.name and data.name != menu.name:
-            existing = await self.db.execute(
-                select(Menu).where(Menu.name == data.name)
-            )
-            if existing.scalar_one_or_none():
+            name_taken = await self.db.scalar(select(exists().where(Menu.name == data.name)))
+            if name_taken:
                 raise BadRequestException(msg=f"菜单名称 '{data.name}' 已存在")
         
         # 更新字段
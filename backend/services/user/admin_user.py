@@ -2,10 +2,13 @@
 AdminUser Service
 管理员用户管理服务
 """
+from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Tuple, Optional
-from sqlalchemy import select, func, and_, desc, asc
+from sqlalchemy import bindparam, select, update, func, and_, desc, asc
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 from loguru import logger
 
 from models.admin_user import AdminUser
@@ -15,7 +18,8 @@ from schemas.admin_user import (
     AdminUserUpdate,
     AdminUserQueryParams,
 )
-from core.security import hash_password
+from core.security import hash_password_async
+from core.auth_cache import invalidate_user_cache, invalidate_user_caches
 from utils.exceptions import (
     NotFoundException,
     BadRequestException,
@@ -26,6 +30,39 @@ from core.tenant_constants import DEFAULT_TENANT_ID
 from core.tenant_helpers import tenant_names_by_ids, ensure_tenant_id_exists
 
 
+@dataclass(slots=True)
+class AdminUserRow:
+    """
+    管理员用户响应数据
+
+    由 orjson / jsonable_encoder 按字段直接序列化；时间字段保留 datetime，
+    在序列化时编码为 ISO 8601 字符串，不再逐行调用 isoformat
+    """
+    id: int
+    username: str
+    email: Optional[str]
+    role_id: Optional[int]
+    role_name: Optional[str]
+    role_code: Optional[str]
+    is_active: bool
+    remark: Optional[str]
+    tenant_id: Optional[int]
+    tenant_name: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+# 按 ID 查询未删除管理员的语句在模块加载时构造一次，按参数绑定执行，
+# 避免每次调用重新构建表达式树，并稳定命中 SQLAlchemy 编译缓存
+_ADMIN_BY_ID = select(AdminUser).where(
+    AdminUser.id == bindparam("uid"),
+    AdminUser.is_deleted == False
+)
+
+# 详情查询：同时加载角色（多对一，JOIN 不会放大行数），其余关系禁止懒加载
+_ADMIN_WITH_ROLE_BY_ID = _ADMIN_BY_ID.options(joinedload(AdminUser.role), raiseload("*"))
+
+
 class AdminUserService(BaseService):
     """管理员用户管理服务类"""
     
@@ -38,9 +75,7 @@ class AdminUserService(BaseService):
         scoped_tenant_id: Optional[int],
     ) -> AdminUser:
         """租户管理员仅能操作归属同一租户的其他管理员账号；平台超管不传 tenant 限制。"""
-        result = await self.db.execute(
-            select(AdminUser).where(AdminUser.id == user_id, AdminUser.is_deleted == False)
-        )
+        result = await self.db.execute(_ADMIN_BY_ID, {"uid": user_id})
         u = result.scalar_one_or_none()
         if not u:
             raise NotFoundException(msg="管理员不存在")
@@ -48,29 +83,45 @@ class AdminUserService(BaseService):
             raise NotFoundException(msg="管理员不存在")
         return u
     
-    def _format_response(self, user: AdminUser, *, tenant_name: Optional[str] = None) -> dict:
-        """格式化用户响应数据"""
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "role_id": user.role_id,
-            "role_name": user.role.name if user.role else None,
-            "role_code": user.role.code if user.role else None,
-            "is_active": user.is_active,
-            "remark": user.remark,
-            "tenant_id": user.tenant_id,
-            "tenant_name": tenant_name,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
-        }
+    def _format_response(self, user: AdminUser, *, tenant_name: Optional[str] = None) -> AdminUserRow:
+        """
+        格式化用户响应数据
+
+        详情查询只预加载 role，其余关系均设置 raiseload（列表查询直接 JOIN 角色列，不加载任何关系）；
+        此处新增对其他关系的访问时需同步调整查询的加载选项，避免逐行懒加载
+        """
+        role = user.role
+        return self._build_row(user, role.name if role else None, role.code if role else None, tenant_name)
+
+    @staticmethod
+    def _build_row(
+        user: AdminUser,
+        role_name: Optional[str],
+        role_code: Optional[str],
+        tenant_name: Optional[str],
+    ) -> AdminUserRow:
+        """由用户对象与已查出的角色名称/代码构造响应数据"""
+        return AdminUserRow(
+            user.id,
+            user.username,
+            user.email,
+            user.role_id,
+            role_name,
+            role_code,
+            user.is_active,
+            user.remark,
+            user.tenant_id,
+            tenant_name,
+            user.created_at,
+            user.updated_at,
+        )
     
     async def get_users(
         self,
         params: AdminUserQueryParams,
         *,
         scoped_tenant_id: Optional[int] = None,
-    ) -> Tuple[List[dict], int]:
+    ) -> Tuple[List[AdminUserRow], int]:
         """
         获取管理员用户列表
         
@@ -98,47 +149,59 @@ class AdminUserService(BaseService):
         if params.is_active is not None:
             conditions.append(AdminUser.is_active == params.is_active)
         
-        # 查询总数
-        count_query = select(func.count(AdminUser.id)).where(and_(*conditions))
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
-        
-        # 查询数据（包含角色信息）
+        # 查询数据：角色仅需名称与代码，直接 LEFT JOIN 取列，不构造 Role 对象；
+        # 总数通过窗口函数 COUNT(*) OVER () 随分页数据一并返回，省去单独的计数查询
         query = (
-            select(AdminUser)
-            .options(selectinload(AdminUser.role))
+            select(AdminUser, Role.name, Role.code, func.count().over().label("total"))
+            .outerjoin(Role, AdminUser.role_id == Role.id)
+            .options(raiseload("*"))
             .where(and_(*conditions))
             .order_by(AdminUser.created_at.desc())
             .offset(params.offset)
             .limit(params.pageSize)
         )
         
-        result = await self.db.execute(query)
-        users = result.scalars().all()
+        rows = (await self.db.execute(query)).all()
+        if rows:
+            total = rows[0].total
+        elif params.offset:
+            # 页码超出范围时没有数据行可携带总数，回退为单独计数
+            count_query = select(func.count(AdminUser.id)).where(and_(*conditions))
+            total = (await self.db.execute(count_query)).scalar() or 0
+        else:
+            total = 0
 
-        tid_set = {u.tenant_id for u in users if u.tenant_id is not None}
+        tid_set = {row[0].tenant_id for row in rows if row[0].tenant_id is not None}
         names_map = await tenant_names_by_ids(self.db, tid_set)
 
         user_list = [
-            self._format_response(u, tenant_name=names_map.get(u.tenant_id) if u.tenant_id else None)
-            for u in users
+            self._build_row(
+                user,
+                role_name,
+                role_code,
+                names_map.get(user.tenant_id) if user.tenant_id else None,
+            )
+            for user, role_name, role_code, _ in rows
         ]
 
         return user_list, total
     
-    async def get_user_by_id(self, user_id: int, *, scoped_tenant_id: Optional[int] = None) -> dict:
+    async def get_user_by_id(self, user_id: int, *, scoped_tenant_id: Optional[int] = None) -> AdminUserRow:
         """
         根据ID获取管理员用户
         """
-        await self.require_admin_accessible(user_id, scoped_tenant_id)
-        user = await super().get_by_id(user_id, include_relations=[AdminUser.role])
+        # 一次查询同时完成存在性、租户范围校验与角色加载
+        result = await self.db.execute(_ADMIN_WITH_ROLE_BY_ID, {"uid": user_id})
+        user = result.scalar_one_or_none()
+        if not user or (scoped_tenant_id is not None and user.tenant_id != scoped_tenant_id):
+            raise NotFoundException(msg="管理员不存在")
         tn = None
         if user.tenant_id is not None:
             nm = await tenant_names_by_ids(self.db, {user.tenant_id})
             tn = nm.get(user.tenant_id)
         return self._format_response(user, tenant_name=tn)
     
-    async def create_user(self, user_data: AdminUserCreate, *, scoped_tenant_id: Optional[int] = None) -> dict:
+    async def create_user(self, user_data: AdminUserCreate, *, scoped_tenant_id: Optional[int] = None) -> AdminUserRow:
         """
         创建管理员用户
         
@@ -155,7 +218,8 @@ class AdminUserService(BaseService):
         if user_data.email:
             unique_fields["email"] = {"error_msg": "邮箱已被注册"}
         
-        # 验证角色是否存在
+        # 验证角色是否存在（查询结果同时作为新用户的角色关系，创建后无需再查询）
+        role = None
         if user_data.role_id:
             from utils.query import get_by_id
             role = await get_by_id(self.db, Role, user_data.role_id, error_msg="角色不存在")
@@ -172,9 +236,11 @@ class AdminUserService(BaseService):
             else:
                 target_tid = DEFAULT_TENANT_ID
 
+        password_hash = await hash_password_async(user_data.password)
+
         def before_create(user: AdminUser, data: AdminUserCreate):
             """创建前的钩子函数"""
-            user.password_hash = hash_password(data.password)
+            user.password_hash = password_hash
             user.tenant_id = target_tid
 
         def after_create(user: AdminUser):
@@ -190,7 +256,7 @@ class AdminUserService(BaseService):
         )
         
         await self.db.commit()
-        await self.db.refresh(user, ["role"])
+        set_committed_value(user, "role", role)
 
         tn = None
         if user.tenant_id is not None:
@@ -204,7 +270,7 @@ class AdminUserService(BaseService):
         user_data: AdminUserUpdate,
         *,
         scoped_tenant_id: Optional[int] = None,
-    ) -> dict:
+    ) -> AdminUserRow:
         """
         更新管理员用户信息
         """
@@ -216,26 +282,33 @@ class AdminUserService(BaseService):
             "email": {"error_msg": "邮箱已被注册"},
         }
         
+        # 仅读取显式传入的字段集合，不为校验再序列化一份字典
+        fields_set = user_data.model_fields_set
+
         # 验证角色是否存在
-        update_data = user_data.model_dump(exclude_unset=True)
-        if "role_id" in update_data and update_data["role_id"]:
+        role = None
+        if "role_id" in fields_set and user_data.role_id:
             from utils.query import get_by_id
-            role = await get_by_id(self.db, Role, update_data["role_id"], error_msg="角色不存在")
+            role = await get_by_id(self.db, Role, user_data.role_id, error_msg="角色不存在")
             if not role:
                 raise BadRequestException(msg="角色不存在")
 
         exclude_extra = ["password"]
         if scoped_tenant_id is not None:
             exclude_extra.append("tenant_id")
-        elif update_data.get("tenant_id") is not None:
-            await ensure_tenant_id_exists(self.db, update_data["tenant_id"])
+        elif user_data.tenant_id is not None:
+            await ensure_tenant_id_exists(self.db, user_data.tenant_id)
+
+        # 密码哈希在线程池中预先计算，钩子内只做赋值
+        password_hash = None
+        if user_data.password:
+            password_hash = await hash_password_async(user_data.password)
 
         def before_update(user: AdminUser, data: AdminUserUpdate):
             """更新前的钩子函数"""
             # 处理密码更新
-            update_data = data.model_dump(exclude_unset=True)
-            if "password" in update_data and update_data["password"]:
-                user.password_hash = hash_password(update_data["password"])
+            if password_hash:
+                user.password_hash = password_hash
         
         def after_update(user: AdminUser):
             """更新后的钩子函数"""
@@ -252,7 +325,12 @@ class AdminUserService(BaseService):
         )
         
         await self.db.commit()
-        await self.db.refresh(user, ["role"])
+        await invalidate_user_cache(user_id)
+        if "role_id" in fields_set:
+            # 角色已在校验时查询，直接作为关系值，省去一次查询
+            set_committed_value(user, "role", role)
+        else:
+            await self.db.refresh(user, ["role"])
 
         tn = None
         if user.tenant_id is not None:
@@ -260,19 +338,50 @@ class AdminUserService(BaseService):
             tn = nm.get(user.tenant_id)
         return self._format_response(user, tenant_name=tn)
 
+    def _scoped_update(self, user_ids: List[int], scoped_tenant_id: Optional[int]):
+        """构造限定在未删除且属于数据范围内的管理员上的 UPDATE 语句"""
+        stmt = update(AdminUser).where(AdminUser.id.in_(user_ids), AdminUser.is_deleted == False)
+        if scoped_tenant_id is not None:
+            stmt = stmt.where(AdminUser.tenant_id == scoped_tenant_id)
+        return stmt.execution_options(synchronize_session=False)
+
+    async def delete_users(self, user_ids: List[int], *, scoped_tenant_id: Optional[int] = None) -> int:
+        """
+        批量删除管理员用户（软删除）
+
+        一条 UPDATE 完成存在性、租户范围校验与删除，不逐条查询
+
+        Returns:
+            实际删除的数量
+        """
+        if not user_ids:
+            return 0
+        result = await self.db.execute(
+            self._scoped_update(user_ids, scoped_tenant_id).values(is_deleted=True)
+        )
+        await self.db.commit()
+        await invalidate_user_caches(user_ids)
+        logger.info(f"{self.resource_name} deleted (soft): {user_ids}, count={result.rowcount}")
+        return result.rowcount
+
     async def delete_user(self, user_id: int, *, scoped_tenant_id: Optional[int] = None) -> None:
         """
         删除管理员用户（软删除）
         """
-        await self.require_admin_accessible(user_id, scoped_tenant_id)
-        await super().delete(user_id, hard_delete=False)
-        await self.db.commit()
+        if not await self.delete_users([user_id], scoped_tenant_id=scoped_tenant_id):
+            raise NotFoundException(msg="管理员不存在")
     
     async def change_status(self, user_id: int, status: int, *, scoped_tenant_id: Optional[int] = None) -> None:
         """
-        修改管理员用户状态
+        修改管理员用户状态（单条 UPDATE，同时完成存在性与租户范围校验）
         """
-        await self.require_admin_accessible(user_id, scoped_tenant_id)
-        await super().change_status(user_id, status)
+        result = await self.db.execute(
+            self._scoped_update([user_id], scoped_tenant_id).values(is_active=status == 1)
+        )
+        if not result.rowcount:
+            raise NotFoundException(msg="管理员不存在")
         await self.db.commit()
+        await invalidate_user_cache(user_id)
+        status_text = "正常" if status == 1 else "封禁"
+        logger.info(f"{self.resource_name} status changed: {user_id} -> {status_text}")
 
@@ -4,12 +4,13 @@ User Service
 """
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Callable, List, Tuple, Optional, Dict, Any
 import secrets
 import string
 import hashlib
 
-from sqlalchemy import select, func, and_, desc, asc
+from sqlalchemy import select, func, and_, or_, exists, desc, asc
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from loguru import logger
@@ -21,7 +22,7 @@ from schemas.user import (
     UserUpdate,
     UserQueryParams,
 )
-from core.security import hash_password
+from core.security import hash_password_async
 from utils.exceptions import (
     NotFoundException,
     BadRequestException,
@@ -32,6 +33,10 @@ from core.tenant_constants import DEFAULT_TENANT_ID
 from core.tenant_helpers import tenant_names_by_ids, ensure_tenant_id_exists
 
 
+# 随机用户名冲突时的最大尝试次数
+GENERATED_USERNAME_ATTEMPTS = 3
+
+
 class UserService(BaseService):
     """用户管理服务类"""
     
@@ -83,8 +88,9 @@ class UserService(BaseService):
             "inviteCode": None,  # TODO: 生成邀请码逻辑
             "inviterId": str(user.parent_id) if user.parent_id else None,
             "inviterName": user.parent.username if user.parent else None,
-            "createTime": user.created_at.isoformat() if user.created_at else None,
-            "lastLoginTime": user.updated_at.isoformat() if user.updated_at else None,
+            # 时间字段保留 datetime，由 orjson / jsonable_encoder 编码为 ISO 8601 字符串
+            "createTime": user.created_at,
+            "lastLoginTime": user.updated_at,
             "status": 1 if user.is_active else 0,
         }
     
@@ -202,10 +208,12 @@ class UserService(BaseService):
             else:
                 target_tid = DEFAULT_TENANT_ID
 
+        password_hash = await hash_password_async(user_data.password)
+
         def before_create(user: User, data: UserCreate):
             """创建前的钩子函数"""
-            # 处理密码哈希
-            user.password_hash = hash_password(data.password)
+            # 处理密码哈希（已在线程池中预先计算）
+            user.password_hash = password_hash
             # 设置level_code
             user.level_code = data.level_code or "normal"
             user.tenant_id = target_tid
@@ -535,6 +543,41 @@ class UserService(BaseService):
         )
         return result.scalar_one_or_none()
     
+    async def has_blocked_wechat_identity(
+        self,
+        openid: Optional[str],
+        unionid: Optional[str] = None,
+    ) -> bool:
+        """
+        检查 openid/unionid 是否属于已删除或封禁用户（登录创建新用户前使用）
+        
+        一条 EXISTS 查询同时覆盖 openid 与 unionid，替代分别查询两次
+        
+        Args:
+            openid: 微信 openid
+            unionid: 微信 unionid（可选）
+        
+        Returns:
+            存在已删除/封禁的同 openid 或 unionid 用户时返回 True
+        """
+        identity_conditions = []
+        if openid:
+            identity_conditions.append(User.openid == openid)
+        if unionid:
+            identity_conditions.append(User.unionid == unionid)
+        if not identity_conditions:
+            return False
+        
+        result = await self.db.execute(
+            select(
+                exists().where(
+                    or_(*identity_conditions),
+                    or_(User.is_deleted == True, User.is_active == False),
+                )
+            )
+        )
+        return bool(result.scalar())
+    
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """
         通过用户名查找用户
@@ -571,12 +614,21 @@ class UserService(BaseService):
         )
         return result.scalar_one_or_none()
     
-    async def create_user_from_dict(self, user_data: dict) -> User:
+    async def create_user_from_dict(
+        self,
+        user_data: dict,
+        *,
+        username_factory: Optional[Callable[[], str]] = None,
+    ) -> User:
         """
         从字典创建用户（用于小程序登录等场景）
         
+        未指定 username 时由 username_factory 生成随机用户名，不预先查询是否重复：
+        依赖 username 唯一索引，插入冲突时在保存点内回滚并换一个用户名重试
+        
         Args:
             user_data: 用户数据字典
+            username_factory: 随机用户名生成函数（默认 user_ + 8 位十六进制）
         
         Returns:
             创建的用户对象
@@ -597,8 +649,7 @@ class UserService(BaseService):
         from core.tenant_constants import DEFAULT_TENANT_ID
 
         tid = user_data.get("tenant_id") or DEFAULT_TENANT_ID
-        user = User(
-            username=user_data.get("username") or f"user_{secrets.token_hex(4)}",
+        fields = dict(
             password_hash=user_data.get("password_hash"),
             tenant_id=int(tid),
             openid=user_data.get("openid"),
@@ -611,8 +662,23 @@ class UserService(BaseService):
             is_active=user_data.get("is_active", True),
         )
         
-        self.db.add(user)
-        await self.db.flush()
+        if user_data.get("username"):
+            user = User(username=user_data["username"], **fields)
+            self.db.add(user)
+            await self.db.flush()
+        else:
+            factory = username_factory or (lambda: f"user_{secrets.token_hex(4)}")
+            for attempt in range(GENERATED_USERNAME_ATTEMPTS):
+                user = User(username=factory(), **fields)
+                try:
+                    async with self.db.begin_nested():
+                        self.db.add(user)
+                    break
+                except IntegrityError:
+                    if attempt == GENERATED_USERNAME_ATTEMPTS - 1:
+                        raise
+                    logger.warning(f"Generated username collided, retrying: {user.username}")
+        
         await self.db.refresh(user)
         
         logger.info(f"User created from dict: {user.username} (openid: {user.openid})")
@@ -639,7 +705,7 @@ class UserService(BaseService):
         md5_password = hashlib.md5(new_password.encode('utf-8')).hexdigest()
 
         # 2. 对 MD5 密码进行 bcrypt 哈希存储
-        user.password_hash = hash_password(md5_password)
+        user.password_hash = await hash_password_async(md5_password)
 
         await self.db.flush()
 
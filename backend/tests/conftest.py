@@ -0,0 +1,99 @@
+"""
+测试公共夹具
+内存 SQLite（aiosqlite）建表工具与字典版 RedisCache，不依赖 MySQL 与 Redis
+"""
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db.redis import RedisCache
+
+
+class FakeRedisCache:
+    """字典版 RedisCache：值按字符串保存，与 decode_responses 的 Redis 一致"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, expire=3600):
+        self.store[key] = str(value)
+        return True
+
+    async def incr(self, key, expire=3600):
+        value = int(self.store.get(key, 0)) + 1
+        self.store[key] = str(value)
+        return value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+        return True
+
+
+@pytest.fixture
+def fake_redis_cache(monkeypatch):
+    """以 FakeRedisCache 替换 RedisCache 的读写方法（各模块导入的是同一个类）"""
+    cache = FakeRedisCache()
+    for name in ("get", "set", "incr", "delete"):
+        monkeypatch.setattr(RedisCache, name, getattr(cache, name))
+    return cache
+
+
+@pytest.fixture
+def sqlite_db():
+    """
+    内存 SQLite 执行器工厂
+
+    用法：
+        run = sqlite_db([Tenant.__table__, Agent.__table__], seed=lambda: [Tenant(id=1, ...)])
+        run(scenario)  # 建表、写入种子数据后执行 scenario(session_maker)
+
+    seed 为返回 ORM 对象列表的函数（每次执行都需要新的实例）；
+    skip_indexes 指定不创建的索引名，用于模拟尚未执行索引迁移的库
+    """
+    pytest.importorskip("aiosqlite")
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.schema import CreateIndex, CreateTable
+
+    import models  # noqa: F401  注册全部模型
+
+    def factory(tables, seed=None):
+        def run(coro_fn, *, skip_indexes=()):
+            async def main():
+                engine = create_async_engine("sqlite+aiosqlite://")
+                async with engine.begin() as conn:
+                    for table in tables:
+                        # MySQL 的 BIGINT 主键在 SQLite 中不会自增，改写为 INTEGER PRIMARY KEY
+                        ddl = str(CreateTable(table).compile(engine.sync_engine))
+                        ddl = ddl.replace("id BIGINT NOT NULL", "id INTEGER PRIMARY KEY AUTOINCREMENT")
+                        ddl = re.sub(r",\s*PRIMARY KEY \(id\)", "", ddl)
+                        await conn.execute(text(ddl))
+                        for index in table.indexes:
+                            if index.name not in skip_indexes:
+                                await conn.execute(CreateIndex(index))
+                session_maker = async_sessionmaker(engine, expire_on_commit=False)
+                if seed is not None:
+                    async with session_maker() as session:
+                        session.add_all(seed())
+                        await session.commit()
+                try:
+                    return await coro_fn(session_maker)
+                finally:
+                    await engine.dispose()
+
+            return asyncio.run(main())
+
+        return run
+
+    return factory
@@ -0,0 +1,42 @@
+"""
+后台鉴权依赖注解测试
+鉴权依赖返回 AuthedAdmin 身份快照，路由参数不得标注为 ORM 模型 AdminUser
+"""
+import inspect
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.params import Depends
+from fastapi.routing import APIRoute, iter_route_contexts
+
+from core import deps
+from core.deps import AuthedAdmin
+from main import app
+
+_ADMIN_DEPENDENCIES = {
+    deps.get_current_user,
+    deps.get_current_active_user,
+    deps.get_current_admin,
+    deps.require_platform_admin,
+}
+
+
+def test_admin_dependencies_annotated_as_authed_admin():
+    """依赖管理员鉴权的路由参数均标注为 AuthedAdmin"""
+    checked = 0
+    wrong = []
+    for context in iter_route_contexts(app.routes):
+        route = context.route
+        if not isinstance(route, APIRoute):
+            continue
+        for name, param in inspect.signature(route.endpoint).parameters.items():
+            default = param.default
+            if isinstance(default, Depends) and default.dependency in _ADMIN_DEPENDENCIES:
+                checked += 1
+                if param.annotation is not AuthedAdmin:
+                    wrong.append(f"{context.path_format} {name}: {param.annotation}")
+    assert checked > 0
+    assert not wrong, "\n".join(wrong)
@@ -0,0 +1,148 @@
+"""
+后台登录失败限流单元测试
+按「用户名 + 客户端 IP」计数并按用户名设总上限，不依赖数据库与 Redis
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bcrypt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.config import settings
+from db import get_db
+from routers.admin import auth as auth_router
+from models.admin_user import AdminUser
+from services.system.auth import AuthService
+from utils.exceptions import UnauthorizedException, register_exception_handlers
+
+
+class _FakeResult:
+    def __init__(self, user):
+        self._user = user
+
+    def scalar_one_or_none(self):
+        return self._user
+
+
+class _FakeDB:
+    """仅支持 login 中的单条查询"""
+
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+
+    async def execute(self, *args, **kwargs):
+        self.queries += 1
+        return _FakeResult(self.user)
+
+
+def _admin(password: str) -> AdminUser:
+    # 低成本因子生成哈希，避免测试耗时
+    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+    return AdminUser(id=1, username="admin", password_hash=password_hash, is_active=True, tenant_id=None)
+
+
+def _login(db, password, ip):
+    return asyncio.run(AuthService.login(db, "admin", password, client_ip=ip))
+
+
+def test_lockout_is_scoped_to_client_ip(fake_redis_cache):
+    """同一 IP 连续失败达到上限后被拒绝，其他 IP 不受影响"""
+    db = _FakeDB(_admin("right"))
+
+    for _ in range(settings.ADMIN_LOGIN_MAX_FAILURES):
+        with pytest.raises(UnauthorizedException) as exc:
+            _login(db, "wrong", "1.1.1.1")
+        assert exc.value.msg == "用户名或密码错误"
+
+    queries = db.queries
+    with pytest.raises(UnauthorizedException) as exc:
+        _login(db, "right", "1.1.1.1")
+    assert exc.value.msg == "登录失败次数过多，请稍后再试"
+    # 锁定期内不再访问数据库
+    assert db.queries == queries
+
+    tokens = _login(db, "right", "2.2.2.2")
+    assert tokens["access_token"]
+
+
+def test_success_clears_failure_count(fake_redis_cache):
+    """登录成功后清除该来源的失败计数"""
+    db = _FakeDB(_admin("right"))
+
+    with pytest.raises(UnauthorizedException):
+        _login(db, "wrong", "1.1.1.1")
+    assert fake_redis_cache.store
+
+    _login(db, "right", "1.1.1.1")
+    assert not fake_redis_cache.store
+
+
+def test_unknown_username_counts_per_ip(fake_redis_cache):
+    """不存在的用户名同样计数，但仅锁定发起尝试的 IP"""
+    db = _FakeDB(None)
+
+    for _ in range(settings.ADMIN_LOGIN_MAX_FAILURES):
+        with pytest.raises(UnauthorizedException):
+            _login(db, "x", "3.3.3.3")
+
+    assert fake_redis_cache.store == {
+        "auth:login_fail:admin:3.3.3.3": str(settings.ADMIN_LOGIN_MAX_FAILURES),
+        "auth:login_fail:admin": str(settings.ADMIN_LOGIN_MAX_FAILURES),
+    }
+
+
+def test_username_cap_applies_across_ips(fake_redis_cache):
+    """每次换一个 IP 也会在用户名累计失败达到上限后被锁定"""
+    db = _FakeDB(_admin("right"))
+
+    for i in range(settings.ADMIN_LOGIN_MAX_FAILURES_PER_USER):
+        with pytest.raises(UnauthorizedException) as exc:
+            _login(db, "wrong", f"10.0.{i // 256}.{i % 256}")
+        assert exc.value.msg == "用户名或密码错误"
+
+    with pytest.raises(UnauthorizedException) as exc:
+        _login(db, "right", "10.1.0.1")
+    assert exc.value.msg == "登录失败次数过多，请稍后再试"
+
+
+def _login_client(db) -> TestClient:
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(auth_router.router, prefix="/auth")
+
+    async def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("proxy_headers", [
+    # Nginx 以 $remote_addr 覆盖 X-Real-IP，并把真实地址追加到客户端自带的 X-Forwarded-For 之后
+    lambda forged: {"X-Real-IP": "5.5.5.5", "X-Forwarded-For": f"{forged}, 5.5.5.5"},
+    # 仅有 X-Forwarded-For 时取最右侧一跳
+    lambda forged: {"X-Forwarded-For": f"{forged}, 5.5.5.5"},
+])
+def test_rotating_forwarded_for_does_not_reset_lockout(fake_redis_cache, monkeypatch, proxy_headers):
+    """每次请求伪造不同的 X-Forwarded-For 仍按代理写入的地址计数并锁定"""
+    monkeypatch.setattr(settings, "TRUST_PROXY_HEADERS", True)
+    client = _login_client(_FakeDB(_admin("right")))
+
+    for i in range(settings.ADMIN_LOGIN_MAX_FAILURES + 1):
+        response = client.post(
+            "/auth/login",
+            json={"username": "admin", "password": "wrong"},
+            headers=proxy_headers(f"203.0.113.{i}"),
+        )
+        # 业务异常以 HTTP 200 返回，错误码在响应体中
+        assert response.json()["code"] == 401
+
+    assert response.json()["msg"] == "登录失败次数过多，请稍后再试"
+    assert fake_redis_cache.store["auth:login_fail:admin:5.5.5.5"] == str(settings.ADMIN_LOGIN_MAX_FAILURES)
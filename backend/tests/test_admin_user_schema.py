@@ -0,0 +1,39 @@
+"""
+管理员用户 Schema 测试
+邮箱字段使用 EmailStr：拒绝非法地址、规范化域名、空字符串视为未填
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from pydantic import ValidationError
+
+from schemas.admin_user import AdminUserCreate, AdminUserUpdate
+
+
+@pytest.mark.parametrize("email", [
+    "plainaddress",
+    "user@@example.com",
+    "user@example..com",
+    "user@-example.com",
+    "user name@example.com",
+])
+def test_invalid_email_rejected(email):
+    """不合法的邮箱地址校验失败"""
+    with pytest.raises(ValidationError):
+        AdminUserUpdate(email=email)
+
+
+def test_email_domain_normalized():
+    """域名部分转为小写"""
+    user = AdminUserCreate(username="admin", password="secret1", email="Admin@Example.COM")
+    assert user.email == "Admin@example.com"
+
+
+@pytest.mark.parametrize("email", ["", "   ", None])
+def test_blank_email_treated_as_none(email):
+    """空字符串视为未填邮箱"""
+    assert AdminUserUpdate(email=email).email is None
@@ -0,0 +1,106 @@
+"""
+管理员用户服务测试
+使用内存 SQLite（aiosqlite）验证批量软删除的存在性与租户范围校验，不依赖 MySQL 与 Redis
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select
+
+from models.admin_user import AdminUser
+from models.role import Role
+from models.tenant import Tenant
+from services.user import admin_user as admin_user_module
+from services.user.admin_user import AdminUserService
+from utils.exceptions import NotFoundException
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    """记录被清除身份缓存的用户 ID（替代 Redis）"""
+    calls = []
+
+    async def fake_invalidate(user_ids, kind="admin"):
+        calls.append(list(user_ids))
+
+    monkeypatch.setattr(admin_user_module, "invalidate_user_caches", fake_invalidate)
+    return calls
+
+
+def _seed():
+    """两个租户的管理员，其中 4 号已删除"""
+    return [
+        Tenant(id=1, name="租户一", code="t1"),
+        Tenant(id=2, name="租户二", code="t2"),
+        AdminUser(id=1, username="a1", tenant_id=1),
+        AdminUser(id=2, username="a2", tenant_id=1),
+        AdminUser(id=3, username="b1", tenant_id=2),
+        AdminUser(id=4, username="gone", tenant_id=1, is_deleted=True),
+    ]
+
+
+@pytest.fixture
+def run(sqlite_db):
+    return sqlite_db([Tenant.__table__, Role.__table__, AdminUser.__table__], seed=_seed)
+
+
+async def _deleted_ids(session_maker):
+    async with session_maker() as session:
+        result = await session.execute(select(AdminUser.id).where(AdminUser.is_deleted == True))
+        return sorted(result.scalars())
+
+
+def test_delete_users_soft_deletes_existing(run, invalidated):
+    """仅删除存在且未删除的用户，返回实际删除数量并清除缓存"""
+
+    async def scenario(session_maker):
+        async with session_maker() as session:
+            count = await AdminUserService(session).delete_users([1, 3, 4, 99])
+        assert count == 2
+        assert await _deleted_ids(session_maker) == [1, 3, 4]
+
+    run(scenario)
+    assert invalidated == [[1, 3, 4, 99]]
+
+
+def test_delete_users_respects_tenant_scope(run, invalidated):
+    """租户管理员无法删除其他租户的用户"""
+
+    async def scenario(session_maker):
+        async with session_maker() as session:
+            count = await AdminUserService(session).delete_users([2, 3], scoped_tenant_id=1)
+        assert count == 1
+        assert await _deleted_ids(session_maker) == [2, 4]
+
+    run(scenario)
+
+
+def test_delete_users_empty_list(run, invalidated):
+    """空列表不执行 UPDATE"""
+
+    async def scenario(session_maker):
+        async with session_maker() as session:
+            assert await AdminUserService(session).delete_users([]) == 0
+
+    run(scenario)
+    assert invalidated == []
+
+
+def test_delete_user_not_found(run, invalidated):
+    """单个删除时目标不存在、已删除或超出租户范围均视为不存在"""
+
+    async def scenario(session_maker):
+        for user_id, scope in ((99, None), (4, None), (3, 1)):
+            async with session_maker() as session:
+                with pytest.raises(NotFoundException):
+                    await AdminUserService(session).delete_user(user_id, scoped_tenant_id=scope)
+        assert await _deleted_ids(session_maker) == [4]
+
+    run(scenario)
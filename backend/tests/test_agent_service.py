@@ -0,0 +1,170 @@
+"""
+智能体管理服务测试
+使用内存 SQLite（aiosqlite）验证名称唯一性、游标分页，不依赖 MySQL 与 Redis
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.exc import IntegrityError
+
+from models.agent import Agent
+from models.tenant import Tenant
+from core import agent_cache
+from schemas.agent import AgentCreate, AgentQueryParams, AgentUpdate
+from services.agent import AgentService
+from utils.exceptions import BadRequestException
+
+# services/agent.py 以独立模块加载，通过方法的全局命名空间访问其模块级对象
+_agent_module = AgentService.create_agent.__globals__
+
+
+async def _noop(*args, **kwargs):
+    return None
+
+
+@pytest.fixture
+def run(sqlite_db):
+    """在带 agents/tenants 表的内存 SQLite 上执行 scenario(session_maker)"""
+    return sqlite_db(
+        [Tenant.__table__, Agent.__table__],
+        seed=lambda: [Tenant(id=1, name="默认租户", code="default")],
+    )
+
+
+def _skip_name_index(with_index: bool) -> tuple:
+    # 模拟尚未执行名称唯一索引迁移的库
+    return () if with_index else ("ix_agents_name",)
+
+
+def _agent(name: str) -> AgentCreate:
+    return AgentCreate(name=name, icon="icon", systemPrompt="prompt", model="model")
+
+
+async def _create(session_maker, name: str) -> Agent:
+    async with session_maker() as session:
+        agent = await AgentService(session).create_agent(_agent(name))
+        await session.commit()
+        return agent
+
+
+@pytest.mark.parametrize("with_index", [True, False])
+def test_duplicate_name_rejected_on_create(run, with_index):
+    """创建同名智能体被拒绝（未执行唯一索引迁移时由写入前查询兜底）"""
+
+    async def scenario(session_maker):
+        await _create(session_maker, "写作助手")
+        with pytest.raises(BadRequestException, match="已存在"):
+            await _create(session_maker, "写作助手")
+
+    run(scenario, skip_indexes=_skip_name_index(with_index))
+
+
+@pytest.mark.parametrize("with_index", [True, False])
+def test_rename_to_existing_name_rejected(run, with_index):
+    """改名为已存在的名称被拒绝，改为新名称正常"""
+
+    async def scenario(session_maker):
+        await _create(session_maker, "写作助手")
+        other = await _create(session_maker, "翻译助手")
+        async with session_maker() as session:
+            with pytest.raises(BadRequestException, match="已存在"):
+                await AgentService(session).update_agent(other.id, AgentUpdate(name="写作助手"))
+        async with session_maker() as session:
+            renamed = await AgentService(session).update_agent(other.id, AgentUpdate(name="润色助手"))
+            assert renamed.name == "润色助手"
+
+    run(scenario, skip_indexes=_skip_name_index(with_index))
+
+
+def test_unique_index_catches_concurrent_insert(run, monkeypatch):
+    """同名查询之后的并发插入由唯一索引拦截，转换为相同的业务异常"""
+    monkeypatch.setattr("utils.query.check_unique", _noop)
+
+    async def scenario(session_maker):
+        await _create(session_maker, "写作助手")
+        with pytest.raises(BadRequestException, match="已存在"):
+            await _create(session_maker, "写作助手")
+
+    run(scenario)
+
+
+def _integrity_error(*args) -> IntegrityError:
+    return IntegrityError("INSERT INTO agents ...", {}, Exception(*args))
+
+
+def test_mysql_name_conflict_detection():
+    """MySQL 仅错误码 1062 且为名称索引时视为名称重复"""
+    is_conflict = _agent_module["_is_agent_name_conflict"]
+    assert is_conflict(_integrity_error(1062, "Duplicate entry 'a' for key 'agents.ix_agents_name'"))
+    assert not is_conflict(_integrity_error(1062, "Duplicate entry '1' for key 'agents.PRIMARY'"))
+    assert not is_conflict(_integrity_error(1452, "Cannot add or update a child row: ix_agents_name"))
+
+
+def test_count_cache_invalidated_after_commit(run, fake_redis_cache):
+    """写操作本身不失效总数缓存，提交后递增缓存代号，列表总数重新统计"""
+    cache = fake_redis_cache
+
+    async def scenario(session_maker):
+        await _create(session_maker, "写作助手")
+        async with session_maker() as session:
+            assert (await AgentService(session).get_agent_list(AgentQueryParams())).total == 1
+
+        await _create(session_maker, "翻译助手")
+        # 服务方法内不递增代号，避免提交前到达的列表请求把旧总数缓存到新代号下
+        assert agent_cache.AGENT_COUNT_GEN_KEY not in cache.store
+        async with session_maker() as session:
+            assert (await AgentService(session).get_agent_list(AgentQueryParams())).total == 1
+
+        await AgentService.invalidate_count_cache()
+        async with session_maker() as session:
+            assert (await AgentService(session).get_agent_list(AgentQueryParams())).total == 2
+
+    run(scenario)
+
+
+def test_cursor_round_trip():
+    """游标编码后可还原排序键（sort_order, created_at, id）"""
+    agent = Agent(id=42, sort_order=3, created_at=datetime(2026, 1, 2, 3, 4, 5, 678000))
+    cursor = _agent_module["encode_agent_cursor"](agent)
+    assert _agent_module["decode_agent_cursor"](cursor) == (3, datetime(2026, 1, 2, 3, 4, 5, 678000), 42)
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "bm90LWEtY3Vyc29y", "MTpub3QtYS1kYXRlOjE="])
+def test_invalid_cursor_rejected(cursor):
+    """非法游标（非 base64、缺少字段、时间格式错误）返回业务异常"""
+    with pytest.raises(BadRequestException, match="游标"):
+        _agent_module["decode_agent_cursor"](cursor)
+
+
+def test_cursor_walk_matches_offset_listing(run):
+    """按游标逐页读取的结果与一次性偏移分页完全一致（排序键存在重复值）"""
+
+    async def scenario(session_maker):
+        base = datetime(2026, 1, 1)
+        async with session_maker() as session:
+            for i in range(23):
+                session.add(Agent(
+                    name=f"agent-{i}", icon="icon", system_prompt="prompt", model="model",
+                    sort_order=i % 3, created_at=base + timedelta(minutes=i % 5),
+                ))
+            await session.commit()
+        async with session_maker() as session:
+            service = AgentService(session)
+            full = await service.get_agent_list(AgentQueryParams(pageNum=1, pageSize=100))
+            page = await service.get_agent_list(AgentQueryParams(pageNum=1, pageSize=5))
+            walked = [agent.id for agent in page.list]
+            while page.nextCursor:
+                page = await service.get_agent_list(AgentQueryParams(pageSize=5, cursor=page.nextCursor))
+                walked += [agent.id for agent in page.list]
+        assert walked == [agent.id for agent in full.list]
+        assert len(walked) == 23
+
+    run(scenario)
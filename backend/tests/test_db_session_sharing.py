@@ -0,0 +1,86 @@
+"""
+请求内数据库会话共享测试
+鉴权依赖与路由以默认 scope 声明 get_db 时只创建一个会话，不依赖真实数据库
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+import db.session as db_session
+from core import deps
+from core.security import create_access_token
+from db import get_db
+
+
+class _FakeSession:
+    """记录创建次数的会话替身（无写入，get_db 不会提交）"""
+
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+        self.new = self.dirty = self.deleted = ()
+        self.info = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def _build_app(route_db_dependency):
+    seen = {}
+
+    async def load_user(db, uid):
+        seen["auth"] = db
+        return uid
+
+    current_user = deps._make_current_user_dep(load_user)
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe(user=Depends(current_user), db=route_db_dependency):
+        seen["route"] = db
+        return {"user": user}
+
+    return app, seen
+
+
+def test_auth_and_route_share_one_session(monkeypatch):
+    """默认 scope 下鉴权依赖与路由拿到同一个会话"""
+    monkeypatch.setattr(db_session, "async_session_maker", _FakeSession)
+    monkeypatch.setattr(_FakeSession, "created", 0)
+
+    app, seen = _build_app(Depends(get_db))
+    token = create_access_token({"sub": "1"})
+    response = TestClient(app).get("/probe", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert seen["auth"] is seen["route"]
+    assert _FakeSession.created == 1
+
+
+def test_function_scope_opens_second_session(monkeypatch):
+    """路由改用 scope="function" 时缓存键不同，会额外创建一个会话"""
+    monkeypatch.setattr(db_session, "async_session_maker", _FakeSession)
+    monkeypatch.setattr(_FakeSession, "created", 0)
+
+    app, seen = _build_app(Depends(get_db, scope="function"))
+    token = create_access_token({"sub": "1"})
+    response = TestClient(app).get("/probe", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert seen["auth"] is not seen["route"]
+    assert _FakeSession.created == 2
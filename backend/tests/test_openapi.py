@@ -0,0 +1,41 @@
+"""
+OpenAPI 文档测试
+使用 json_body 依赖读取请求体的路由仍需在文档中给出 requestBody
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.routing import APIRoute, iter_route_contexts
+
+from main import app
+
+
+def _json_body_routes():
+    """收集依赖中包含 json_body 的路由及其请求体模型"""
+    # 子路由以嵌套方式挂载，按 OpenAPI 生成时相同的方式展开（path_format 为带完整前缀的路径）
+    for context in iter_route_contexts(app.routes):
+        route = context.route
+        if not isinstance(route, APIRoute):
+            continue
+        for dependant in route.dependant.dependencies:
+            model = getattr(dependant.call, "json_body_model", None)
+            if model is not None:
+                yield context.path_format, route.methods, model
+
+
+def test_json_body_routes_document_request_body():
+    """每个 json_body 路由的文档都包含与模型字段一致、不含悬空引用的请求体 schema"""
+    spec = app.openapi()
+    routes = list(_json_body_routes())
+    assert len(routes) >= 6
+
+    for path, methods, model in routes:
+        for method in methods:
+            operation = spec["paths"][path][method.lower()]
+            assert "requestBody" in operation, f"{method} {path} 缺少 requestBody"
+            schema = operation["requestBody"]["content"]["application/json"]["schema"]
+            assert set(schema["properties"]) == set(model.model_json_schema()["properties"])
+            assert "$defs" not in str(schema)
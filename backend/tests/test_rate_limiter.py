@@ -0,0 +1,252 @@
+"""
+API 限流中间件单元测试
+以内存实现的 Redis 替身执行滑动窗口计数，不依赖真实 Redis
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import orjson
+import pytest
+
+from middleware import rate_limiter
+from middleware.rate_limiter import (
+    ABNORMAL_USERS_KEY,
+    RATE_LIMIT_MAX_CALLS,
+    RateLimiter,
+)
+
+
+class _FakePipeline:
+    """记录命令，execute 时依次在 _FakeRedis 上执行"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def evalsha(self, sha, numkeys, *args):
+        self.commands.append(("evalsha", args))
+
+    def lpush(self, key, value):
+        self.commands.append(("lpush", (key, value)))
+
+    def ltrim(self, key, start, end):
+        self.commands.append(("ltrim", (key, start, end)))
+
+    async def execute(self, raise_on_error=True):
+        self.redis.round_trips += 1
+        return [getattr(self.redis, f"_{name}")(*args) for name, args in self.commands]
+
+
+class _FakeRedis:
+    """按滑动窗口脚本的语义在内存中计数"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+        self.round_trips = 0
+        self.evals = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def script_load(self, script):
+        self.round_trips += 1
+
+    async def lrange(self, key, start, end):
+        self.round_trips += 1
+        return self.lists.get(key, [])[start:end + 1]
+
+    def _evalsha(self, key, abnormal_key, now, window, expire, max_calls, record_limit, user_id, endpoint, ip):
+        self.evals += 1
+        buckets = self.hashes.setdefault(key, {})
+        buckets[now] = buckets.get(now, 0) + 1
+        for ts in [ts for ts in buckets if ts <= now - window]:
+            del buckets[ts]
+        count = sum(buckets.values())
+        if count > max_calls:
+            self._lpush(abnormal_key, orjson.dumps({
+                "user_id": user_id,
+                "call_count": count,
+                "endpoint": endpoint,
+                "ip_address": ip,
+                "timestamp": now,
+            }))
+            self._ltrim(abnormal_key, 0, record_limit - 1)
+        return count
+
+    def _lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def _ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:end + 1]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get_redis():
+        return redis
+
+    monkeypatch.setattr(rate_limiter, "get_redis", _get_redis)
+    return redis
+
+
+def test_abnormal_record_written_only_when_exceeded(fake_redis):
+    """未超限的请求不写异常记录，超限时写入一条包含实际次数的记录"""
+
+    async def run():
+        results = []
+        for _ in range(RATE_LIMIT_MAX_CALLS + 1):
+            results.append(await RateLimiter.check_and_increment(7, "/api/x", "1.1.1.1"))
+        return results
+
+    results = asyncio.run(run())
+    assert all(not exceeded for exceeded, _ in results[:-1])
+    assert results[-1] == (True, RATE_LIMIT_MAX_CALLS + 1)
+
+    records = fake_redis.lists[ABNORMAL_USERS_KEY]
+    assert len(records) == 1
+    record = orjson.loads(records[0])
+    assert record["user_id"] == 7
+    assert record["call_count"] == RATE_LIMIT_MAX_CALLS + 1
+    assert record["ip_address"] == "1.1.1.1"
+    # 异常记录由计数脚本写入：每次请求一次往返，超限请求没有额外命令
+    assert fake_redis.round_trips == fake_redis.evals == RATE_LIMIT_MAX_CALLS + 1
+
+
+def test_sliding_window_lua_script():
+    """在支持 Lua 的 fakeredis 上执行真实脚本：窗口计数、超限时写入异常记录"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    def params(now):
+        # 上限 2 次、保留 2 条记录
+        return (2, "rate_limit:1", ABNORMAL_USERS_KEY, now, 60, 70, 2, 2, 1, "/api/x", "1.1.1.1")
+
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        counts = [await redis.eval(rate_limiter._SLIDING_WINDOW_LUA, *params(100)) for _ in range(4)]
+        records = await redis.lrange(ABNORMAL_USERS_KEY, 0, -1)
+        # 窗口外的秒桶被删除，不计入次数
+        later = await redis.eval(rate_limiter._SLIDING_WINDOW_LUA, *params(161))
+        return counts, records, later
+
+    counts, records, later = asyncio.run(run())
+    assert counts == [1, 2, 3, 4]
+    assert later == 1
+    assert [orjson.loads(r)["call_count"] for r in records] == [4, 3]
+    record = orjson.loads(records[0])
+    assert record == {
+        "user_id": 1,
+        "call_count": 4,
+        "endpoint": "/api/x",
+        "ip_address": "1.1.1.1",
+        "reason": "1分钟内调用API 4 次，超过限制 2 次",
+        "timestamp": 100,
+    }
+
+
+def test_concurrent_counts_share_one_round_trip(fake_redis):
+    """同一轮事件循环内的并发计数合并为一次 Pipeline，单个请求不等待固定窗口"""
+
+    async def run():
+        await asyncio.gather(*(
+            RateLimiter.check_and_increment(uid, "/api/x") for uid in range(1, 11)
+        ))
+        batched = fake_redis.round_trips
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await RateLimiter.check_and_increment(99, "/api/x")
+        return batched, loop.time() - started
+
+    batched, single_latency = asyncio.run(run())
+    assert batched == 1
+    assert single_latency < 0.002
+
+
+def _request(token: str):
+    from starlette.requests import Request
+
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/x",
+        "query_string": b"",
+        "headers": [(b"host", b"test"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("1.1.1.1", 1234),
+        "server": ("test", 80),
+        "scheme": "http",
+    })
+
+
+def test_locally_admitted_requests_are_counted(fake_redis, monkeypatch):
+    """本地放行的请求同样计入共享窗口，超过上限后一律返回 429"""
+    from starlette.responses import Response
+
+    from core.security import create_access_token
+    from middleware.rate_limiter import RateLimiterMiddleware
+
+    monkeypatch.setattr(RateLimiterMiddleware, "_local_state", {})
+    middleware = RateLimiterMiddleware(app=None)
+    token = create_access_token({"sub": "42"})
+
+    async def call_next(request):
+        return Response(status_code=200)
+
+    async def run():
+        statuses = []
+        for _ in range(RATE_LIMIT_MAX_CALLS + 40):
+            response = await middleware.dispatch(_request(token), call_next)
+            statuses.append(response.status_code)
+        # 等待后台计数全部落地
+        while rate_limiter._pending_counts or (
+            rate_limiter._flush_task and not rate_limiter._flush_task.done()
+        ):
+            await asyncio.sleep(0)
+        return statuses
+
+    statuses = asyncio.run(run())
+    counted = sum(fake_redis.hashes["rate_limit:42"].values())
+    assert counted == RATE_LIMIT_MAX_CALLS + 40
+    # 超限的请求（无论本地放行还是等待 Redis）都由计数脚本写入异常记录
+    assert len(fake_redis.lists[ABNORMAL_USERS_KEY]) == 40
+    assert statuses[:RATE_LIMIT_MAX_CALLS] == [200] * RATE_LIMIT_MAX_CALLS
+    assert statuses[RATE_LIMIT_MAX_CALLS:] == [429] * 40
+
+
+def test_first_request_waits_for_redis(monkeypatch):
+    """没有已知次数的用户不会本地放行"""
+    from middleware.rate_limiter import RateLimiterMiddleware
+
+    monkeypatch.setattr(RateLimiterMiddleware, "_local_state", {})
+    middleware = RateLimiterMiddleware(app=None)
+    assert middleware._admit_locally(1, "/api/x", None) is False
+
+    RateLimiterMiddleware._remember_count(1, rate_limiter._LOCAL_ADMIT_LIMIT)
+    assert middleware._admit_locally(1, "/api/x", None) is False
+
+
+def test_get_abnormal_users_skips_malformed_records(fake_redis):
+    """单条损坏的异常记录被跳过，其余记录正常返回"""
+    fake_redis.lists[ABNORMAL_USERS_KEY] = [
+        orjson.dumps({"user_id": 1}),
+        b"{not json",
+        orjson.dumps({"user_id": 2}),
+    ]
+    records = asyncio.run(RateLimiter.get_abnormal_users(limit=5))
+    assert [r["user_id"] for r in records] == [1, 2]
+
+
+def test_get_abnormal_users_fills_detected_at(fake_redis):
+    """脚本写入的记录只有 timestamp，读取时补齐 detected_at"""
+    from datetime import datetime
+
+    fake_redis.lists[ABNORMAL_USERS_KEY] = [orjson.dumps({"user_id": 1, "timestamp": 1700000000})]
+    record = asyncio.run(RateLimiter.get_abnormal_users(limit=5))[0]
+    assert record["detected_at"] == datetime.fromtimestamp(1700000000).isoformat()
@@ -0,0 +1,56 @@
+"""
+序列化工具测试
+智能体配置：类型一致时直接合并默认值，旧数据仍经 AgentConfig 转换类型并补全默认值
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from pydantic import ValidationError
+
+from schemas.agent import AgentConfig
+from utils.serializers import _agent_config_to_dict
+
+
+@pytest.mark.parametrize("config", [
+    None,
+    {},
+    {"temperature": 0.3},
+    {"temperature": 0.3, "maxTokens": 4000, "topP": None},
+    AgentConfig(temperature=1.5).model_dump(),
+])
+def test_typed_config_matches_model(config):
+    """类型正确的配置（含部分字段）与 AgentConfig 校验结果一致"""
+    assert _agent_config_to_dict(config) == AgentConfig(**(config or {})).model_dump()
+
+
+def test_legacy_values_are_coerced():
+    """旧数据中的整数温度、字符串数值转换为模型类型"""
+    result = _agent_config_to_dict({"temperature": 1, "maxTokens": "3000", "topP": "0.5"})
+    assert result["temperature"] == 1.0 and type(result["temperature"]) is float
+    assert result["maxTokens"] == 3000 and type(result["maxTokens"]) is int
+    assert result["topP"] == 0.5
+    assert result["presencePenalty"] == 0.0
+
+
+def test_unknown_keys_are_dropped():
+    """旧数据中的多余字段不出现在响应中"""
+    result = _agent_config_to_dict({"temperature": 0.2, "legacy": True})
+    assert "legacy" not in result
+    assert result["temperature"] == 0.2
+
+
+def test_invalid_legacy_value_still_rejected():
+    """无法转换的旧数据与此前一样由 AgentConfig 报错"""
+    with pytest.raises(ValidationError):
+        _agent_config_to_dict({"maxTokens": "many"})
+
+
+def test_result_is_a_copy():
+    """返回值可修改，不影响默认值"""
+    first = _agent_config_to_dict(None)
+    first["temperature"] = 2.0
+    assert _agent_config_to_dict(None)["temperature"] == 0.7
@@ -0,0 +1,73 @@
+"""
+SSE 帧合并测试
+验证首帧立即发送、连续帧合并且内容顺序不变
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from routers.admin import ai as ai_router
+
+
+def _collect(frames):
+    async def run():
+        return [chunk async for chunk in ai_router._coalesce_frames(frames)]
+
+    return asyncio.run(run())
+
+
+def test_first_frame_sent_before_next_arrives():
+    """首帧在上游产出下一帧之前就已发出"""
+    events = []
+
+    async def frames():
+        events.append("produce-1")
+        yield b"data: 1\n\n"
+        events.append("produce-2")
+        yield b"data: 2\n\n"
+
+    async def run():
+        async for chunk in ai_router._coalesce_frames(frames()):
+            events.append(chunk)
+
+    asyncio.run(run())
+    assert events[:2] == ["produce-1", b"data: 1\n\n"]
+
+
+def test_burst_frames_are_merged_in_order():
+    """连续到达的帧合并发送，拼接结果与原始帧一致"""
+    original = [f"data: {i}\n\n".encode() for i in range(50)]
+
+    async def frames():
+        for frame in original:
+            yield frame
+
+    chunks = _collect(frames())
+    assert chunks[0] == original[0]
+    assert len(chunks) < len(original)
+    assert b"".join(chunks) == b"".join(original)
+
+
+def test_buffered_frames_flushed_before_upstream_error():
+    """上游出错时先发出已缓冲的帧再抛出异常"""
+    received = []
+
+    async def frames():
+        yield b"data: 1\n\n"
+        yield b"data: 2\n\n"
+        raise RuntimeError("upstream")
+
+    async def run():
+        async for chunk in ai_router._coalesce_frames(frames()):
+            received.append(chunk)
+
+    try:
+        asyncio.run(run())
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("upstream error swallowed")
+    assert b"".join(received) == b"data: 1\n\ndata: 2\n\n"
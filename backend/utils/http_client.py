@@ -0,0 +1,77 @@
+"""
+Shared HTTP Clients
+共享 HTTP 客户端
+
+对同一外部服务的请求复用同一个 httpx.AsyncClient，保持 keep-alive 连接池，
+避免每次请求都重新建立 TCP + TLS 连接。
+在应用关闭时调用 close_http_clients 释放连接。
+"""
+from typing import Dict, Optional
+
+import httpx
+from loguru import logger
+
+
+# 微信开放接口客户端（api.weixin.qq.com：登录 code 换 openid、获取手机号等）
+wechat_client: Optional[httpx.AsyncClient] = None
+
+
+def get_wechat_client() -> httpx.AsyncClient:
+    """
+    获取微信接口 HTTP 客户端
+
+    首次调用时创建，之后复用同一连接池
+    """
+    global wechat_client
+
+    if wechat_client is None or wechat_client.is_closed:
+        wechat_client = httpx.AsyncClient(
+            base_url="https://api.weixin.qq.com",
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            http2=True,
+        )
+    return wechat_client
+
+
+# 大模型接口客户端：上游地址随模型配置变化，不设 base_url，按是否启用 HTTP/2 各保留一个连接池
+# （DeepSeek 官方 API 在 HTTP/2 下偶发 StreamReset，需走 HTTP/1.1）
+llm_clients: Dict[bool, httpx.AsyncClient] = {}
+
+# 大模型接口客户端配置；httpx 会自动处理 gzip 压缩（自动添加 Accept-Encoding: gzip）
+_LLM_CLIENT_CONFIG = {
+    "timeout": httpx.Timeout(120.0, connect=10.0),
+    "limits": httpx.Limits(max_keepalive_connections=50, max_connections=200),
+    "verify": False,
+    "follow_redirects": True,
+    "trust_env": False,   # 禁用读取系统代理环境变量
+}
+
+
+def get_llm_client(http2: bool = True) -> httpx.AsyncClient:
+    """
+    获取大模型接口 HTTP 客户端
+
+    首次调用时创建，之后复用同一连接池，省去每次对话的 TCP + TLS 握手
+    """
+    client = llm_clients.get(http2)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=http2, **_LLM_CLIENT_CONFIG)
+        llm_clients[http2] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """
+    关闭共享 HTTP 客户端
+    在应用关闭时调用
+    """
+    global wechat_client
+
+    logger.info("Closing shared HTTP clients...")
+    if wechat_client is not None:
+        await wechat_client.aclose()
+        wechat_client = None
+    for client in llm_clients.values():
+        await client.aclose()
+    llm_clients.clear()
@@ -44,6 +44,7 @@ class PageResult(BaseModel, Generic[T]):
     total: int = Field(default=0, description="总数量")
     pageNum: int = Field(default=1, description="当前页码")
     pageSize: int = Field(default=10, description="每页数量")
+    nextCursor: Optional[str] = Field(default=None, description="下一页游标（仅支持游标分页的列表返回）")
     
     @property
     def pages(self) -> int:
@@ -158,6 +159,7 @@ async def paginate_query(
     page_num: int = 1,
     page_size: int = 10,
     formatter: Optional[Callable] = None,
+    total: Optional[int] = None,
 ) -> PageResult:
     """
     自定义查询的分页函数
@@ -171,13 +173,15 @@ async def paginate_query(
         page_num: 页码
         page_size: 每页数量
         formatter: 数据格式化函数
+        total: 已知总数（如来自缓存），传入时跳过计数查询
     
     Returns:
         PageResult: 分页结果
     """
     # 查询总数
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    if total is None:
+        total_result = await db.execute(count_query)
+        total = total_result.scalar() or 0
     
     # 分页
     offset = (page_num - 1) * page_size
@@ -3,7 +3,7 @@
 提供统一的数据库查询辅助函数，减少重复代码
 """
 from typing import TypeVar, Optional, Type, List, Dict, Any, Callable
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -146,7 +146,7 @@ async def check_multiple_unique(
     check_soft_delete: bool = False,
 ) -> None:
     """
-    批量检查多个字段的唯一性
+    批量检查多个字段的唯一性（单次查询）
     
     Args:
         db: 数据库会话
@@ -173,19 +173,36 @@ async def check_multiple_unique(
         )
         ```
     """
+    checks = []
     for field_name, check_info in field_checks.items():
         value = check_info.get("value")
-        error_msg = check_info.get("error_msg", f"{field_name}已存在")
-        
-        await check_unique(
-            db=db,
-            model=model,
-            field_name=field_name,
-            value=value,
-            error_msg=error_msg,
-            exclude_id=exclude_id,
-            check_soft_delete=check_soft_delete,
-        )
+        if value is None:
+            continue
+        if not hasattr(model, field_name):
+            raise ValueError(f"Model {model.__name__} has no field '{field_name}'")
+        checks.append((getattr(model, field_name) == value, check_info.get("error_msg", f"{field_name}已存在")))
+    
+    if not checks:
+        return
+    
+    # 一次查询检查所有字段：每个字段对应一个 MAX(CASE WHEN ...) 命中标记，
+    # 比较在数据库侧完成（与逐字段查询的排序规则一致），无命中时返回 NULL
+    query = select(
+        *(func.max(case((condition, 1), else_=0)) for condition, _ in checks)
+    ).where(or_(*(condition for condition, _ in checks)))
+    
+    if check_soft_delete and hasattr(model, "is_deleted"):
+        query = query.where(model.is_deleted == False)
+    
+    if exclude_id is not None:
+        query = query.where(model.id != exclude_id)
+    
+    flags = (await db.execute(query)).one()
+    
+    # 按传入顺序报告第一个冲突字段，与逐字段检查的行为一致
+    for (_, error_msg), hit in zip(checks, flags):
+        if hit:
+            raise BadRequestException(msg=error_msg)
 
 
 
@@ -5,6 +5,69 @@
 import ipaddress
 from typing import List
 from loguru import logger
+from starlette.requests import Request
+
+
+def get_client_ip(request: Request, trust_proxy: bool = True) -> str:
+    """
+    获取客户端 IP 地址
+
+    Args:
+        request: HTTP 请求
+        trust_proxy: 是否信任反向代理传入的 X-Forwarded-For / X-Real-IP
+
+    Returns:
+        str: 客户端 IP 地址，无法获取时返回空字符串
+    """
+    if trust_proxy:
+        headers = request.headers
+        # 尝试从 X-Forwarded-For 获取（反向代理情况），partition 只切第一段
+        forwarded_for = headers.get("X-Forwarded-For")
+        if forwarded_for:
+            return forwarded_for.partition(",")[0].strip()
+
+        # 尝试从 X-Real-IP 获取
+        real_ip = headers.get("X-Real-IP")
+        if real_ip:
+            return real_ip
+
+    # 直接获取客户端地址
+    if request.client:
+        return request.client.host
+
+    return ""
+
+
+def get_proxy_client_ip(request: Request, trust_proxy: bool = True) -> str:
+    """
+    获取由反向代理写入的客户端 IP，用于限流、锁定等安全计数
+
+    与 get_client_ip 不同，不取 X-Forwarded-For 最左侧的值：Nginx 的
+    $proxy_add_x_forwarded_for 会保留客户端自带的内容，最左侧可被任意伪造。
+    优先取 X-Real-IP（Nginx 以 $remote_addr 覆盖），其次取 X-Forwarded-For
+    最右侧一跳（由最近一层代理追加），最后取连接地址
+
+    Args:
+        request: HTTP 请求
+        trust_proxy: 是否信任反向代理传入的 X-Real-IP / X-Forwarded-For
+
+    Returns:
+        str: 客户端 IP 地址，无法获取时返回空字符串
+    """
+    if trust_proxy:
+        headers = request.headers
+        real_ip = headers.get("X-Real-IP")
+        if real_ip:
+            return real_ip.strip()
+
+        forwarded_for = headers.get("X-Forwarded-For")
+        if forwarded_for:
+            return forwarded_for.rpartition(",")[2].strip()
+
+    if request.client:
+        return request.client.host
+
+    return ""
 
 
 def verify_ip_whitelist(client_ip: str, whitelist_str: str) -> bool:
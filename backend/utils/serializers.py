@@ -3,12 +3,57 @@
 将 SQLAlchemy 模型转换为 API 响应格式
 """
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, List, Mapping, Optional, get_args
 from models.agent import Agent
 from schemas.agent import AgentConfig
 from models.llm_model import LLMModel
 
 
+# AgentConfig 的完整字段集合，用于判断数据库中的配置是否可以直接透传
+_AGENT_CONFIG_FIELDS = frozenset(AgentConfig.model_fields)
+# AgentConfig 默认值，缺失字段直接用字典合并补全
+_DEFAULT_AGENT_CONFIG = AgentConfig().model_dump()
+# AgentConfig 各字段允许的精确类型（Optional 字段含 NoneType），值类型一致时才可跳过校验
+_AGENT_CONFIG_TYPES = {
+    name: frozenset(get_args(field.annotation) or (field.annotation,))
+    for name, field in AgentConfig.model_fields.items()
+}
+
+
+def format_datetime(dt: Optional[datetime]) -> str:
+    """
+    格式化时间为 "YYYY-MM-DD HH:MM:SS"
+
+    使用整数格式化代替 strftime，省去每次调用时解析格式字符串的开销，
+    列表接口逐行序列化时收益明显
+
+    Args:
+        dt: 时间对象，为空时返回空字符串
+    """
+    if dt is None:
+        return ""
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+    )
+
+
+def _agent_config_to_dict(config_data: Optional[dict]) -> dict:
+    """
+    将数据库中的智能体配置转换为响应格式
+
+    配置在写入时已经过 AgentConfig 校验，字段均为已知字段且值类型与模型一致时直接与默认值合并；
+    旧数据（多余字段、整数温度、字符串数值等）仍走 Pydantic 校验，完成类型转换并补全默认值
+    """
+    if not config_data:
+        return dict(_DEFAULT_AGENT_CONFIG)
+    if isinstance(config_data, dict) and config_data.keys() <= _AGENT_CONFIG_FIELDS and all(
+        type(value) in _AGENT_CONFIG_TYPES[key] for key, value in config_data.items()
+    ):
+        return {**_DEFAULT_AGENT_CONFIG, **config_data}
+    return AgentConfig(**config_data).model_dump()
+
+
 def agent_to_client_detail_response(agent: Agent, model_name: Optional[str] = None) -> dict:
     """将 Agent 模型转换为 C 端详情响应格式（不包含提示词 systemPrompt）
     
@@ -16,9 +61,6 @@ def agent_to_client_detail_response(agent: Agent, model_name: Optional[str] = No
         agent: Agent 模型实例
         model_name: 可选，模型显示名称
     """
-    config_data = agent.config or {}
-    config = AgentConfig(**config_data)
-    
     return {
         "id": agent.id,
         "name": agent.name,
@@ -27,13 +69,13 @@ def agent_to_client_detail_response(agent: Agent, model_name: Optional[str] = No
         "welcomeMessage": agent.welcome_message or "",
         "model": agent.model,
         "modelName": model_name if model_name is not None else agent.model,
-        "config": config.model_dump(),
+        "config": _agent_config_to_dict(agent.config),
         "sortOrder": agent.sort_order,
         "agentMode": agent.agent_mode,
         "status": agent.status,
         "usageCount": agent.usage_count,
-        "createTime": agent.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-        "updateTime": agent.updated_at.strftime("%Y-%m-%d %H:%M:%S") if agent.updated_at else "",
+        "createTime": format_datetime(agent.created_at),
+        "updateTime": format_datetime(agent.updated_at),
         "skillIds": agent.skill_ids,
         "skillVariables": agent.skill_variables,
         "routingDescription": agent.routing_description or "",
@@ -56,9 +98,6 @@ def agent_to_response(
         viewer_scoped_tenant_id: 当前管理员的数据范围租户 ID；
             非空且智能体 tenant_id 为空时表示「全租户公用」，对租户管理员只读展示。
     """
-    config_data = agent.config or {}
-    config = AgentConfig(**config_data)
-
     read_only = viewer_scoped_tenant_id is not None and getattr(agent, "tenant_id", None) is None
     
     result = {
@@ -70,14 +109,14 @@ def agent_to_response(
         "systemPrompt": agent.system_prompt,
         "model": agent.model,
         "modelName": model_name if model_name is not None else agent.model,
-        "config": config.model_dump(),
+        "config": _agent_config_to_dict(agent.config),
         "sortOrder": agent.sort_order,
         # 智能体模式：0-普通模式, 1-Skill 组装模式
         "agentMode": agent.agent_mode,
         "status": agent.status,
         "usageCount": agent.usage_count,
-        "createTime": agent.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-        "updateTime": agent.updated_at.strftime("%Y-%m-%d %H:%M:%S") if agent.updated_at else "",
+        "createTime": format_datetime(agent.created_at),
+        "updateTime": format_datetime(agent.updated_at),
         # 技能组装模式字段（向后兼容）
         "skillIds": agent.skill_ids,
         "skillVariables": agent.skill_variables,
@@ -91,6 +130,59 @@ def agent_to_response(
     return result
 
 
+def agents_to_response(
+    agents: Iterable[Agent],
+    model_name_map: Optional[Mapping[str, str]] = None,
+    *,
+    default_model_name: str = "未知",
+    viewer_scoped_tenant_id: Optional[int] = None,
+) -> List[dict]:
+    """批量将 Agent 模型转换为列表响应格式
+
+    与逐行调用 agent_to_response 输出一致，但把与行无关的判断提到循环外，
+    并在单个循环内直接读取 ORM 属性构造字典，用于列表接口
+
+    Args:
+        agents: Agent 模型实例列表
+        model_name_map: 模型 ID（字符串）到模型名称的映射；为 None 时 modelName 使用 model 字段
+        default_model_name: 映射中找不到模型时使用的名称
+        viewer_scoped_tenant_id: 当前管理员的数据范围租户 ID，含义同 agent_to_response
+    """
+    scoped = viewer_scoped_tenant_id is not None
+    items = []
+    append = items.append
+    for agent in agents:
+        if model_name_map is None:
+            model_name = agent.model
+        else:
+            model_name = model_name_map.get(agent.model, default_model_name)
+        append({
+            "id": str(agent.id),
+            "name": agent.name,
+            "icon": agent.icon,
+            "description": agent.description or "",
+            "welcomeMessage": agent.welcome_message or "",
+            "systemPrompt": agent.system_prompt,
+            "model": agent.model,
+            "modelName": model_name,
+            "config": _agent_config_to_dict(agent.config),
+            "sortOrder": agent.sort_order,
+            "agentMode": agent.agent_mode,
+            "status": agent.status,
+            "usageCount": agent.usage_count,
+            "createTime": format_datetime(agent.created_at),
+            "updateTime": format_datetime(agent.updated_at),
+            "skillIds": agent.skill_ids,
+            "skillVariables": agent.skill_variables,
+            "routingDescription": agent.routing_description or "",
+            "isRoutingEnabled": agent.is_routing_enabled,
+            "isSystem": agent.is_system,
+            "tenantId": agent.tenant_id,
+            "readOnly": scoped and agent.tenant_id is None,
+        })
+    return items
+
+
 def llm_model_to_response(model: LLMModel) -> dict:
     """将 LLMModel 模型转换为响应格式"""
     return {
@@ -103,11 +195,12 @@ def llm_model_to_response(model: LLMModel) -> dict:
         "is_enabled": model.is_enabled,
         "total_tokens_used": model.total_tokens_used,
         "balance": float(model.balance) if model.balance is not None else None,
-        "balance_updated_at": model.balance_updated_at.isoformat() if model.balance_updated_at else None,
+        # 时间字段保留 datetime，由 orjson / jsonable_encoder 编码为 ISO 8601 字符串
+        "balance_updated_at": model.balance_updated_at,
         "sort_order": model.sort_order,
         "remark": model.remark,
-        "created_at": model.created_at.isoformat() if model.created_at else None,
-        "updated_at": model.updated_at.isoformat() if model.updated_at else None,
+        "created_at": model.created_at,
+        "updated_at": model.updated_at,
     }
 
 